@@ -3,8 +3,33 @@
 // Global variables
 let moviesData = [];
 let dataTable = null;
+let dataManifest = null;
+const movieDetails = new Map();
 
-// Service name mapping
+// Per-service subscription bitmaps over table rows, and the OR of the
+// bitmaps for the currently selected services (null when not filtering)
+let subscriptionFacets = {};
+let serviceFilterMask = null;
+
+// Prebuilt inverted index (search-index.json) replacing DataTables' cell scan
+let searchIndex = null;
+let searchQuery = '';
+let searchMatches = null;
+
+// Display markup per table row and column, built on first draw
+let displayCache = [];
+
+// Table records are cached between visits and brought up to date with deltas
+const TABLE_CACHE_KEY = 'ff-table-cache';
+
+// Fields kept in table records (see TABLE_FIELDS in json_generator.py)
+const TABLE_FIELDS = [
+    'id', 'episode_number', 'episode_number_num', 'episode_url', 'title', 'year',
+    'imdb_id', 'imdb_rating', 'imdb_rating_num', 'imdb_votes', 'imdb_votes_num',
+    'ar', 'ar_num', 'br', 'br_num', 'jr', 'jr_num', 'rating', 'rating_num'
+];
+
+// Service name mapping (keep in sync with SERVICE_NAMES in search_index.py)
 const serviceNames = {
     'netflix': 'Netflix',
     'prime': 'Prime Video',
@@ -22,19 +47,321 @@ const serviceNames = {
 $(document).ready(function() {
     loadMovieData();
     setupEventListeners();
+    registerServiceWorker();
 });
 
-// Load movie data from JSON
+// Cache the page and data for offline use and instant repeat visits (sw.js)
+function registerServiceWorker() {
+    if (!('serviceWorker' in navigator)) return;
+
+    navigator.serviceWorker.register('sw.js').catch(error => {
+        console.warn('Could not register service worker:', error);
+    });
+}
+
+// Load movie data, rendering the first shard before fetching the rest.
+// Only version.json is revalidated on every load; it points at content-hashed
+// files that never change, so those can be served from cache.
 async function loadMovieData() {
+    const metadata = await loadMetadata();
+    const files = (metadata && metadata.files) || {};
+
+    let manifest;
+    try {
+        manifest = await fetchJson(`data/${assetPath(files, 'manifest', 'movies-manifest.json')}`);
+    } catch (error) {
+        console.warn('Could not load shard manifest, loading full dataset:', error);
+        return loadFullMovieData(metadata);
+    }
+
+    try {
+        dataManifest = manifest;
+
+        // Returning visitors start from their cached copy and skip the shards
+        const cachedMovies = await loadCachedMovies(metadata);
+        const [firstShard, ...remainingShards] = cachedMovies ? [] : (manifest.shards || []);
+        moviesData = cachedMovies ||
+            (firstShard ? (await fetchJson(`data/${firstShard.file}`)).movies : []);
+        useSubscriptionFacets(manifest.facets);
+
+        updateLastUpdated(metadata && metadata.last_updated);
+        updateStatistics(manifest);
+        renderServiceFilters(getAvailableSubscriptionServices());
+        initializeTable();
+
+        $('#loading').hide();
+        $('#table-container').show();
+
+        await loadRemainingShards(remainingShards);
+        useSubscriptionFacets(manifest.facets);
+        renderServiceFilters(getAvailableSubscriptionServices());
+        saveTableCache(metadata, manifest);
+        await loadSearchIndex(metadata);
+
+    } catch (error) {
+        console.error('Error loading movie data:', error);
+        $('#loading').hide();
+        $('#error').show();
+    }
+}
+
+// Fetch remaining shards in parallel, appending them in table order
+async function loadRemainingShards(shards) {
+    const requests = shards.map(shard => fetchJson(`data/${shard.file}`));
+    for (const request of requests) {
+        const shard = await request;
+        appendMovies(shard.movies || []);
+    }
+}
+
+// Load the search index in the background and switch the search box over to it
+async function loadSearchIndex(metadata) {
+    if (!metadata || !metadata.version) return;
+
+    try {
+        const files = metadata.files || {};
+        const payload = await fetchJson(`data/${assetPath(files, 'search', 'search-index.json')}`);
+
+        // Index rows are table positions, so it must match the loaded data
+        if (payload.dataset_version !== metadata.version || payload.count !== moviesData.length) {
+            console.warn('Search index does not match loaded data; using table search');
+            return;
+        }
+
+        searchIndex = decodeSearchIndex(payload);
+        bindIndexedSearch();
+    } catch (error) {
+        console.warn('Could not load search index, using table search:', error);
+    }
+}
+
+// Expand gap-encoded postings (see src/generators/search_index.py)
+function decodeSearchIndex(payload) {
+    return {
+        tokens: payload.tokens,
+        postings: payload.postings.map(gaps => {
+            let row = 0;
+            return gaps.map(gap => (row += gap));
+        })
+    };
+}
+
+// Tokenize text the same way as search_index.tokenize
+function tokenizeSearchText(text) {
+    return text
+        .normalize('NFKD')
+        .replace(/[\u0300-\u036f]/g, '')
+        .toLowerCase()
+        .match(/[a-z0-9]+/g) || [];
+}
+
+// Rows containing every query token as a prefix of some indexed token
+function searchMovies(query) {
+    const { tokens, postings } = searchIndex;
+    let matches = null;
+
+    for (const term of tokenizeSearchText(query)) {
+        const termMatches = new Set();
+
+        // Binary search for the first token >= term, then walk the prefix range
+        let low = 0;
+        let high = tokens.length;
+        while (low < high) {
+            const mid = (low + high) >> 1;
+            if (tokens[mid] < term) {
+                low = mid + 1;
+            } else {
+                high = mid;
+            }
+        }
+        for (let i = low; i < tokens.length && tokens[i].startsWith(term); i++) {
+            postings[i].forEach(row => {
+                if (!matches || matches.has(row)) {
+                    termMatches.add(row);
+                }
+            });
+        }
+
+        matches = termMatches;
+        if (matches.size === 0) break;
+    }
+
+    return matches;
+}
+
+// Route the table's search box through the index instead of DataTables' search
+function bindIndexedSearch() {
+    const input = $(dataTable.table().container()).find('.dataTables_filter input');
+
+    // Carry over anything typed while the index was loading
+    searchQuery = dataTable.search();
+    searchMatches = null;
+    dataTable.search('');
+
+    input.off().on('input', function() {
+        searchQuery = this.value;
+        searchMatches = null;
+        dataTable.draw();
+    });
+
+    dataTable.draw(false);
+}
+
+function registerIndexedSearch() {
+    $.fn.dataTable.ext.search.push((settings, data, dataIndex) => {
+        if (!dataTable || settings.nTable !== dataTable.table().node() || !searchIndex) {
+            return true;
+        }
+
+        if (!searchQuery.trim()) {
+            return true;
+        }
+
+        if (searchMatches === null) {
+            searchMatches = searchMovies(searchQuery) || new Set(moviesData.keys());
+        }
+
+        return searchMatches.has(dataIndex);
+    });
+}
+
+// Bring cached table records up to the current version by applying deltas
+// from the metadata.json version chain. Returns null if that isn't possible.
+async function loadCachedMovies(metadata) {
+    if (!metadata || !metadata.version) return null;
+
+    try {
+        const cached = JSON.parse(localStorage.getItem(TABLE_CACHE_KEY));
+        if (!cached || !Array.isArray(cached.movies)) return null;
+
+        const steps = {};
+        (metadata.versions || []).forEach(entry => {
+            if (entry.previous && entry.delta) {
+                steps[entry.previous] = entry;
+            }
+        });
+
+        let { version, movies } = cached;
+        while (version !== metadata.version) {
+            const step = steps[version];
+            if (!step) return null;
+
+            delete steps[version];
+            movies = applyMovieDelta(movies, await fetchJson(`data/${step.delta}`));
+            version = step.version;
+        }
+
+        return movies;
+    } catch (error) {
+        console.warn('Could not restore cached movie data:', error);
+        return null;
+    }
+}
+
+// Save the loaded table records for the next visit
+function saveTableCache(metadata, manifest) {
+    if (!metadata || !metadata.version || moviesData.length !== manifest.total_movies) return;
+
     try {
-        // Load main movies data
-        const response = await fetch('data/movies.json');
+        localStorage.setItem(TABLE_CACHE_KEY, JSON.stringify({
+            version: metadata.version,
+            movies: moviesData
+        }));
+    } catch (error) {
+        console.warn('Could not cache movie data:', error);
+    }
+}
+
+// Apply a delta (see src/generators/movie_delta.py) to table records.
+// Deltas patch full movie records, so patches are projected onto table fields.
+function applyMovieDelta(movies, delta) {
+    if (delta.format !== 'ff-delta' || delta.version !== 1) {
+        throw new Error(`Unsupported delta format: ${delta.format} v${delta.version}`);
+    }
+
+    const byId = new Map(movies.map(movie => [movie.id, { ...movie }]));
+
+    delta.removed.forEach(id => byId.delete(id));
+
+    delta.changed.forEach(patch => {
+        const movie = byId.get(patch.id);
+        if (!movie) {
+            throw new Error(`Delta changes unknown movie: ${patch.id}`);
+        }
+        Object.entries(patch.set).forEach(([field, value]) => {
+            if (field === 'streaming_options') {
+                movie.streaming = summarizeStreamingOptions(value);
+            } else if (TABLE_FIELDS.includes(field)) {
+                movie[field] = value;
+            }
+        });
+        patch.unset.forEach(field => {
+            if (field === 'streaming_options') {
+                movie.streaming = [];
+            } else {
+                delete movie[field];
+            }
+        });
+    });
+
+    delta.added.forEach(movie => byId.set(movie.id, toTableRecord(movie)));
 
-        if (!response.ok) {
-            throw new Error('Failed to load movie data');
+    return sortMoviesForTable(delta.order.map(id => {
+        if (!byId.has(id)) {
+            throw new Error(`Delta order references unknown movie: ${id}`);
         }
+        return byId.get(id);
+    }));
+}
+
+// Project a full movie record onto the table fields (see to_table_record)
+function toTableRecord(movie) {
+    const record = {};
+    TABLE_FIELDS.forEach(field => {
+        record[field] = movie[field] === undefined ? null : movie[field];
+    });
+    record.streaming = summarizeStreamingOptions(movie.streaming_options);
+    return record;
+}
 
-        const data = await response.json();
+function summarizeStreamingOptions(options) {
+    return (options || []).map(option => {
+        const summary = { service: option.service, type: option.type };
+        if (option.price !== undefined) {
+            summary.price = option.price;
+        }
+        return summary;
+    });
+}
+
+// Newest episode first, unnumbered episodes last (see sort_movies_for_table)
+function sortMoviesForTable(movies) {
+    const sortKey = movie => {
+        const number = String(movie.episode_number ?? '').trim();
+        return /^-?\d+$/.test(number) ? -parseInt(number, 10) : Infinity;
+    };
+    return movies
+        .map((movie, index) => ({ movie, index, key: sortKey(movie) }))
+        .sort((a, b) => (a.key - b.key) || (a.index - b.index))
+        .map(entry => entry.movie);
+}
+
+// Load the full dataset, preferring the compact columnar encoding
+async function loadFullMovieData(metadata) {
+    const files = (metadata && metadata.files) || {};
+    try {
+        let data;
+        try {
+            const compact = await fetchJson(`data/${assetPath(files, 'compact', 'movies.compact.json')}`);
+            data = {
+                last_updated: metadata && metadata.last_updated,
+                total_movies: compact.count,
+                movies: decodeCompactMovies(compact)
+            };
+        } catch (error) {
+            console.warn('Could not load compact dataset, loading movies.json:', error);
+            data = await fetchJson('data/movies.json');
+        }
         moviesData = data.movies || [];
 
         // Update last updated timestamp
@@ -44,11 +371,9 @@ async function loadMovieData() {
         updateStatistics(data);
 
         // Render filters based on available data
+        useSubscriptionFacets(null);
         renderServiceFilters(getAvailableSubscriptionServices());
 
-        // Load metadata
-        loadMetadata();
-
         // Initialize table
         initializeTable();
 
@@ -63,17 +388,93 @@ async function loadMovieData() {
     }
 }
 
-// Load metadata
+// Decode the columnar, dictionary-encoded movies.compact.json format
+// (see src/generators/compact_encoder.py) into movies.json records
+function decodeCompactMovies(payload) {
+    if (payload.format !== 'ff-compact' || payload.version !== 1) {
+        throw new Error(`Unsupported compact format: ${payload.format} v${payload.version}`);
+    }
+
+    const { fields, columns, dictionaries, streaming } = payload;
+    const tokenSeparators = { genre: ', ', director: ', ' };
+    const absent = {};
+    Object.entries(payload.absent || {}).forEach(([field, rows]) => {
+        absent[field] = new Set(rows);
+    });
+    const movies = new Array(payload.count);
+
+    for (let row = 0; row < payload.count; row++) {
+        const movie = {};
+        fields.forEach(field => {
+            if (absent[field] && absent[field].has(row)) {
+                return;
+            }
+            let value = columns[field][row];
+
+            if (field === 'streaming_options') {
+                value = value === null ? null : value.map(option => {
+                    const decoded = {};
+                    option.forEach((index, i) => {
+                        const name = streaming.fields[i];
+                        decoded[name] = streaming.dictionaries[name][index];
+                    });
+                    return decoded;
+                });
+            } else if (field === 'imdb_url') {
+                value = value === 0 ? `https://www.imdb.com/title/${columns.imdb_id[row]}` : value;
+            } else if (field in tokenSeparators && Array.isArray(value)) {
+                value = value.map(index => dictionaries[field][index]).join(tokenSeparators[field]);
+            } else if (field in dictionaries && !(field in tokenSeparators)) {
+                value = dictionaries[field][value];
+            }
+
+            movie[field] = value;
+        });
+        movies[row] = movie;
+    }
+
+    return movies;
+}
+
+// Fetch and parse a JSON file
+async function fetchJson(url, options) {
+    const response = await fetch(url, options);
+    if (!response.ok) {
+        throw new Error(`Failed to load ${url}`);
+    }
+    return response.json();
+}
+
+// Load metadata. version.json is always revalidated and names the hashed
+// copy of metadata.json for the current dataset version, so an unchanged
+// dataset costs one tiny request; older deployments only have metadata.json.
+// The run timestamp is only in version.json, keeping the hashed copy stable.
 async function loadMetadata() {
     try {
-        const response = await fetch('data/metadata.json');
-        if (response.ok) {
-            const metadata = await response.json();
+        const version = await fetchJson('data/version.json', { cache: 'no-cache' });
+        if (version.metadata) {
+            const metadata = await fetchJson(`data/${version.metadata}`);
+            metadata.last_updated = version.last_updated || metadata.last_updated;
             console.log('Metadata loaded:', metadata);
+            return metadata;
         }
+    } catch (error) {
+        console.warn('Could not load version.json, loading metadata.json:', error);
+    }
+
+    try {
+        const metadata = await fetchJson('data/metadata.json', { cache: 'no-cache' });
+        console.log('Metadata loaded:', metadata);
+        return metadata;
     } catch (error) {
         console.warn('Could not load metadata:', error);
     }
+    return null;
+}
+
+// Path of a published data file, falling back to its unhashed name
+function assetPath(files, name, fallback) {
+    return files[name] ? files[name].path : fallback;
 }
 
 // Update last updated timestamp
@@ -97,33 +498,29 @@ function updateLastUpdated(timestamp) {
 // Update statistics
 function updateStatistics(data) {
     const totalMovies = data.total_movies || moviesData.length;
-    const availableStreaming = moviesData.filter(m =>
-        m.streaming_options && m.streaming_options.length > 0
+    const availableStreaming = data.movies_with_streaming ?? moviesData.filter(m =>
+        getStreamingOptions(m).length > 0
     ).length;
 
     $('#total-movies').text(totalMovies);
     $('#available-streaming').text(availableStreaming);
 }
 
-// Initialize DataTable
+// Initialize DataTable. Rows are the movie records themselves; cell markup
+// is only built for rows DataTables actually draws (deferRender). Rows
+// pre-rendered into index.html (see html_generator.py) are kept as they are:
+// the table is built on them, their records are attached, and the remaining
+// records are added behind them.
 function initializeTable() {
-    // Prepare table data with raw values for sorting
-    const tableData = moviesData.map(movie => [
-        formatEpisodeNumber(movie.episode_number, movie.episode_url),
-        movie.title || '',
-        movie.year || '',
-        formatRating(movie.imdb_rating, movie.imdb_votes),
-        movie.ar,  // Raw value for sorting
-        movie.br,  // Raw value for sorting
-        movie.jr,  // Raw value for sorting
-        movie.rating,  // Raw value for sorting
-        formatStreamingOptions(movie.streaming_options),
-        formatLinks(movie.imdb_url, movie.imdb_id)
-    ]);
-
-    // Initialize DataTable
+    displayCache = [];
+
+    const prerendered = countPrerenderedRows();
+    if (prerendered === 0) {
+        $('#movies-tbody').empty();
+    }
+
     dataTable = $('#movies-table').DataTable({
-        data: tableData,
+        deferRender: true,
         responsive: true,
         pageLength: 25,
         order: [[0, 'desc']], // Sort by episode number descending (newest first)
@@ -134,101 +531,164 @@ function initializeTable() {
             infoEmpty: "No movies found",
             infoFiltered: "(filtered from _MAX_ total movies)"
         },
-        columnDefs: [
+        columns: [
             {
-                targets: 0,
+                data: 'episode_number',
                 width: '80px',
-                className: 'dt-center'
+                className: 'dt-center',
+                type: 'num-missing-last',
+                render: lazyRender(
+                    movie => formatEpisodeNumber(movie.episode_number, movie.episode_url),
+                    'episode_number_num'
+                )
             },
             {
-                targets: 2,
+                data: 'title',
+                render: lazyRender((movie, index) => formatTitle(movie.title || '', index))
+            },
+            {
+                data: 'year',
                 width: '80px',
-                className: 'dt-center'
+                className: 'dt-center',
+                render: lazyRender(movie => movie.year || '')
             },
             {
-                targets: 3,
+                data: 'imdb_rating',
                 width: '120px',
-                className: 'dt-center'
+                className: 'dt-center',
+                type: 'num-missing-last',
+                render: lazyRender(
+                    movie => formatRating(movie.imdb_rating, movie.imdb_votes),
+                    'imdb_rating_num'
+                )
             },
             {
-                targets: 4,
+                data: 'ar',
                 width: '80px',
                 className: 'dt-center',
                 responsivePriority: 5,
-                render: function(data, type, row) {
-                    if (type === 'display') {
-                        return formatHostRating(data);
-                    }
-                    // For sorting: treat null/empty as -Infinity so they sort last
-                    if (type === 'sort') {
-                        return data === null || data === '' ? -Infinity : parseFloat(data) || data;
-                    }
-                    return data;
-                }
+                type: 'num-missing-last',
+                render: lazyRender(movie => formatHostRating(movie.ar), 'ar_num')
             },
             {
-                targets: 5,
+                data: 'br',
                 width: '80px',
                 className: 'dt-center',
                 responsivePriority: 6,
-                render: function(data, type, row) {
-                    if (type === 'display') {
-                        return formatHostRating(data);
-                    }
-                    if (type === 'sort') {
-                        return data === null || data === '' ? -Infinity : parseFloat(data) || data;
-                    }
-                    return data;
-                }
+                type: 'num-missing-last',
+                render: lazyRender(movie => formatHostRating(movie.br), 'br_num')
             },
             {
-                targets: 6,
+                data: 'jr',
                 width: '80px',
                 className: 'dt-center',
                 responsivePriority: 7,
-                render: function(data, type, row) {
-                    if (type === 'display') {
-                        return formatHostRating(data);
-                    }
-                    if (type === 'sort') {
-                        return data === null || data === '' ? -Infinity : parseFloat(data) || data;
-                    }
-                    return data;
-                }
+                type: 'num-missing-last',
+                render: lazyRender(movie => formatHostRating(movie.jr), 'jr_num')
             },
             {
-                targets: 7,
+                data: 'rating',
                 width: '90px',
                 className: 'dt-center',
                 responsivePriority: 4,
-                render: function(data, type, row) {
-                    if (type === 'display') {
-                        return formatHostRating(data);
-                    }
-                    if (type === 'sort') {
-                        // For text ratings, they should sort last
-                        return data === null || data === '' ? -Infinity : data;
-                    }
-                    return data;
-                }
+                type: 'num-missing-last',
+                render: lazyRender(movie => formatHostRating(movie.rating), 'rating_num')
             },
             {
-                targets: 8,
-                orderable: false
+                data: null,
+                orderable: false,
+                render: lazyRender((movie, index) => formatStreamingOptions(getStreamingOptions(movie), index))
             },
             {
-                targets: 9,
+                data: 'imdb_id',
                 width: '100px',
                 orderable: false,
-                className: 'dt-center'
+                className: 'dt-center',
+                render: lazyRender(movie => formatLinks(movie.imdb_url, movie.imdb_id))
             }
         ]
     });
+
+    attachPrerenderedRecords(prerendered);
+    dataTable.rows.add(moviesData.slice(prerendered)).draw(false);
+}
+
+// Number of pre-rendered rows that are the first movies of the loaded data,
+// in order; 0 if they are missing or belong to another dataset version
+function countPrerenderedRows() {
+    const ids = $('#movies-tbody > tr').map((_, row) => row.getAttribute('data-id')).get();
+    const matches = ids.length > 0 && ids.length <= moviesData.length &&
+        ids.every((id, index) => id === moviesData[index].id);
+    return matches ? ids.length : 0;
+}
+
+// Give the rows DataTables read from the pre-rendered markup their records.
+// The cells stay as rendered; only the sort and search values DataTables
+// took from the markup are dropped, so they are computed from the records.
+function attachPrerenderedRecords(count) {
+    const rows = dataTable.settings()[0].aoData;
+    for (let index = 0; index < count; index++) {
+        Object.assign(rows[index], {
+            _aData: moviesData[index],
+            src: 'data',
+            _aSortData: null,
+            _aFilterData: null,
+            _sFilterRow: null
+        });
+    }
+}
+
+// Numeric ordering that keeps missing keys (null) last in both directions.
+// DataTables' own 'num' type treats them as -Infinity, which puts movies
+// without a rating or vote count first when sorting ascending.
+$.extend($.fn.dataTable.ext.type.order, {
+    'num-missing-last-asc': (a, b) => compareMissingLast(a, b, 1),
+    'num-missing-last-desc': (a, b) => compareMissingLast(a, b, -1)
+});
+
+function compareMissingLast(a, b, direction) {
+    const aMissing = a === null || a === undefined || a === '';
+    const bMissing = b === null || b === undefined || b === '';
+    if (aMissing || bMissing) {
+        return aMissing - bMissing;
+    }
+    return (a - b) * direction;
+}
+
+// Render a column from the movie record. Display markup is built the first
+// time a row is drawn and cached per row; sorting uses the numeric key the
+// generator stores next to the field (see sort_keys.py), where there is one,
+// ordered by the 'num-missing-last' type above.
+function lazyRender(display, sortKey) {
+    return function(data, type, movie, meta) {
+        if (type === 'display') {
+            const cells = displayCache[meta.row] || (displayCache[meta.row] = []);
+            if (cells[meta.col] === undefined) {
+                cells[meta.col] = display(movie, meta.row);
+            }
+            return cells[meta.col];
+        }
+
+        if (sortKey && (type === 'sort' || type === 'type')) {
+            return movie[sortKey] ?? null;
+        }
+
+        return data === null || data === undefined || typeof data === 'object' ? '' : data;
+    };
+}
+
+// Append movies from a later shard without resetting paging or filters
+function appendMovies(movies) {
+    if (movies.length === 0) return;
+
+    moviesData.push(...movies);
+    dataTable.rows.add(movies).draw(false);
 }
 
 // Render subscription service filters
 function renderServiceFilters(services) {
     const container = $('#service-filters');
+    const selected = getSelectedServices();
     container.empty();
 
     if (!services || services.length === 0) {
@@ -242,14 +702,16 @@ function renderServiceFilters(services) {
         const inputId = `service-${serviceKey}`;
         const option = `
             <label class="service-option" for="${inputId}">
-                <input type="checkbox" id="${inputId}" value="${serviceKey}">
+                <input type="checkbox" id="${inputId}" value="${serviceKey}"${selected.includes(serviceKey) ? ' checked' : ''}>
                 <span>${label}</span>
+                <span class="service-count">(${subscriptionFacets[serviceKey].count})</span>
             </label>
         `;
         container.append(option);
     });
 
     $('#clear-service-filters').prop('disabled', false);
+    updateServiceFilterMask();
 }
 
 // Format episode number with link
@@ -265,6 +727,14 @@ function formatEpisodeNumber(episodeNum, episodeUrl) {
     return episodeNum;
 }
 
+// Format title as a link that opens the movie details. The href is the
+// movie's static page (see html_generator.py) for new tabs and crawlers.
+function formatTitle(title, index) {
+    const movie = moviesData[index];
+    const href = movie && movie.id ? `movies/${encodeURIComponent(movie.id)}.html` : '#';
+    return `<a href="${href}" class="details-link movie-title" data-row="${index}">${title}</a>`;
+}
+
 // Format IMDb rating
 function formatRating(rating, votes) {
     if (!rating || rating === 'N/A') {
@@ -303,8 +773,9 @@ function formatHostRating(rating) {
     return `<span class="host-rating">${rating}</span>`;
 }
 
-// Format streaming options as badges
-function formatStreamingOptions(options) {
+// Format streaming options as badges. Table shards carry options without
+// links, so those badges open the movie details instead.
+function formatStreamingOptions(options, index) {
     if (!options || options.length === 0) {
         return '<span class="no-streaming">Not available</span>';
     }
@@ -320,6 +791,13 @@ function formatStreamingOptions(options) {
             badgeText += option.price ? ` ${option.price}` : ` (${option.type})`;
         }
 
+        if (!option.link && index !== undefined) {
+            return `<a href="#" class="streaming-badge details-link ${badgeClass} ${typeClass}"
+                       data-row="${index}" title="${title}">
+                ${badgeText}
+            </a>`;
+        }
+
         const link = option.link || '#';
 
         return `<a href="${link}" target="_blank" rel="noopener noreferrer"
@@ -347,9 +825,93 @@ function formatLinks(imdbUrl, imdbId) {
     </div>`;
 }
 
+// Load the detail fields (plot, poster, streaming links) for a movie.
+// Full records from movies.json already contain them.
+async function getMovieDetails(movie) {
+    if (movie.streaming_options !== undefined || !dataManifest) {
+        return movie;
+    }
+
+    if (!movieDetails.has(movie.id)) {
+        const url = `data/${dataManifest.details_dir}/${encodeURIComponent(movie.id)}.json`;
+        movieDetails.set(movie.id, fetchJson(url));
+    }
+
+    return { ...movie, ...(await movieDetails.get(movie.id)) };
+}
+
+// Show the details dialog for a table row
+async function showMovieDetails(index) {
+    const movie = moviesData[index];
+    if (!movie) return;
+
+    const dialog = document.getElementById('movie-details');
+    const body = $('#movie-details-body');
+    body.html('<div class="spinner"></div>');
+    if (!dialog.open) {
+        dialog.showModal();
+    }
+
+    try {
+        const details = await getMovieDetails(movie);
+        body.html(formatMovieDetails(details));
+    } catch (error) {
+        console.error('Error loading movie details:', error);
+        movieDetails.delete(movie.id);
+        body.html('<p class="error">Failed to load movie details.</p>');
+    }
+}
+
+// Format the details dialog contents
+function formatMovieDetails(movie) {
+    const thumbnail = movie.poster_thumbnail;
+    let poster = '';
+    if (thumbnail) {
+        poster = `<img class="details-poster" src="data/${thumbnail.path}" width="${thumbnail.width}"
+                       height="${thumbnail.height}" alt="${movie.title} poster" loading="lazy">`;
+    } else if (movie.poster && movie.poster !== 'N/A') {
+        poster = `<img class="details-poster" src="${movie.poster}" alt="${movie.title} poster" loading="lazy">`;
+    }
+    const facts = [
+        ['Director', movie.director],
+        ['Genre', movie.genre],
+        ['Runtime', movie.runtime]
+    ].filter(([, value]) => value && value !== 'N/A')
+        .map(([label, value]) => `<dt>${label}</dt><dd>${value}</dd>`)
+        .join('');
+    const notes = movie.rating_notes ? `<p class="details-notes">${movie.rating_notes}</p>` : '';
+
+    return `
+        ${poster}
+        <div class="details-info">
+            <h2>${movie.title || ''} ${movie.year ? `(${movie.year})` : ''}</h2>
+            <dl class="details-facts">${facts}</dl>
+            <p>${movie.plot && movie.plot !== 'N/A' ? movie.plot : ''}</p>
+            ${notes}
+            <h3>Where to Watch</h3>
+            ${formatStreamingOptions(movie.streaming_options)}
+            ${formatLinks(movie.imdb_url, movie.imdb_id)}
+        </div>
+    `;
+}
+
 // Setup event listeners
 function setupEventListeners() {
     registerServiceFilter();
+    registerIndexedSearch();
+
+    // Pre-rendered titles keep linking to the movie page until data has loaded
+    $(document).on('click', '.details-link', function(event) {
+        const index = Number($(this).attr('data-row'));
+        if (!moviesData[index]) return;
+
+        event.preventDefault();
+        showMovieDetails(index);
+    });
+
+    $('#close-movie-details').on('click', function() {
+        document.getElementById('movie-details').close();
+    });
 
     $('#service-filters').on('change', 'input[type="checkbox"]', function() {
         applyServiceFilters();
@@ -363,16 +925,85 @@ function setupEventListeners() {
 
 // Apply subscription service filters
 function applyServiceFilters() {
+    updateServiceFilterMask();
     if (!dataTable) return;
     dataTable.draw();
 }
 
+// Combine the selected services' bitmaps once, so filtering a row is a bit test
+function updateServiceFilterMask() {
+    const selected = getSelectedServices();
+    if (selected.length === 0) {
+        serviceFilterMask = null;
+        return;
+    }
+
+    serviceFilterMask = new Uint8Array((moviesData.length + 7) >> 3);
+    selected.forEach(service => {
+        const facet = subscriptionFacets[service];
+        if (!facet) return;
+        facet.rows.forEach((byte, i) => {
+            if (i < serviceFilterMask.length) {
+                serviceFilterMask[i] |= byte;
+            }
+        });
+    });
+}
+
+// Use the generator's precomputed facets (see build_subscription_facets),
+// or build them from the loaded movies when none were published
+function useSubscriptionFacets(facets) {
+    if (facets && facets.subscription) {
+        subscriptionFacets = {};
+        Object.entries(facets.subscription).forEach(([service, facet]) => {
+            subscriptionFacets[service] = { count: facet.count, rows: decodeBitmap(facet.rows) };
+        });
+    } else {
+        subscriptionFacets = buildSubscriptionFacets(moviesData);
+    }
+}
+
+function decodeBitmap(base64) {
+    const binary = atob(base64);
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) {
+        bytes[i] = binary.charCodeAt(i);
+    }
+    return bytes;
+}
+
+function buildSubscriptionFacets(movies) {
+    const facets = {};
+    const size = (movies.length + 7) >> 3;
+
+    movies.forEach((movie, row) => {
+        getStreamingOptions(movie).forEach(option => {
+            if (!option.service || !isSubscriptionOption(option)) return;
+
+            const facet = facets[option.service] ||
+                (facets[option.service] = { count: 0, rows: new Uint8Array(size) });
+            const bit = 1 << (row & 7);
+            if (!(facet.rows[row >> 3] & bit)) {
+                facet.rows[row >> 3] |= bit;
+                facet.count++;
+            }
+        });
+    });
+
+    return facets;
+}
+
 function getSelectedServices() {
     return $('#service-filters input[type="checkbox"]:checked')
         .map((_, input) => $(input).val())
         .get();
 }
 
+// Streaming options for a movie, from either a table shard or movies.json
+function getStreamingOptions(movie) {
+    return movie.streaming || movie.streaming_options || [];
+}
+
 function isSubscriptionOption(option) {
     const optionType = option.type || 'subscription';
     return optionType === 'subscription';
@@ -386,17 +1017,7 @@ function formatServiceLabel(serviceKey) {
 }
 
 function getAvailableSubscriptionServices() {
-    const services = new Set();
-
-    moviesData.forEach(movie => {
-        (movie.streaming_options || []).forEach(option => {
-            if (option.service && isSubscriptionOption(option)) {
-                services.add(option.service);
-            }
-        });
-    });
-
-    return Array.from(services).sort((a, b) => {
+    return Object.keys(subscriptionFacets).sort((a, b) => {
         const labelA = serviceNames[a] || formatServiceLabel(a);
         const labelB = serviceNames[b] || formatServiceLabel(b);
         return labelA.localeCompare(labelB);
@@ -409,20 +1030,10 @@ function registerServiceFilter() {
             return true;
         }
 
-        const selectedServices = getSelectedServices();
-        if (selectedServices.length === 0) {
+        if (!serviceFilterMask) {
             return true;
         }
 
-        const movie = moviesData[dataIndex];
-        if (!movie || !movie.streaming_options) {
-            return false;
-        }
-
-        return movie.streaming_options.some(option =>
-            option.service &&
-            selectedServices.includes(option.service) &&
-            isSubscriptionOption(option)
-        );
+        return (serviceFilterMask[dataIndex >> 3] & (1 << (dataIndex & 7))) !== 0;
     });
 }
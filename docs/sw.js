@@ -0,0 +1,120 @@
+// Friendly Fire Movie Guide - Service Worker
+//
+// Serves the page offline and avoids re-downloading data between updates:
+//   - data/version.json is always fetched from the network (falling back to
+//     cache when offline); it names the current dataset version.
+//   - Content-hashed data files (movies-manifest.3f2a9c1b0d4e.json, shards,
+//     search index, metadata, poster thumbnails) and deltas never change, so
+//     they are served from cache once fetched.
+//   - Everything else (the page, scripts, styles, CDN libraries, detail
+//     files) is served from cache and refreshed in the background.
+
+const CACHE_VERSION = 'v1';
+const SHELL_CACHE = `ff-shell-${CACHE_VERSION}`;
+const DATA_CACHE = `ff-data-${CACHE_VERSION}`;
+
+const SHELL_FILES = ['./', 'index.html', 'app.js', 'styles.css'];
+
+// Hashed files accumulate across weekly updates; keep the newest entries
+const MAX_DATA_ENTRIES = 400;
+
+const HASHED_FILE = /\.[0-9a-f]{12}\.(json|webp)$/;
+
+self.addEventListener('install', event => {
+    event.waitUntil(
+        caches.open(SHELL_CACHE)
+            .then(cache => cache.addAll(SHELL_FILES))
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil(
+        caches.keys()
+            .then(keys => Promise.all(
+                keys
+                    .filter(key => key !== SHELL_CACHE && key !== DATA_CACHE)
+                    .map(key => caches.delete(key))
+            ))
+            .then(() => self.clients.claim())
+    );
+});
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    if (request.method !== 'GET') return;
+
+    const url = new URL(request.url);
+    const scope = new URL(self.registration.scope);
+    const dataPath = url.origin === scope.origin && url.pathname.startsWith(`${scope.pathname}data/`);
+
+    if (dataPath && url.pathname.endsWith('/version.json')) {
+        event.respondWith(networkFirst(request, DATA_CACHE));
+    } else if (dataPath && (HASHED_FILE.test(url.pathname) || url.pathname.includes('/deltas/'))) {
+        event.respondWith(cacheFirst(request, DATA_CACHE));
+    } else if (dataPath && url.pathname.includes('/details/')) {
+        event.respondWith(staleWhileRevalidate(event, DATA_CACHE));
+    } else if (dataPath) {
+        event.respondWith(networkFirst(request, DATA_CACHE));
+    } else {
+        event.respondWith(staleWhileRevalidate(event, SHELL_CACHE));
+    }
+});
+
+async function networkFirst(request, cacheName) {
+    const cache = await caches.open(cacheName);
+    try {
+        const response = await fetch(request, { cache: 'no-cache' });
+        if (response.ok) {
+            await cache.put(request, response.clone());
+        }
+        return response;
+    } catch (error) {
+        const cached = await cache.match(request);
+        if (cached) return cached;
+        throw error;
+    }
+}
+
+async function cacheFirst(request, cacheName) {
+    const cache = await caches.open(cacheName);
+    const cached = await cache.match(request);
+    if (cached) return cached;
+
+    const response = await fetch(request);
+    if (response.ok) {
+        await cache.put(request, response.clone());
+        await trimCache(cache, MAX_DATA_ENTRIES);
+    }
+    return response;
+}
+
+async function staleWhileRevalidate(event, cacheName) {
+    const request = event.request;
+    const cache = await caches.open(cacheName);
+    const cached = await cache.match(request);
+
+    const refresh = fetch(request)
+        .then(response => {
+            // Opaque (cross-origin CDN) responses have status 0 but are usable
+            if (response.ok || response.type === 'opaque') {
+                cache.put(request, response.clone());
+            }
+            return response;
+        })
+        .catch(error => {
+            if (!cached) throw error;
+            return cached;
+        });
+
+    event.waitUntil(refresh.catch(() => {}));
+    return cached || refresh;
+}
+
+// Remove the oldest entries (cache keys are in insertion order)
+async function trimCache(cache, maxEntries) {
+    const keys = await cache.keys();
+    for (const key of keys.slice(0, Math.max(0, keys.length - maxEntries))) {
+        await cache.delete(key);
+    }
+}
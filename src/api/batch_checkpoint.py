@@ -0,0 +1,192 @@
+"""
+On-disk checkpoint for long batches of API lookups.
+
+Results are appended to a JSON-lines file under an idempotent key (e.g. the
+title and year searched, or the IMDb ID), so a batch that crashes, hits a
+rate-limit lockout or times out can be resumed without repeating any lookup
+that already succeeded:
+
+    {"key": "omdb:search:top gun|1986", "value": {...}}
+    {"key": "streaming:tt0092099:us", "value": null}
+
+Lookups that failed or found nothing are recorded with a null value; a
+resumed batch reuses them too, unless it retries failures.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple
+
+from .hooks import null_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class BatchCheckpoint:
+    """Append-only record of batch results, keyed for resuming."""
+
+    EVERY = 10  # Results buffered between writes
+
+    def __init__(
+        self,
+        path: str,
+        every: int = EVERY,
+        resume: bool = False,
+        retry_failed: bool = False,
+        metrics=None
+    ):
+        """
+        Initialize the checkpoint.
+
+        Args:
+            path: JSON-lines file
+            every: Write buffered results after this many items (and always
+                on flush, e.g. when the batch ends or fails)
+            resume: Reuse results recorded by an earlier run; otherwise an
+                existing file is replaced on the first write
+            retry_failed: When resuming, look up items recorded with a null
+                value again
+            metrics: Stage metrics hook counting reused results as cache
+                hits (see api.hooks); nothing is counted by default
+        """
+        self.path = Path(path)
+        self.metrics = metrics or null_metrics
+        self.every = max(1, every)
+        self.retry_failed = retry_failed
+        self.results = {}
+        self.reused = 0
+        self._pending = []
+        self._append = resume
+
+        if resume:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # A line cut short by a crash
+                    self.results[entry['key']] = entry.get('value')
+        except FileNotFoundError:
+            return
+
+        failed = sum(1 for value in self.results.values() if value is None)
+        logger.info(f"Resuming from {self.path}: {len(self.results)} results ({failed} failed or not found)")
+
+    def lookup(self, key: str) -> Tuple[bool, Optional[Any]]:
+        """
+        Recorded result for a key.
+
+        Args:
+            key: Item key
+
+        Returns:
+            Tuple of (found, value); a null value is not found when
+            retrying failures
+        """
+        if key not in self.results:
+            return False, None
+        value = self.results[key]
+        if value is None and self.retry_failed:
+            return False, None
+        return True, value
+
+    def record(self, key: str, value: Optional[Any]):
+        """
+        Record an item's result, writing the buffer every `every` items.
+
+        Args:
+            key: Item key
+            value: JSON-serializable result (None for failed or not found)
+        """
+        self.results[key] = value
+        self._pending.append({'key': key, 'value': value})
+        if len(self._pending) >= self.every:
+            self.flush()
+
+    def call(self, key: str, fetch: Callable[[], Optional[Any]]) -> Optional[Any]:
+        """
+        Return the recorded result for a key, or fetch and record it.
+
+        A fetch that raises is recorded as failed (None) before the error
+        propagates.
+
+        Args:
+            key: Item key
+            fetch: Function performing the lookup
+
+        Returns:
+            The result
+        """
+        found, value = self.lookup(key)
+        self.metrics.count_cache('checkpoint', hit=found)
+        if found:
+            self.reused += 1
+            return value
+
+        try:
+            value = fetch()
+        except Exception:
+            self.record(key, None)
+            raise
+        self.record(key, value)
+        return value
+
+    def flush(self):
+        """Write buffered results to disk."""
+        if not self._pending:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a' if self._append else 'w', encoding='utf-8') as f:
+            for entry in self._pending:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self._append = True
+        self._pending = []
+
+    def clear(self):
+        """Remove the checkpoint once its batch has completed."""
+        self._pending = []
+        self.results = {}
+        self._append = False
+        self.path.unlink(missing_ok=True)
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit: write whatever is buffered."""
+        self.flush()
+
+
+def open_checkpoint(
+    directory: str,
+    name: str,
+    resume: bool = False,
+    retry_failed: bool = False,
+    metrics=None
+) -> BatchCheckpoint:
+    """
+    Convenience function to open a named checkpoint in a directory.
+
+    Args:
+        directory: Checkpoint directory
+        name: Batch name (the file is <name>.jsonl)
+        resume: Reuse results recorded by an earlier run
+        retry_failed: When resuming, retry items that failed
+        metrics: Stage metrics hook (see api.hooks)
+
+    Returns:
+        BatchCheckpoint
+    """
+    return BatchCheckpoint(
+        Path(directory) / f"{name}.jsonl", resume=resume, retry_failed=retry_failed, metrics=metrics
+    )
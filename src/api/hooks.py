@@ -0,0 +1,36 @@
+"""
+No-op instrumentation hooks for API clients, caches and scrapers.
+
+Clients count cache lookups and HTTP responses through a metrics hook
+(count_cache, record_response) and account their sleeps through a
+telemetry hook (sleep). Both are passed in through constructors, so these
+modules do not depend on the pipeline that collects the numbers;
+pipeline.metrics.metrics and api.http_telemetry.telemetry implement them.
+Without hooks nothing is counted, but sleeps still happen.
+"""
+
+import time
+from typing import Optional
+
+
+class NullMetrics:
+    """Metrics hook that records nothing."""
+
+    def record_response(self, response, *args, **kwargs):
+        """Ignore a response (a requests 'response' hook)."""
+        return None
+
+    def count_cache(self, cache: str, hit: bool, amount: int = 1):
+        """Ignore a cache lookup."""
+
+
+class NullTelemetry:
+    """Telemetry hook that sleeps without accounting for it."""
+
+    def sleep(self, seconds: float, url: Optional[str] = None, reason: str = 'rate_limit'):
+        """Sleep for the given time."""
+        time.sleep(seconds)
+
+
+null_metrics = NullMetrics()
+null_telemetry = NullTelemetry()
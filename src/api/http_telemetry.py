@@ -0,0 +1,295 @@
+"""
+Request-level HTTP telemetry shared by every client.
+
+instrument_session() attaches a response hook to a requests session (and
+the stage metrics hook, if one is given). For
+each host and endpoint (the path with IDs and slugs folded, e.g.
+/shows/{imdb_id}) it records:
+
+    latency      p50/p95/p99/max and a bucketed histogram (time to response
+                 headers, from requests' Response.elapsed, less any backoff
+                 the transport slept between attempts)
+    status       count per status code, including responses the transport
+                 retried; 429s are also counted separately
+    retries      re-sent requests (record_retry, see api.http_transport)
+    sleep        seconds spent waiting on our own rate limits, backoff and
+                 politeness delays (telemetry.sleep), by reason
+
+Comparing latency against sleep time per host shows whether a slow run was
+the network's doing or our own throttling.
+
+Requests are also counted against a daily quota per host (UTC days), kept
+in data/api_quota.json so the count survives across runs; a warning is
+logged as a host approaches its free-tier limit.
+"""
+
+import json
+import logging
+import math
+import re
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the latency histogram buckets; the last is unbounded
+LATENCY_BUCKETS_MS = [50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+# Free-tier daily request limits
+DAILY_QUOTAS = {
+    'www.omdbapi.com': 1000,
+    'streaming-availability.p.rapidapi.com': 100
+}
+
+_ID_SEGMENT = re.compile(r'^(tt\d+|\d+)$')
+
+
+def endpoint_of(url: str) -> str:
+    """
+    Fold a URL path into an endpoint name.
+
+    IMDb IDs and numbers become {imdb_id} and {n}, and segments past the
+    second are folded into '*' (episode and poster slugs), so
+    /episodes/friendly-fire/greyhound-2020/ -> /episodes/friendly-fire/*.
+
+    Args:
+        url: Request URL
+
+    Returns:
+        Endpoint path
+    """
+    segments = [s for s in urlsplit(url).path.split('/') if s]
+    folded = []
+    for segment in segments[:2]:
+        match = _ID_SEGMENT.match(segment)
+        if match:
+            folded.append('{imdb_id}' if segment.startswith('tt') else '{n}')
+        else:
+            folded.append(segment)
+    if len(segments) > 2:
+        folded.append('*')
+    return '/' + '/'.join(folded)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+class HTTPTelemetry:
+    """Latency, status, retry, throttling and quota counters per host."""
+
+    def __init__(self, quota_path: str = 'data/api_quota.json', quotas: Optional[Dict[str, int]] = None):
+        """
+        Initialize the telemetry.
+
+        Args:
+            quota_path: File keeping daily request counts across runs
+            quotas: Daily request limits by host (DAILY_QUOTAS by default)
+        """
+        self.quota_path = Path(quota_path)
+        self.quotas = DAILY_QUOTAS if quotas is None else quotas
+        self.latencies = defaultdict(list)  # (host, endpoint) -> [ms]
+        self.statuses = defaultdict(lambda: defaultdict(int))  # (host, endpoint) -> {status: count}
+        self.retries = defaultdict(int)  # host -> count
+        self.sleeps = defaultdict(lambda: defaultdict(float))  # host -> {reason: seconds}
+        self.usage = {}  # host -> {day: count}, loaded lazily
+        self._warned = set()
+        self._lock = threading.Lock()
+        self._request = threading.local()  # Retry sleeps within the current request
+
+    def record_response(self, response, *args, **kwargs):
+        """
+        Record a response (a requests 'response' hook).
+
+        Args:
+            response: requests.Response
+
+        Returns:
+            None, so requests keeps the response as is
+        """
+        host = urlsplit(response.url).netloc
+        key = (host, endpoint_of(response.url))
+        retry_sleep = getattr(self._request, 'slept', None) or 0.0
+        self._request.slept = None
+        latency = max(0.0, response.elapsed.total_seconds() - retry_sleep) * 1000
+
+        with self._lock:
+            self.latencies[key].append(latency)
+            self.statuses[key][response.status_code] += 1
+            used = self._count_quota(host)
+
+        limit = self.quotas.get(host)
+        if limit and used >= 0.8 * limit and host not in self._warned:
+            self._warned.add(host)
+            logger.warning(f"{host}: {used} of {limit} daily requests used")
+        return None
+
+    def begin_request(self):
+        """Start counting retry sleeps of a request sent from this thread."""
+        self._request.slept = 0.0
+
+    def record_retry(self, url: str, status: Optional[int] = None):
+        """
+        Count a request that is about to be sent again.
+
+        Responses retried by the transport (see api.http_transport) never
+        reach the response hook, so their status is counted here.
+
+        Args:
+            url: Request URL
+            status: Status code of the response being retried, if any
+        """
+        host = urlsplit(url).netloc
+        with self._lock:
+            self.retries[host] += 1
+            if status is not None:
+                self.statuses[(host, endpoint_of(url))][status] += 1
+                self._count_quota(host)
+
+    def sleep(self, seconds: float, url: str, reason: str = 'rate_limit'):
+        """
+        Sleep, accounting the time to the host being throttled.
+
+        Args:
+            seconds: Time to sleep
+            url: URL (or base URL) of the host
+            reason: 'rate_limit', 'backoff' or 'polite'
+        """
+        time.sleep(seconds)
+        if getattr(self._request, 'slept', None) is not None:
+            self._request.slept += seconds
+        with self._lock:
+            self.sleeps[urlsplit(url).netloc][reason] += seconds
+
+    def _count_quota(self, host: str) -> int:
+        """Count one request against today's quota; returns today's count."""
+        if not self.usage and self.quota_path.exists():
+            self.usage = self._load_usage()
+        today = datetime.utcnow().strftime('%Y-%m-%d')
+        days = self.usage.setdefault(host, {})
+        days[today] = days.get(today, 0) + 1
+        return days[today]
+
+    def _load_usage(self) -> Dict[str, Dict[str, int]]:
+        try:
+            with open(self.quota_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable quota file {self.quota_path}: {e}")
+            return {}
+
+    def save_quota(self, keep_days: int = 31):
+        """
+        Write the daily request counts, keeping the most recent days.
+
+        Args:
+            keep_days: Days of history kept per host
+        """
+        with self._lock:
+            if not self.usage:
+                return
+            usage = {
+                host: dict(sorted(days.items())[-keep_days:])
+                for host, days in sorted(self.usage.items())
+            }
+        self.quota_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.quota_path, 'w', encoding='utf-8') as f:
+            json.dump(usage, f, indent=2)
+
+    def to_dict(self) -> Dict:
+        """
+        Telemetry per host and endpoint, with today's quota use.
+
+        Returns:
+            Dictionary as added to metrics.json under 'http'
+        """
+        today = datetime.utcnow().strftime('%Y-%m-%d')
+        hosts = {}
+        with self._lock:
+            for host, endpoint in sorted(set(self.latencies) | set(self.statuses)):
+                statuses = self.statuses.get((host, endpoint), {})
+                host_entry = hosts.setdefault(host, {'endpoints': {}})
+                host_entry['endpoints'][endpoint] = {
+                    'requests': sum(statuses.values()),
+                    'status': {str(code): count for code, count in sorted(statuses.items())},
+                    'rate_limited': statuses.get(429, 0),
+                    'latency_ms': self._latency_summary(self.latencies.get((host, endpoint), []))
+                }
+
+            for host in set(self.retries) | set(self.sleeps):
+                hosts.setdefault(host, {'endpoints': {}})
+            for host, entry in hosts.items():
+                entry['retries'] = self.retries.get(host, 0)
+                entry['sleep_seconds'] = {
+                    reason: round(seconds, 2) for reason, seconds in self.sleeps.get(host, {}).items()
+                }
+                used = self.usage.get(host, {}).get(today)
+                if used is not None:
+                    entry['quota'] = {'day': today, 'used': used, 'limit': self.quotas.get(host)}
+        return hosts
+
+    @staticmethod
+    def _latency_summary(latencies: List[float]) -> Dict:
+        """Percentiles, total and histogram of latencies in ms (zeros if none)."""
+        histogram = {f"<={bound}ms": 0 for bound in LATENCY_BUCKETS_MS}
+        histogram[f">{LATENCY_BUCKETS_MS[-1]}ms"] = 0
+        for latency in latencies:
+            bound = next((b for b in LATENCY_BUCKETS_MS if latency <= b), None)
+            histogram[f"<={bound}ms" if bound else f">{LATENCY_BUCKETS_MS[-1]}ms"] += 1
+
+        if not latencies:
+            latencies = [0.0]
+        return {
+            'p50': round(percentile(latencies, 0.50), 1),
+            'p95': round(percentile(latencies, 0.95), 1),
+            'p99': round(percentile(latencies, 0.99), 1),
+            'max': round(max(latencies), 1),
+            'total': round(sum(latencies), 1),
+            'histogram': histogram
+        }
+
+    def summary(self) -> str:
+        """One line per host: requests, latency percentiles, retries and throttling."""
+        lines = []
+        for host, entry in self.to_dict().items():
+            endpoints = entry['endpoints'].values()
+            requests = sum(e['requests'] for e in endpoints)
+            network = sum(e['latency_ms']['total'] for e in endpoints) / 1000
+            p95 = max((e['latency_ms']['p95'] for e in endpoints), default=0)
+            quota = entry.get('quota')
+            lines.append(
+                f"{host:40} {requests:5} requests, {network:7.1f}s waiting on responses "
+                f"(p95 {p95:.0f}ms), {sum(entry['sleep_seconds'].values()):7.1f}s throttled, "
+                f"{entry['retries']} retries"
+                + (f", {quota['used']}/{quota['limit'] or '-'} today" if quota else '')
+            )
+        return '\n'.join(lines)
+
+
+# Shared by every client session of one process
+telemetry = HTTPTelemetry()
+
+
+def instrument_session(session, metrics=None):
+    """
+    Attach the HTTP telemetry hook, and a stage metrics hook, to a requests session.
+
+    Args:
+        session: requests.Session
+        metrics: Stage metrics hook with record_response (see api.hooks), if any
+
+    Returns:
+        The session
+    """
+    if metrics is not None:
+        session.hooks['response'].append(metrics.record_response)
+    session.hooks['response'].append(telemetry.record_response)
+    return session
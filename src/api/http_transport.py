@@ -0,0 +1,227 @@
+"""
+Shared HTTP transport for the scraper, the API clients and poster downloads.
+
+Every session is built here, so connection pooling, retries, compression,
+keep-alive and timeouts are configured in one place:
+
+    pooling      pool_maxsize connections per host, one for each worker that
+                 shares the session (the steps of the overlapped fetch use a
+                 client each); a worker waits for a free connection instead
+                 of opening a throwaway one
+    retries      connection errors, read timeouts and 429/5xx responses are
+                 retried with exponential backoff and jitter, honoring (up to
+                 a cap) a Retry-After header; the final response is returned
+                 either way, so callers keep using raise_for_status()
+    compression  gzip and deflate are negotiated, and brotli when the brotli
+                 package is installed (urllib3 decodes it)
+    keep-alive   connections are reused across requests to the same host
+    timeouts     a default (connect, read) timeout for requests made without
+                 one
+
+Retries and backoff sleeps are reported to api.http_telemetry, which sees
+only the final response of each request through its response hook.
+"""
+
+import logging
+from itertools import takewhile
+from random import uniform
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import brotli  # noqa: F401 - urllib3 decodes 'br' responses when it is installed
+except ImportError:
+    brotli = None
+
+from .http_telemetry import instrument_session, telemetry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+class JitteredRetry(Retry):
+    """urllib3 Retry with jittered backoff, reporting retries to the telemetry."""
+
+    BACKOFF_MAX = 30  # seconds
+    RETRY_AFTER_MAX = 60  # seconds; longer Retry-After values are cut to this
+
+    origin = ''  # URL of the request being retried, carried across new()
+
+    def new(self, **kw):
+        """Copy the retry state (see Retry.new), keeping the request URL."""
+        retry = super().new(**kw)
+        retry.origin = self.origin
+        return retry
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        """
+        Count a failed attempt; raises MaxRetryError once retries run out.
+
+        Returns:
+            The retry state for the next attempt
+        """
+        retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        if _pool is not None:
+            port = '' if _pool.port in (None, DEFAULT_PORTS.get(_pool.scheme)) else f":{_pool.port}"
+            retry.origin = f"{_pool.scheme}://{_pool.host}{port}{url or ''}"
+        if retry.origin:
+            telemetry.record_retry(retry.origin, response.status if response is not None else None)
+        logger.debug(f"Retrying {retry.origin}: {error or response.status}")
+        return retry
+
+    def get_backoff_time(self) -> float:
+        """
+        Exponential backoff with jitter.
+
+        The n-th consecutive retry waits between half and all of
+        backoff_factor * 2 ** (n - 1) seconds, so workers that failed together
+        do not retry in lockstep.
+
+        Returns:
+            Seconds to wait
+        """
+        errors = len(list(takewhile(lambda h: h.redirect_location is None, reversed(self.history))))
+        if errors == 0 or not self.backoff_factor:
+            return 0
+        backoff = min(self.BACKOFF_MAX, self.backoff_factor * 2 ** (errors - 1))
+        return uniform(backoff / 2, backoff)
+
+    def sleep(self, response=None):
+        """Wait before the next attempt, for Retry-After if given, else the backoff."""
+        retry_after = None
+        if self.respect_retry_after_header and response is not None:
+            retry_after = self.get_retry_after(response)
+
+        if retry_after:
+            seconds = min(retry_after, self.RETRY_AFTER_MAX)
+        else:
+            seconds = self.get_backoff_time()
+        if seconds > 0:
+            reason = 'rate_limit' if response is not None and response.status == 429 else 'backoff'
+            telemetry.sleep(seconds, self.origin, reason)
+
+
+class TransportAdapter(HTTPAdapter):
+    """HTTPAdapter applying a default timeout to requests made without one."""
+
+    def __init__(self, timeout: Tuple[float, float], **kwargs):
+        """
+        Initialize the adapter.
+
+        Args:
+            timeout: Default (connect, read) timeout in seconds
+            **kwargs: HTTPAdapter arguments (pool sizes, max_retries)
+        """
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        """Send a request, with the default timeout unless one is given."""
+        telemetry.begin_request()
+        return super().send(request, timeout=timeout or self.timeout, **kwargs)
+
+
+class HTTPTransport:
+    """Builds pooled, retrying, instrumented requests sessions."""
+
+    CONNECT_TIMEOUT = 5  # seconds
+    READ_TIMEOUT = 15  # seconds
+    MAX_RETRIES = 3
+    BACKOFF_FACTOR = 1.0  # First retry after 0.5-1s, then 1-2s, 2-4s, ...
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    WORKERS = 4  # Concurrent workers per session: the overlapped fetch steps
+    POOL_HOSTS = 4  # Hosts a session keeps connection pools for
+
+    def __init__(
+        self,
+        workers: int = WORKERS,
+        retries: int = MAX_RETRIES,
+        backoff_factor: float = BACKOFF_FACTOR,
+        timeout: Optional[Tuple[float, float]] = None
+    ):
+        """
+        Initialize the transport settings.
+
+        Args:
+            workers: Threads sharing a session; each host's pool keeps this
+                many connections
+            retries: Attempts after the first for a failed request
+            backoff_factor: Base of the exponential backoff in seconds
+            timeout: Default (connect, read) timeout in seconds
+        """
+        self.workers = max(1, workers)
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout or (self.CONNECT_TIMEOUT, self.READ_TIMEOUT)
+
+    def retry(self) -> JitteredRetry:
+        """Retry policy for GET requests (raise_on_status off: the last response is returned)."""
+        return JitteredRetry(
+            total=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            raise_on_status=False
+        )
+
+    def adapter(self) -> TransportAdapter:
+        """Connection-pooling adapter with the retry policy and default timeout."""
+        return TransportAdapter(
+            self.timeout,
+            pool_connections=self.POOL_HOSTS,
+            pool_maxsize=self.workers,
+            pool_block=True,
+            max_retries=self.retry()
+        )
+
+    def session(self, headers: Optional[Dict[str, str]] = None, metrics=None) -> requests.Session:
+        """
+        Create a session using this transport.
+
+        Args:
+            headers: Headers sent with every request (e.g. User-Agent, API keys)
+            metrics: Stage metrics hook counting each response (see api.hooks)
+
+        Returns:
+            requests.Session, instrumented for stage metrics and telemetry
+        """
+        session = requests.Session()
+        adapter = self.adapter()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({
+            'Accept-Encoding': 'gzip, deflate, br' if brotli is not None else 'gzip, deflate',
+            'Connection': 'keep-alive'
+        })
+        if headers:
+            session.headers.update(headers)
+        return instrument_session(session, metrics)
+
+
+def create_session(
+    headers: Optional[Dict[str, str]] = None,
+    workers: int = HTTPTransport.WORKERS,
+    retries: int = HTTPTransport.MAX_RETRIES,
+    backoff_factor: float = HTTPTransport.BACKOFF_FACTOR,
+    timeout: Optional[Tuple[float, float]] = None,
+    metrics=None
+) -> requests.Session:
+    """
+    Convenience function to create a session on the shared transport.
+
+    Args:
+        headers: Headers sent with every request
+        workers: Threads sharing the session
+        retries: Attempts after the first for a failed request
+        backoff_factor: Base of the exponential backoff in seconds
+        timeout: Default (connect, read) timeout in seconds
+        metrics: Stage metrics hook counting each response (see api.hooks)
+
+    Returns:
+        requests.Session
+    """
+    return HTTPTransport(workers, retries, backoff_factor, timeout).session(headers, metrics)
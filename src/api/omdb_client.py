@@ -4,10 +4,14 @@ OMDB API client for fetching movie metadata and IMDb IDs.
 
 import logging
 import os
-from time import sleep
 from typing import Dict, List, Optional
 import requests
 
+from .batch_checkpoint import BatchCheckpoint
+from .hooks import null_metrics
+from .http_telemetry import telemetry
+from .http_transport import create_session
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,12 +21,14 @@ class OMDBClient:
     BASE_URL = "http://www.omdbapi.com/"
     RATE_LIMIT_DELAY = 0.5  # seconds between requests
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, metrics=None):
         """
         Initialize the OMDB client.
 
         Args:
             api_key: OMDB API key. If None, reads from OMDB_API_KEY env var.
+            metrics: Stage metrics hook for requests and cache lookups
+                (see api.hooks); nothing is counted by default
 
         Raises:
             ValueError: If no API key is provided or found in environment
@@ -35,7 +41,8 @@ class OMDBClient:
                 "or pass api_key parameter."
             )
 
-        self.session = requests.Session()
+        self.metrics = metrics or null_metrics
+        self.session = create_session(metrics=self.metrics)
         self._cache = {}  # Simple in-memory cache
 
     def search_movie(
@@ -68,7 +75,9 @@ class OMDBClient:
         # Check cache
         if use_cache and cache_key in self._cache:
             logger.debug(f"Cache hit for: {title} ({year})")
+            self.metrics.count_cache('omdb_client', hit=True)
             return self._cache[cache_key]
+        self.metrics.count_cache('omdb_client', hit=False)
 
         # Try multiple search strategies
         search_strategies = [
@@ -137,7 +146,7 @@ class OMDBClient:
 
         try:
             logger.debug(f"Querying OMDB for: {title} ({year})")
-            response = self.session.get(self.BASE_URL, params=params, timeout=10)
+            response = self.session.get(self.BASE_URL, params=params)
             response.raise_for_status()
 
             data = response.json()
@@ -156,7 +165,7 @@ class OMDBClient:
             logger.info(f"Found movie: {data.get('Title')} ({data.get('Year')}) - IMDb ID: {data.get('imdbID')}")
 
             # Rate limiting
-            sleep(self.RATE_LIMIT_DELAY)
+            telemetry.sleep(self.RATE_LIMIT_DELAY, self.BASE_URL)
 
             return data
 
@@ -167,7 +176,8 @@ class OMDBClient:
     def search_movies_batch(
         self,
         titles: List[str],
-        years: Optional[List[str]] = None
+        years: Optional[List[str]] = None,
+        checkpoint: Optional[BatchCheckpoint] = None
     ) -> List[Optional[Dict]]:
         """
         Search for multiple movies.
@@ -175,6 +185,8 @@ class OMDBClient:
         Args:
             titles: List of movie titles
             years: Optional list of years (must match length of titles)
+            checkpoint: Record each result here and reuse recorded ones
+                (see api.batch_checkpoint)
 
         Returns:
             List of movie data dictionaries (None for not found)
@@ -193,15 +205,25 @@ class OMDBClient:
 
         logger.info(f"Searching OMDB for {total} movies")
 
-        for idx, (title, year) in enumerate(zip(titles, years), 1):
-            logger.info(f"Processing {idx}/{total}: {title}")
-
-            try:
-                result = self.search_movie(title, year)
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Failed to search for {title}: {e}")
-                results.append(None)
+        try:
+            for idx, (title, year) in enumerate(zip(titles, years), 1):
+                logger.info(f"Processing {idx}/{total}: {title}")
+
+                try:
+                    if checkpoint is not None:
+                        result = checkpoint.call(
+                            f"omdb:search:{title}|{year or ''}",
+                            lambda: self.search_movie(title, year)
+                        )
+                    else:
+                        result = self.search_movie(title, year)
+                    results.append(result)
+                except Exception as e:
+                    logger.error(f"Failed to search for {title}: {e}")
+                    results.append(None)
+        finally:
+            if checkpoint is not None:
+                checkpoint.flush()
 
         successful = sum(1 for r in results if r is not None)
         logger.info(f"Successfully found {successful}/{total} movies in OMDB")
@@ -225,7 +247,7 @@ class OMDBClient:
         }
 
         try:
-            response = self.session.get(self.BASE_URL, params=params, timeout=10)
+            response = self.session.get(self.BASE_URL, params=params)
             response.raise_for_status()
 
             data = response.json()
@@ -234,7 +256,7 @@ class OMDBClient:
                 logger.warning(f"Movie not found for IMDb ID: {imdb_id}")
                 return None
 
-            sleep(self.RATE_LIMIT_DELAY)
+            telemetry.sleep(self.RATE_LIMIT_DELAY, self.BASE_URL)
             return data
 
         except requests.RequestException as e:
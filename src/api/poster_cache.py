@@ -0,0 +1,261 @@
+"""
+Poster cache: downloads OMDB posters once and publishes small thumbnails.
+
+Originals are stored content-addressed (by SHA-256) in a local cache
+directory that is not published. Thumbnails are written to
+docs/data/posters/<imdb_id>.<hash>.webp and recorded in
+docs/data/posters/index.json, keyed by IMDb ID, together with the poster URL
+they were made from. A later run only downloads posters whose IMDb ID is new
+or whose URL changed; if that download fails, the previous thumbnail stays
+published until a later run succeeds.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+import requests
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; without it no thumbnails are made
+    Image = None
+
+from .hooks import null_metrics
+from .http_telemetry import telemetry
+from .http_transport import create_session
+
+logger = logging.getLogger(__name__)
+
+
+class PosterCache:
+    """Download posters into a local cache and publish resized thumbnails."""
+
+    THUMBNAIL_WIDTH = 150  # Matches .details-poster in docs/styles.css
+    THUMBNAIL_QUALITY = 75
+    THUMBNAIL_DIR = 'posters'
+    INDEX_FILE = 'index.json'
+    HASH_LENGTH = 12
+    RATE_LIMIT_DELAY = 0.1  # seconds between downloads
+
+    def __init__(
+        self,
+        cache_dir: str = '.cache/posters',
+        output_dir: str = 'docs/data',
+        session: Optional[requests.Session] = None,
+        metrics=None
+    ):
+        """
+        Initialize the poster cache.
+
+        Args:
+            cache_dir: Directory for downloaded originals (not published)
+            output_dir: Data directory the thumbnails are published under
+            session: Requests session to download with (by default a new one
+                from api.http_transport.create_session)
+            metrics: Stage metrics hook for downloads and cache lookups
+                (see api.hooks); nothing is counted by default
+        """
+        self.cache_dir = Path(cache_dir)
+        self.output_dir = Path(output_dir)
+        self.thumbnail_dir = self.output_dir / self.THUMBNAIL_DIR
+        self.metrics = metrics or null_metrics
+        self.session = session or create_session(metrics=self.metrics)
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.thumbnail_dir.mkdir(parents=True, exist_ok=True)
+
+        self.index = self._load_index()
+        self.downloads = 0
+
+    def get_thumbnail(self, imdb_id: str, url: Optional[str]) -> Optional[Dict]:
+        """
+        Return the thumbnail for a poster, downloading and resizing if needed.
+
+        Args:
+            imdb_id: IMDb ID the poster belongs to
+            url: OMDB poster URL
+
+        Returns:
+            Dictionary with 'path' (relative to output_dir), 'width' and
+            'height', or None if there is no usable poster. If a download or
+            resize fails, the previous thumbnail is returned, if any.
+        """
+        if not url or url == 'N/A' or Image is None:
+            return None
+
+        entry = self.index.get(imdb_id)
+        if entry and entry['source'] == url and (self.output_dir / entry['path']).exists():
+            self.metrics.count_cache('poster_thumbnails', hit=True)
+            return self._thumbnail_info(entry)
+        self.metrics.count_cache('poster_thumbnails', hit=False)
+
+        try:
+            original = self._load_original(entry, url)
+            thumbnail, width, height = self._resize(original)
+        except (requests.RequestException, OSError, ValueError) as e:
+            logger.warning(f"Could not cache poster for {imdb_id}: {e}")
+            if entry and (self.output_dir / entry['path']).exists():
+                return self._thumbnail_info(entry)
+            return None
+
+        digest = hashlib.sha256(thumbnail).hexdigest()[:self.HASH_LENGTH]
+        path = self.thumbnail_dir / f"{imdb_id}.{digest}.webp"
+        path.write_bytes(thumbnail)
+        self._remove_stale_thumbnails(imdb_id, keep=path.name)
+
+        entry = {
+            'source': url,
+            'sha256': hashlib.sha256(original).hexdigest(),
+            'path': path.relative_to(self.output_dir).as_posix(),
+            'width': width,
+            'height': height
+        }
+        self.index[imdb_id] = entry
+
+        logger.debug(f"Cached poster for {imdb_id}: {len(original)} -> {len(thumbnail)} bytes")
+        return self._thumbnail_info(entry)
+
+    def cache_posters(self, omdb_data: List[Optional[Dict]]) -> Dict[str, Dict]:
+        """
+        Cache posters for all movies with OMDB data.
+
+        Thumbnails are removed for movies that are no longer present or no
+        longer have a poster; a failed download keeps the movie's thumbnail.
+
+        Args:
+            omdb_data: List of OMDB API responses
+
+        Returns:
+            Dictionary mapping IMDb ID to thumbnail info (see get_thumbnail)
+        """
+        if Image is None:
+            logger.warning("Pillow not installed; skipping poster thumbnails")
+            return {}
+
+        movies = [d for d in omdb_data if d and d.get('imdbID')]
+        logger.info(f"Caching posters for {len(movies)} movies")
+
+        thumbnails = {}
+        for movie in movies:
+            thumbnail = self.get_thumbnail(movie['imdbID'], movie.get('Poster'))
+            if thumbnail:
+                thumbnails[movie['imdbID']] = thumbnail
+
+        self._prune({
+            movie['imdbID'] for movie in movies
+            if movie.get('Poster') and movie['Poster'] != 'N/A'
+        })
+        self._save_index()
+
+        logger.info(f"Poster thumbnails ready for {len(thumbnails)}/{len(movies)} movies "
+                    f"({self.downloads} downloaded)")
+        return thumbnails
+
+    def _load_original(self, entry: Optional[Dict], url: str) -> bytes:
+        """Read the original poster from the cache, or download it."""
+        if entry and entry['source'] == url:
+            cached = self.cache_dir / entry['sha256']
+            if cached.exists():
+                self.metrics.count_cache('poster_originals', hit=True)
+                return cached.read_bytes()
+        self.metrics.count_cache('poster_originals', hit=False)
+
+        logger.debug(f"Downloading poster {url}")
+        response = self.session.get(url)
+        response.raise_for_status()
+        self.downloads += 1
+        telemetry.sleep(self.RATE_LIMIT_DELAY, url)
+
+        original = response.content
+        (self.cache_dir / hashlib.sha256(original).hexdigest()).write_bytes(original)
+        return original
+
+    def _resize(self, original: bytes):
+        """Resize a poster to THUMBNAIL_WIDTH and encode it as WebP."""
+        with Image.open(io.BytesIO(original)) as image:
+            image = image.convert('RGB')
+            if image.width > self.THUMBNAIL_WIDTH:
+                height = round(image.height * self.THUMBNAIL_WIDTH / image.width)
+                image = image.resize((self.THUMBNAIL_WIDTH, height), Image.LANCZOS)
+
+            output = io.BytesIO()
+            image.save(output, 'WEBP', quality=self.THUMBNAIL_QUALITY, method=6)
+            return output.getvalue(), image.width, image.height
+
+    def _thumbnail_info(self, entry: Dict) -> Dict:
+        return {'path': entry['path'], 'width': entry['width'], 'height': entry['height']}
+
+    def _remove_stale_thumbnails(self, imdb_id: str, keep: str):
+        """Remove older thumbnails for imdb_id."""
+        pattern = re.compile(rf"^{re.escape(imdb_id)}\.[0-9a-f]{{{self.HASH_LENGTH}}}\.webp$")
+        for candidate in self.thumbnail_dir.glob(f"{imdb_id}.*.webp"):
+            if pattern.match(candidate.name) and candidate.name != keep:
+                candidate.unlink()
+
+    def _prune(self, keep_ids: set):
+        """Drop thumbnails and cached originals of movies not in keep_ids."""
+        for imdb_id in list(self.index):
+            if imdb_id not in keep_ids:
+                del self.index[imdb_id]
+
+        paths = {entry['path'] for entry in self.index.values()}
+        for thumbnail in self.thumbnail_dir.glob('*.webp'):
+            if thumbnail.relative_to(self.output_dir).as_posix() not in paths:
+                thumbnail.unlink()
+                logger.debug(f"Removed stale thumbnail {thumbnail}")
+
+        originals = {entry['sha256'] for entry in self.index.values()}
+        for original in self.cache_dir.iterdir():
+            if original.is_file() and original.name not in originals:
+                original.unlink()
+
+    def _load_index(self) -> Dict[str, Dict]:
+        path = self.thumbnail_dir / self.INDEX_FILE
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save_index(self):
+        path = self.thumbnail_dir / self.INDEX_FILE
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, indent=2, sort_keys=True)
+
+    def close(self):
+        """Close the requests session."""
+        self.session.close()
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
+
+def cache_poster_thumbnails(
+    omdb_data: List[Optional[Dict]],
+    output_dir: str = 'docs/data',
+    cache_dir: str = '.cache/posters',
+    metrics=None
+) -> Dict[str, Dict]:
+    """
+    Convenience function to cache posters and publish thumbnails.
+
+    Args:
+        omdb_data: List of OMDB API responses
+        output_dir: Data directory the thumbnails are published under
+        cache_dir: Directory for downloaded originals
+        metrics: Stage metrics hook (see api.hooks)
+
+    Returns:
+        Dictionary mapping IMDb ID to thumbnail info
+    """
+    with PosterCache(cache_dir, output_dir, metrics=metrics) as cache:
+        return cache.cache_posters(omdb_data)
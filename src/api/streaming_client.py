@@ -5,10 +5,14 @@ Uses RapidAPI's Streaming Availability API.
 
 import logging
 import os
-from time import sleep
 from typing import Dict, List, Optional
 import requests
 
+from .batch_checkpoint import BatchCheckpoint
+from .hooks import null_metrics
+from .http_telemetry import telemetry
+from .http_transport import create_session
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,12 +28,14 @@ class StreamingAvailabilityClient:
         'peacock', 'paramount', 'apple', 'mubi', 'stan'
     ]
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, metrics=None):
         """
         Initialize the Streaming Availability client.
 
         Args:
             api_key: RapidAPI key. If None, reads from RAPIDAPI_KEY env var.
+            metrics: Stage metrics hook for requests and cache lookups
+                (see api.hooks); nothing is counted by default
 
         Raises:
             ValueError: If no API key is provided or found in environment
@@ -42,11 +48,11 @@ class StreamingAvailabilityClient:
                 "or pass api_key parameter."
             )
 
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.metrics = metrics or null_metrics
+        self.session = create_session({
             'X-RapidAPI-Key': self.api_key,
             'X-RapidAPI-Host': 'streaming-availability.p.rapidapi.com'
-        })
+        }, metrics=self.metrics)
 
         self._cache = {}  # Simple in-memory cache
 
@@ -94,7 +100,9 @@ class StreamingAvailabilityClient:
         # Check cache
         if use_cache and cache_key in self._cache:
             logger.debug(f"Cache hit for IMDb ID: {imdb_id}")
+            self.metrics.count_cache('streaming_client', hit=True)
             return self._cache[cache_key]
+        self.metrics.count_cache('streaming_client', hit=False)
 
         try:
             logger.debug(f"Querying streaming availability for IMDb ID: {imdb_id}")
@@ -105,14 +113,8 @@ class StreamingAvailabilityClient:
                 'output_language': 'en'
             }
 
-            response = self.session.get(url, params=params, timeout=15)
-
-            # Handle rate limiting
-            if response.status_code == 429:
-                logger.warning("Rate limit hit, waiting before retry...")
-                sleep(5)
-                response = self.session.get(url, params=params, timeout=15)
-
+            # Rate limiting (429) is retried by the session, honoring Retry-After
+            response = self.session.get(url, params=params)
             response.raise_for_status()
             data = response.json()
 
@@ -123,7 +125,7 @@ class StreamingAvailabilityClient:
             self._cache[cache_key] = result
 
             # Rate limiting
-            sleep(self.RATE_LIMIT_DELAY)
+            telemetry.sleep(self.RATE_LIMIT_DELAY, url)
 
             return result
 
@@ -183,7 +185,8 @@ class StreamingAvailabilityClient:
     def get_streaming_options_batch(
         self,
         imdb_ids: List[str],
-        country: str = 'us'
+        country: str = 'us',
+        checkpoint: Optional[BatchCheckpoint] = None
     ) -> List[Optional[Dict]]:
         """
         Get streaming options for multiple movies.
@@ -191,6 +194,8 @@ class StreamingAvailabilityClient:
         Args:
             imdb_ids: List of IMDb IDs
             country: Country code
+            checkpoint: Record each result here and reuse recorded ones
+                (see api.batch_checkpoint)
 
         Returns:
             List of streaming option dictionaries (None for errors)
@@ -200,15 +205,25 @@ class StreamingAvailabilityClient:
 
         logger.info(f"Fetching streaming options for {total} movies")
 
-        for idx, imdb_id in enumerate(imdb_ids, 1):
-            logger.info(f"Processing {idx}/{total}: {imdb_id}")
-
-            try:
-                result = self.get_streaming_options(imdb_id, country)
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Failed to get streaming options for {imdb_id}: {e}")
-                results.append(None)
+        try:
+            for idx, imdb_id in enumerate(imdb_ids, 1):
+                logger.info(f"Processing {idx}/{total}: {imdb_id}")
+
+                try:
+                    if checkpoint is not None:
+                        result = checkpoint.call(
+                            f"streaming:{imdb_id}:{country}",
+                            lambda: self.get_streaming_options(imdb_id, country)
+                        )
+                    else:
+                        result = self.get_streaming_options(imdb_id, country)
+                    results.append(result)
+                except Exception as e:
+                    logger.error(f"Failed to get streaming options for {imdb_id}: {e}")
+                    results.append(None)
+        finally:
+            if checkpoint is not None:
+                checkpoint.flush()
 
         successful = sum(1 for r in results if r is not None)
         logger.info(f"Successfully fetched streaming info for {successful}/{total} movies")
@@ -0,0 +1,159 @@
+"""
+Publishing helpers for static data assets: content-hashed copies and,
+optionally, precompressed gzip/brotli variants.
+
+Content-hashed filenames (movies-manifest.3f2a9c1b0d4e.json) never change
+content, so browsers and the service worker can cache them indefinitely;
+only the small metadata.json that points at them has to be revalidated.
+
+Precompressed variants are off by default: GitHub Pages compresses
+responses itself and never serves .gz/.br files, so they would only grow
+every data commit. Enable them for hosts that serve precompressed files.
+"""
+
+import gzip
+import hashlib
+import logging
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip variants are always written
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+HASH_LENGTH = 12
+COMPRESSED_SUFFIXES = ('.gz', '.br')
+
+
+def content_hash(payload: bytes) -> str:
+    """Return the full SHA-256 hex digest of payload."""
+    return hashlib.sha256(payload).hexdigest()
+
+
+def hashed_name(name: str, digest: str) -> str:
+    """
+    Insert a content hash before the file extension.
+
+    Args:
+        name: Filename such as 'movies-manifest.json'
+        digest: Hex digest of the file contents
+
+    Returns:
+        Filename such as 'movies-manifest.3f2a9c1b0d4e.json'
+    """
+    path = Path(name)
+    return f"{path.stem}.{digest[:HASH_LENGTH]}{path.suffix}"
+
+
+class AssetPublisher:
+    """Write content-hashed, precompressed copies of generated data files."""
+
+    def __init__(self, output_dir: str = 'docs/data', compress: bool = False):
+        """
+        Initialize the asset publisher.
+
+        Args:
+            output_dir: Directory the published files live in
+            compress: Whether to write .gz (and .br, if brotli is installed) variants
+        """
+        self.output_dir = Path(output_dir)
+        self.compress = compress
+
+        if compress and brotli is None:
+            logger.info("brotli not installed; writing gzip variants only")
+
+    def variant_names(self, name: str) -> List[str]:
+        """
+        Names of a published file and the compressed variants written for it.
+
+        Args:
+            name: Filename
+
+        Returns:
+            [name], plus name.gz and name.br when compressing
+        """
+        if not self.compress:
+            return [name]
+        return [name] + [f"{name}{suffix}" for suffix in COMPRESSED_SUFFIXES]
+
+    def publish(self, path: Path) -> Dict:
+        """
+        Write a content-hashed copy of a file and remove older hashed copies.
+
+        The original file is left in place so existing URLs keep working.
+
+        Args:
+            path: File inside output_dir to publish
+
+        Returns:
+            Dictionary describing the published asset: 'path' (relative to
+            output_dir), 'sha256', 'bytes' and, when compressing,
+            'gzip_bytes' / 'brotli_bytes'
+        """
+        path = Path(path)
+        payload = path.read_bytes()
+        digest = content_hash(payload)
+
+        hashed_path = path.with_name(hashed_name(path.name, digest))
+        if not hashed_path.exists():
+            hashed_path.write_bytes(payload)
+
+        self._remove_stale_copies(path, keep=hashed_path.name)
+
+        asset = {
+            'path': hashed_path.relative_to(self.output_dir).as_posix(),
+            'sha256': digest,
+            'bytes': len(payload)
+        }
+        asset.update(self.write_compressed(hashed_path, payload))
+
+        logger.debug(f"Published {path.name} as {hashed_path.name}")
+        return asset
+
+    def write_compressed(self, path: Path, payload: Optional[bytes] = None) -> Dict[str, int]:
+        """
+        Write precompressed variants next to a file.
+
+        Args:
+            path: File to compress
+            payload: File contents, if already in memory
+
+        Returns:
+            Dictionary with 'gzip_bytes' and (if written) 'brotli_bytes'
+        """
+        if not self.compress:
+            return {}
+
+        path = Path(path)
+        if payload is None:
+            payload = path.read_bytes()
+
+        sizes = {}
+
+        # mtime=0 keeps the gzip output identical for identical input
+        gzipped = gzip.compress(payload, compresslevel=9, mtime=0)
+        Path(f"{path}.gz").write_bytes(gzipped)
+        sizes['gzip_bytes'] = len(gzipped)
+
+        if brotli is not None:
+            compressed = brotli.compress(payload, quality=11)
+            Path(f"{path}.br").write_bytes(compressed)
+            sizes['brotli_bytes'] = len(compressed)
+
+        return sizes
+
+    def _remove_stale_copies(self, path: Path, keep: str):
+        """Remove hashed copies and compressed variants of path other than keep's."""
+        pattern = re.compile(
+            rf"^{re.escape(path.stem)}\.[0-9a-f]{{{HASH_LENGTH}}}{re.escape(path.suffix)}"
+            rf"(?:{'|'.join(re.escape(s) for s in COMPRESSED_SUFFIXES)})?$"
+        )
+
+        for candidate in path.parent.glob(f"{path.stem}.*"):
+            if pattern.match(candidate.name) and candidate.name not in self.variant_names(keep):
+                candidate.unlink()
+                logger.debug(f"Removed stale asset {candidate}")
@@ -0,0 +1,191 @@
+"""
+Columnar, dictionary-encoded encoding of the movies list.
+
+movies.json repeats the same strings many times: service ids, option types
+and qualities, genres, directors, and rent/buy links that are identical for
+the same service. The compact format stores one column per field, replaces
+repeated strings with indices into per-field dictionaries, and stores each
+streaming option as an integer tuple into shared streaming dictionaries
+(including a link table).
+
+Layout:
+{
+    'format': 'ff-compact',
+    'version': 1,
+    'count': 168,
+    'fields': ['id', 'episode_number', ...],
+    'dictionaries': {'year': ['1933', ...], 'genre': ['Comedy', ...], ...},
+    'streaming': {
+        'fields': ['service', 'type', 'quality', 'link', 'price'],
+        'dictionaries': {'service': [...], 'link': [...], ...}
+    },
+    'columns': {
+        'title': ['Duck Soup', ...],          # plain values
+        'year': [0, ...],                     # index into dictionaries['year']
+        'genre': [[0, 1], ...],               # token indices, joined with ', '
+        'imdb_url': [0, ...],                 # 0 = derived from imdb_id
+        'streaming_options': [[[0, 1, 0, 0, 2], ...], ...]
+    },
+    'absent': {'rating_notes': [3, 17]}      # only if some movies lack a field
+}
+
+docs/app.js contains the matching decoder (decodeCompactMovies).
+"""
+
+import logging
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+FORMAT_NAME = 'ff-compact'
+FORMAT_VERSION = 1
+
+# Scalar fields with few distinct values, stored as dictionary indices
+DICTIONARY_FIELDS = ['year', 'imdb_rating', 'runtime', 'ar', 'br', 'jr', 'rating', 'rating_notes']
+
+# Multi-value string fields, stored as lists of token indices
+TOKEN_FIELDS = {'genre': ', ', 'director': ', '}
+
+# Streaming option keys, in tuple order; 'price' is only present for rent/buy
+STREAMING_FIELDS = ['service', 'type', 'quality', 'link', 'price']
+
+IMDB_URL_TEMPLATE = 'https://www.imdb.com/title/{}'
+DERIVED = 0  # Marker for imdb_url values that equal IMDB_URL_TEMPLATE.format(imdb_id)
+
+
+class _Dictionary:
+    """Assigns indices to values in order of first appearance."""
+
+    def __init__(self):
+        self.values = []
+        self._index = {}
+
+    def encode(self, value) -> int:
+        if value not in self._index:
+            self._index[value] = len(self.values)
+            self.values.append(value)
+        return self._index[value]
+
+
+def encode_compact_movies(movies: List[Dict]) -> Dict:
+    """
+    Encode movie entries into the compact columnar format.
+
+    Fields are taken in order of first appearance across all movies. Movies
+    produced by JSONGenerator share the same fields; rows lacking a field
+    are listed under 'absent' so that they decode without it.
+
+    Args:
+        movies: Movie entries as written to movies.json
+
+    Returns:
+        Compact payload (JSON-serializable)
+    """
+    fields = list(dict.fromkeys(field for movie in movies for field in movie))
+    absent = {}
+    dictionaries = {field: _Dictionary() for field in DICTIONARY_FIELDS + list(TOKEN_FIELDS)}
+    streaming_dictionaries = {field: _Dictionary() for field in STREAMING_FIELDS}
+    columns = {field: [] for field in fields}
+
+    for row, movie in enumerate(movies):
+        for field in fields:
+            if field not in movie:
+                absent.setdefault(field, []).append(row)
+            value = movie.get(field)
+
+            if field == 'streaming_options':
+                encoded = None if value is None else [
+                    _encode_option(option, streaming_dictionaries) for option in value
+                ]
+            elif field == 'imdb_url':
+                derived = IMDB_URL_TEMPLATE.format(movie.get('imdb_id'))
+                encoded = DERIVED if value is not None and value == derived else value
+            elif field in TOKEN_FIELDS and isinstance(value, str):
+                encoded = [dictionaries[field].encode(token) for token in value.split(TOKEN_FIELDS[field])]
+            elif field in DICTIONARY_FIELDS:
+                encoded = dictionaries[field].encode(value)
+            else:
+                encoded = value
+
+            columns[field].append(encoded)
+
+    payload = {
+        'format': FORMAT_NAME,
+        'version': FORMAT_VERSION,
+        'count': len(movies),
+        'fields': fields,
+        'dictionaries': {
+            field: dictionary.values
+            for field, dictionary in dictionaries.items() if field in columns
+        },
+        'streaming': {
+            'fields': STREAMING_FIELDS,
+            'dictionaries': {field: d.values for field, d in streaming_dictionaries.items()}
+        },
+        'columns': columns
+    }
+    if absent:
+        payload['absent'] = absent
+    return payload
+
+
+def decode_compact_movies(payload: Dict) -> List[Dict]:
+    """
+    Decode a compact payload back into movie entries.
+
+    Args:
+        payload: Output of encode_compact_movies
+
+    Returns:
+        Movie entries identical to the ones that were encoded
+
+    Raises:
+        ValueError: If the payload is not a supported compact format
+    """
+    if payload.get('format') != FORMAT_NAME or payload.get('version') != FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported compact format: {payload.get('format')} v{payload.get('version')}"
+        )
+
+    fields = payload['fields']
+    columns = payload['columns']
+    dictionaries = payload['dictionaries']
+    streaming_fields = payload['streaming']['fields']
+    streaming_dictionaries = payload['streaming']['dictionaries']
+    absent = {field: set(rows) for field, rows in payload.get('absent', {}).items()}
+
+    movies = []
+    for row in range(payload['count']):
+        movie = {}
+        for field in fields:
+            if row in absent.get(field, ()):
+                continue
+            value = columns[field][row]
+
+            if field == 'streaming_options':
+                value = None if value is None else [
+                    {
+                        name: streaming_dictionaries[name][index]
+                        for name, index in zip(streaming_fields, option)
+                    }
+                    for option in value
+                ]
+            elif field == 'imdb_url':
+                value = IMDB_URL_TEMPLATE.format(columns['imdb_id'][row]) if value == DERIVED else value
+            elif field in TOKEN_FIELDS and isinstance(value, list):
+                value = TOKEN_FIELDS[field].join(dictionaries[field][i] for i in value)
+            elif field in DICTIONARY_FIELDS:
+                value = dictionaries[field][value]
+
+            movie[field] = value
+        movies.append(movie)
+
+    return movies
+
+
+def _encode_option(option: Dict, dictionaries: Dict[str, _Dictionary]) -> List[int]:
+    """Encode one streaming option as a tuple of dictionary indices."""
+    encoded = [dictionaries[field].encode(option.get(field)) for field in STREAMING_FIELDS[:-1]]
+    if 'price' in option:
+        encoded.append(dictionaries['price'].encode(option['price']))
+    return encoded
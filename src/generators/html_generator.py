@@ -0,0 +1,385 @@
+"""
+HTML generator for pre-rendered pages of the web interface.
+
+Renders the first page of the movie table straight into docs/index.html, so
+it is visible before jQuery, DataTables and the data files have loaded, and
+writes a small static page per movie under docs/movies/. docs/app.js then
+takes over the pre-rendered table.
+
+Pre-rendered regions of index.html are delimited by comments, so the page
+can be regenerated in place:
+
+    <!-- prerender:rows -->...<!-- /prerender:rows -->
+
+The markup mirrors the format* functions in docs/app.js.
+"""
+
+import json
+import logging
+import re
+from datetime import datetime
+from html import escape
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .json_generator import JSONGenerator, sort_movies_for_table
+from .movie_keys import assign_movie_ids
+from .search_index import SERVICE_NAMES
+
+logger = logging.getLogger(__name__)
+
+MOVIE_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title} - Friendly Fire Movie Tracker</title>
+    <meta name="description" content="{description}">
+    <link rel="stylesheet" href="../styles.css">
+</head>
+<body>
+    <div class="container">
+        <header>
+            <h1>Friendly Fire Movie Tracker</h1>
+            <p class="subtitle"><a href="../index.html">&larr; All movies</a></p>
+        </header>
+
+        <main class="movie-page details-body">
+{details}
+        </main>
+    </div>
+</body>
+</html>
+"""
+
+
+def _text(value) -> str:
+    """Escape a display value, treating None and 'N/A' as empty."""
+    if value is None or value == 'N/A':
+        return ''
+    return escape(str(value))
+
+
+class HTMLGenerator:
+    """Generate pre-rendered HTML for the Friendly Fire web interface."""
+
+    PAGE_LENGTH = JSONGenerator.SHARD_SIZE  # Rows on the table's first page
+    MOVIES_DIR = 'movies'
+
+    def __init__(self, docs_dir: str = 'docs'):
+        """
+        Initialize the HTML generator.
+
+        Args:
+            docs_dir: GitHub Pages directory containing index.html
+        """
+        self.docs_dir = Path(docs_dir)
+
+    def render_index(
+        self,
+        movies: List[Dict],
+        last_updated: Optional[str] = None,
+        index_file: str = 'index.html'
+    ) -> Path:
+        """
+        Render the first table page and statistics into index.html.
+
+        Args:
+            movies: Movie entries as written to movies.json
+            last_updated: ISO timestamp of the data update
+            index_file: Page to update, relative to docs_dir
+
+        Returns:
+            Path to the updated page
+        """
+        logger.info(f"Pre-rendering first {self.PAGE_LENGTH} table rows into {index_file}")
+
+        index_path = self.docs_dir / index_file
+        page = index_path.read_text(encoding='utf-8')
+
+        ordered = sort_movies_for_table(movies)
+        rows = '\n'.join(self.render_row(movie, row) for row, movie in enumerate(ordered[:self.PAGE_LENGTH]))
+        available = sum(1 for movie in movies if movie.get('streaming_options'))
+
+        page = self._replace_region(page, 'rows', rows)
+        page = self._replace_region(page, 'total-movies', str(len(movies)))
+        page = self._replace_region(page, 'available-streaming', str(available))
+        if last_updated:
+            page = self._replace_region(page, 'last-updated', self.format_last_updated(last_updated))
+
+        # Show the pre-rendered table instead of the loading spinner
+        page = self._add_body_class(page, 'prerendered')
+
+        index_path.write_text(page, encoding='utf-8')
+        return index_path
+
+    def generate_movie_pages(self, movies: List[Dict]) -> Path:
+        """
+        Write a static page per movie and remove pages for removed movies.
+
+        Args:
+            movies: Movie entries (with ids assigned)
+
+        Returns:
+            Path to the movie pages directory
+        """
+        logger.info(f"Generating {len(movies)} static movie pages")
+
+        pages_dir = self.docs_dir / self.MOVIES_DIR
+        pages_dir.mkdir(parents=True, exist_ok=True)
+
+        written = set()
+        for movie in movies:
+            filename = f"{movie['id']}.html"
+            page = MOVIE_PAGE_TEMPLATE.format(
+                title=_text(movie.get('title')),
+                description=_text(movie.get('plot')),
+                details=self.render_details(movie)
+            )
+            (pages_dir / filename).write_text(page, encoding='utf-8')
+            written.add(filename)
+
+        for stale in pages_dir.glob('*.html'):
+            if stale.name not in written:
+                stale.unlink()
+                logger.debug(f"Removed stale movie page {stale}")
+
+        return pages_dir
+
+    def render_row(self, movie: Dict, row: int) -> str:
+        """
+        Render one table row.
+
+        docs/app.js builds the table on these rows and attaches the record
+        with the same data-id to each, so the title opens the details
+        dialog for data-row once the data has loaded.
+
+        Args:
+            movie: Movie entry
+            row: Position of the movie in table order
+
+        Returns:
+            <tr> markup matching the row docs/app.js renders
+        """
+        cells = [
+            ('dt-center', self.format_episode_number(movie)),
+            ('', f'<a href="{self.MOVIES_DIR}/{escape(movie["id"])}.html" class="details-link movie-title" '
+                 f'data-row="{row}">{_text(movie.get("title"))}</a>'),
+            ('dt-center', _text(movie.get('year'))),
+            ('dt-center', self.format_rating(movie.get('imdb_rating'), movie.get('imdb_votes'))),
+            ('dt-center', self.format_host_rating(movie.get('ar'))),
+            ('dt-center', self.format_host_rating(movie.get('br'))),
+            ('dt-center', self.format_host_rating(movie.get('jr'))),
+            ('dt-center', self.format_host_rating(movie.get('rating'))),
+            ('', self.format_streaming_options(movie.get('streaming_options'))),
+            ('dt-center', self.format_links(movie))
+        ]
+        return f'<tr data-id="{escape(movie["id"])}">' + ''.join(
+            f'<td class="{css}">{html}</td>' if css else f'<td>{html}</td>'
+            for css, html in cells
+        ) + '</tr>'
+
+    def render_details(self, movie: Dict) -> str:
+        """
+        Render the body of a movie page (the details dialog layout).
+
+        Args:
+            movie: Movie entry
+
+        Returns:
+            Details markup
+        """
+        poster = movie.get('poster')
+        thumbnail = movie.get('poster_thumbnail')
+        alt = f'{_text(movie.get("title"))} poster'
+        if thumbnail:
+            poster_html = (
+                f'<img class="details-poster" src="../data/{escape(thumbnail["path"])}" '
+                f'width="{thumbnail["width"]}" height="{thumbnail["height"]}" alt="{alt}">'
+            )
+        elif poster and poster != 'N/A':
+            poster_html = f'<img class="details-poster" src="{escape(poster)}" alt="{alt}">'
+        else:
+            poster_html = ''
+
+        facts = ''.join(
+            f'<dt>{label}</dt><dd>{_text(movie.get(field))}</dd>'
+            for label, field in [('Director', 'director'), ('Genre', 'genre'), ('Runtime', 'runtime')]
+            if _text(movie.get(field))
+        )
+        facts += ''.join(
+            f'<dt>{label}</dt><dd>{self.format_host_rating(movie.get(field))}</dd>'
+            for label, field in [('Adam', 'ar'), ('Ben', 'br'), ('John', 'jr'), ('Overall', 'rating')]
+            if movie.get(field)
+        )
+
+        episode = ''
+        if movie.get('episode_url'):
+            label = f"Episode {_text(movie.get('episode_number'))}" if movie.get('episode_number') else 'Episode'
+            episode = (
+                f'<p><a href="{escape(movie["episode_url"])}" target="_blank" '
+                f'rel="noopener noreferrer" class="episode-link">{label}</a></p>'
+            )
+
+        notes = f'<p class="details-notes">{_text(movie.get("rating_notes"))}</p>' if movie.get('rating_notes') else ''
+        year = f" ({_text(movie.get('year'))})" if _text(movie.get('year')) else ''
+
+        return f"""            {poster_html}
+            <div class="details-info">
+                <h2>{_text(movie.get('title'))}{year}</h2>
+                <dl class="details-facts">{facts}</dl>
+                <p>{_text(movie.get('plot'))}</p>
+                {notes}
+                {episode}
+                <h3>Where to Watch</h3>
+                {self.format_streaming_options(movie.get('streaming_options'))}
+                {self.format_links(movie)}
+            </div>"""
+
+    @staticmethod
+    def format_last_updated(timestamp: str) -> str:
+        """Format an ISO timestamp like updateLastUpdated in docs/app.js."""
+        try:
+            date = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+        except ValueError:
+            return ''
+        return f"Last updated: {date.strftime('%B')} {date.day}, {date.year} at {date.strftime('%I:%M %p')} UTC"
+
+    @staticmethod
+    def format_episode_number(movie: Dict) -> str:
+        """Episode number, linked to the episode page (formatEpisodeNumber)."""
+        number = movie.get('episode_number')
+        if not number:
+            return '<span class="no-streaming">-</span>'
+        if movie.get('episode_url'):
+            return (
+                f'<a href="{escape(movie["episode_url"])}" target="_blank" '
+                f'rel="noopener noreferrer" class="episode-link">{escape(str(number))}</a>'
+            )
+        return escape(str(number))
+
+    @staticmethod
+    def format_rating(rating, votes) -> str:
+        """IMDb rating with vote count (formatRating)."""
+        if not rating or rating == 'N/A':
+            return '<span class="no-streaming">No rating</span>'
+        formatted_votes = f" ({escape(str(votes))} votes)" if votes and votes != 'N/A' else ''
+        return (
+            f'<div class="rating"><span class="rating-stars">⭐</span> <strong>{escape(str(rating))}</strong> '
+            f'<span class="rating-votes" style="font-size:0.8em; color:#6b7280;">{formatted_votes}</span></div>'
+        )
+
+    @staticmethod
+    def format_host_rating(rating) -> str:
+        """Host rating, color-coded when numeric (formatHostRating)."""
+        if rating is None or rating in ('', 'N/A'):
+            return '<span class="no-streaming">-</span>'
+
+        try:
+            score = float(rating)
+        except (TypeError, ValueError):
+            return f'<span class="host-rating">{escape(str(rating))}</span>'
+
+        color = 'rating-high' if score >= 4 else 'rating-medium' if score >= 3 else 'rating-low'
+        return f'<span class="host-rating {color}">{escape(str(rating))}</span>'
+
+    @staticmethod
+    def format_streaming_options(options: Optional[List[Dict]]) -> str:
+        """Streaming badges linking to each service (formatStreamingOptions)."""
+        if not options:
+            return '<span class="no-streaming">Not available</span>'
+
+        badges = []
+        for option in options:
+            service = option.get('service') or ''
+            name = SERVICE_NAMES.get(service, service)
+            kind = option.get('type')
+            price = option.get('price')
+            title = f"{name} - {kind or 'subscription'}{' - ' + price if price else ''}"
+
+            text = name
+            if kind in ('rent', 'buy'):
+                text += f" {price}" if price else f" ({kind})"
+
+            css = f"streaming-badge badge-{service} {'badge-' + kind if kind else ''}".strip()
+            badges.append(
+                f'<a href="{escape(option.get("link") or "#")}" target="_blank" rel="noopener noreferrer" '
+                f'class="{escape(css)}" title="{escape(title)}">{escape(text)}</a>'
+            )
+
+        return f'<div class="streaming-badges">{"".join(badges)}</div>'
+
+    @staticmethod
+    def format_links(movie: Dict) -> str:
+        """IMDb link button (formatLinks)."""
+        imdb_id = movie.get('imdb_id')
+        url = movie.get('imdb_url') or (f"https://www.imdb.com/title/{imdb_id}" if imdb_id else None)
+        if not url:
+            return '<span class="no-streaming">-</span>'
+        return (
+            f'<div class="movie-links"><a href="{escape(url)}" target="_blank" '
+            f'rel="noopener noreferrer" class="link-button">IMDb</a></div>'
+        )
+
+    def generate_all(self, movies_json: Path) -> Dict[str, Path]:
+        """
+        Generate all pre-rendered HTML from a movies.json file.
+
+        Args:
+            movies_json: Path to movies.json (as written by JSONGenerator)
+
+        Returns:
+            Dictionary mapping output type to path
+        """
+        with open(movies_json, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        movies = assign_movie_ids(data.get('movies', []))
+
+        return {
+            'index': self.render_index(movies, data.get('last_updated')),
+            'movie_pages': self.generate_movie_pages(movies)
+        }
+
+    @staticmethod
+    def _add_body_class(page: str, name: str) -> str:
+        """Add a class to the <body> tag, keeping its other attributes and classes."""
+        def add_class(match):
+            attributes = match.group(1)
+            existing = re.search(r'\bclass\s*=\s*(["\'])(.*?)\1', attributes, re.DOTALL)
+            if existing is None:
+                return f'<body{attributes} class="{name}">'
+            classes = existing.group(2).split()
+            if name in classes:
+                return match.group(0)
+            quote = existing.group(1)
+            updated = f'class={quote}{" ".join(classes + [name])}{quote}'
+            return f'<body{attributes[:existing.start()]}{updated}{attributes[existing.end():]}>'
+
+        return re.sub(r'<body\b([^>]*)>', add_class, page, count=1)
+
+    @staticmethod
+    def _replace_region(page: str, name: str, content: str) -> str:
+        """Replace the content between <!-- prerender:name --> markers."""
+        pattern = re.compile(
+            rf'(<!-- prerender:{re.escape(name)} -->).*?(<!-- /prerender:{re.escape(name)} -->)',
+            re.DOTALL
+        )
+        if not pattern.search(page):
+            logger.warning(f"No prerender:{name} region found; skipping")
+            return page
+        return pattern.sub(lambda m: f"{m.group(1)}{content}{m.group(2)}", page, count=1)
+
+
+def generate_html_output(movies_json: Path, docs_dir: str = 'docs') -> Dict[str, Path]:
+    """
+    Convenience function to generate all pre-rendered HTML.
+
+    Args:
+        movies_json: Path to the generated movies.json
+        docs_dir: GitHub Pages directory
+
+    Returns:
+        Dictionary mapping output type to path
+    """
+    generator = HTMLGenerator(docs_dir)
+    return generator.generate_all(movies_json)
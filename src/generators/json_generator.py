@@ -2,6 +2,7 @@
 JSON generator for creating output data files for the web interface.
 """
 
+import base64
 import json
 import logging
 from datetime import datetime
@@ -9,37 +10,93 @@ from pathlib import Path
 from typing import Dict, List, Optional
 import pandas as pd
 
+from .asset_publisher import AssetPublisher, content_hash, hashed_name
+from .compact_encoder import encode_compact_movies
+from .movie_delta import compute_movie_delta, dataset_version
+from .movie_keys import assign_movie_ids, movie_key
+from .ratings_store import RATING_FIELDS, RatingsStore
+from .search_index import build_search_index
+from .sort_keys import with_sort_keys
+
 logger = logging.getLogger(__name__)
 
+# Fields the web table displays or sorts on; everything else is a detail
+# field that the frontend loads on demand. The *_num fields are numeric
+# sort keys (see sort_keys.py).
+TABLE_FIELDS = [
+    'id', 'episode_number', 'episode_number_num', 'episode_url', 'title', 'year',
+    'imdb_id', 'imdb_rating', 'imdb_rating_num', 'imdb_votes', 'imdb_votes_num',
+    'ar', 'ar_num', 'br', 'br_num', 'jr', 'jr_num', 'rating', 'rating_num'
+]
+
+# Streaming option fields needed to draw the "Where to Watch" badges
+STREAMING_SUMMARY_FIELDS = ['service', 'type', 'price']
+
 
 class JSONGenerator:
     """Generate JSON output files for the Friendly Fire web interface."""
 
-    def __init__(self, output_dir: str = 'docs/data'):
+    # Movies per shard; matches the table's default page length so the
+    # first shard is exactly the first page the frontend renders
+    SHARD_SIZE = 25
+    SHARD_DIR = 'shards'
+    DETAILS_DIR = 'details'
+    DELTA_DIR = 'deltas'
+    DELTA_HISTORY = 12  # Versions kept in the metadata.json delta chain
+    VERSION_FILE = 'version.json'
+    RATINGS_FILE = 'ratings.json'  # Host ratings store (see ratings_store.py)
+
+    def __init__(
+        self,
+        output_dir: str = 'docs/data',
+        previous_movies: Optional[List[Dict]] = None,
+        database=None,
+        ratings: Optional[RatingsStore] = None,
+        precompress: bool = False
+    ):
         """
         Initialize the JSON generator.
 
         Args:
             output_dir: Directory to write JSON files to
+            previous_movies: Movies from the previous run if already parsed
+                (see prior_state.PriorState); read from output_dir otherwise
+            database: storage.movie_database.MovieDatabase to read host
+                ratings from and record movies in; movies.json is then
+                exported from it
+            ratings: Host ratings to join, if already loaded (see load_ratings)
+            precompress: Also write .gz/.br variants of the published files,
+                for hosts that serve them (see asset_publisher.py)
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.publisher = AssetPublisher(output_dir, compress=precompress)
+        self.movies = []  # Movies from the last generate_movies_json call
+        self.previous_movies = assign_movie_ids(previous_movies) if previous_movies is not None else None
+        self.database = database
+        self.ratings = ratings
 
     def generate_movies_json(
         self,
         episodes_df: pd.DataFrame,
         omdb_data: List[Optional[Dict]],
         streaming_data: List[Optional[Dict]],
-        output_file: str = 'movies.json'
+        output_file: str = 'movies.json',
+        posters: Optional[Dict[str, Dict]] = None
     ) -> Path:
         """
         Generate the main movies.json file combining all data sources.
 
+        Host ratings are joined from the ratings store by movie key (see
+        load_ratings). Each movie carries numeric sort keys next to its
+        display strings (see sort_keys.with_sort_keys).
+
         Args:
             episodes_df: DataFrame with episode data (from data_cleaner)
             omdb_data: List of OMDB API responses
             streaming_data: List of Streaming API responses
             output_file: Output filename
+            posters: Poster thumbnails by IMDb ID (see api.poster_cache)
 
         Returns:
             Path to the generated JSON file
@@ -47,6 +104,14 @@ class JSONGenerator:
         logger.info("Generating movies.json")
 
         movies = []
+        posters = posters or {}
+        ratings = self.load_ratings()
+
+        # Index streaming responses by IMDb ID; the first response wins
+        streaming_by_imdb_id = {}
+        for stream in streaming_data:
+            if stream and stream.get('imdb_id'):
+                streaming_by_imdb_id.setdefault(stream['imdb_id'], stream)
 
         # Iterate through episodes and combine data
         for position, (idx, row) in enumerate(episodes_df.iterrows()):
@@ -57,12 +122,7 @@ class JSONGenerator:
             imdb_id = omdb_info.get('imdbID') if omdb_info else None
 
             # Get corresponding streaming data
-            streaming_info = None
-            if imdb_id:
-                for stream in streaming_data:
-                    if stream and stream.get('imdb_id') == imdb_id:
-                        streaming_info = stream
-                        break
+            streaming_info = streaming_by_imdb_id.get(imdb_id) if imdb_id else None
 
             # Build movie entry (include all movies)
             # If no IMDb data, use episode data from scraper
@@ -81,6 +141,7 @@ class JSONGenerator:
                     'director': omdb_info.get('Director', 'N/A'),
                     'plot': omdb_info.get('Plot', 'N/A'),
                     'poster': omdb_info.get('Poster', ''),
+                    'poster_thumbnail': posters.get(imdb_id),
                     'streaming_options': [],
                     'ar': None,
                     'br': None,
@@ -105,6 +166,7 @@ class JSONGenerator:
                     'director': 'N/A',
                     'plot': 'IMDb data not found for this movie. Episode information scraped from podcast website.',
                     'poster': '',
+                    'poster_thumbnail': None,
                     'streaming_options': [],
                     'ar': None,
                     'br': None,
@@ -117,7 +179,18 @@ class JSONGenerator:
             if streaming_info and streaming_info.get('streaming_options'):
                 movie['streaming_options'] = streaming_info['streaming_options']
 
-            movies.append(movie)
+            stored_rating = ratings.get(movie_key(movie))
+            if stored_rating:
+                movie.update(stored_rating)
+
+            movies.append(with_sort_keys(movie))
+
+        movies = assign_movie_ids(movies)
+        if self.database is not None:
+            # Only changed rows are written; movies.json is an export
+            self.database.record_movies(movies)
+            movies = self.database.export_movies()
+        self.movies = movies
 
         # Create final JSON structure
         output_data = {
@@ -134,30 +207,341 @@ class JSONGenerator:
         logger.info(f"Successfully generated {output_path} with {len(movies)} movies")
         return output_path
 
+    def generate_movie_shards(
+        self,
+        movies: List[Dict],
+        shard_size: Optional[int] = None,
+        manifest_file: str = 'movies-manifest.json'
+    ) -> Path:
+        """
+        Split movies into fixed-size shards plus a manifest for lazy loading.
+
+        Shards are sorted the way the table sorts by default (newest episode
+        first), so the frontend can render the first page from the first
+        shard and fetch the rest in the background. Shards only hold the
+        fields the table needs (see to_table_record); plots, posters and
+        full streaming links are written as per-movie detail files.
+
+        The manifest holds no run timestamp (that lives in metadata.json and
+        version.json), so an unchanged dataset keeps its manifest hash.
+
+        Args:
+            movies: Movie entries as written to movies.json
+            shard_size: Movies per shard (defaults to SHARD_SIZE)
+            manifest_file: Manifest filename
+
+        Returns:
+            Path to the generated manifest file
+        """
+        shard_size = shard_size or self.SHARD_SIZE
+        logger.info(f"Generating movie shards ({shard_size} movies per shard)")
+
+        shard_dir = self.output_dir / self.SHARD_DIR
+        shard_dir.mkdir(parents=True, exist_ok=True)
+
+        ordered = sort_movies_for_table(movies)
+        shards = []
+        written = set()
+
+        for index, start in enumerate(range(0, len(ordered), shard_size)):
+            shard_movies = ordered[start:start + shard_size]
+            payload = self._serialize_json(
+                {'index': index, 'movies': [to_table_record(m) for m in shard_movies]},
+                compact=True
+            )
+            digest = content_hash(payload)
+
+            # Shard names carry their content hash, so they can be cached forever
+            shard_name = hashed_name(f"movies-{index:03d}.json", digest)
+            shard_path = shard_dir / shard_name
+            shard_path.write_bytes(payload)
+            self.publisher.write_compressed(shard_path, payload)
+
+            written.update(self.publisher.variant_names(shard_name))
+            shards.append({
+                'file': f"{self.SHARD_DIR}/{shard_name}",
+                'count': len(shard_movies),
+                'bytes': len(payload),
+                'sha256': digest
+            })
+
+        # Remove shards left over from previous runs
+        for stale in shard_dir.glob('movies-*'):
+            if stale.name not in written:
+                stale.unlink()
+                logger.debug(f"Removed stale shard {stale}")
+
+        self.generate_movie_details(ordered)
+
+        manifest = {
+            'total_movies': len(ordered),
+            'movies_with_streaming': sum(1 for m in ordered if m.get('streaming_options')),
+            'shard_size': shard_size,
+            'shard_count': len(shards),
+            'sort': {'field': 'episode_number', 'direction': 'desc'},
+            'shards': shards,
+            'details_dir': self.DETAILS_DIR,
+            'facets': {'subscription': build_subscription_facets(ordered)}
+        }
+
+        output_path = self.output_dir / manifest_file
+        self._write_json(output_path, manifest)
+
+        logger.info(f"Successfully generated {output_path} with {len(shards)} shards")
+        return output_path
+
+    def generate_movie_details(self, movies: List[Dict]) -> Path:
+        """
+        Write one detail file per movie for on-demand loading.
+
+        Args:
+            movies: Movie entries with ids assigned
+
+        Returns:
+            Path to the details directory
+        """
+        logger.info("Generating per-movie detail files")
+
+        details_dir = self.output_dir / self.DETAILS_DIR
+        details_dir.mkdir(parents=True, exist_ok=True)
+
+        written = set()
+        for movie in movies:
+            detail_name = f"{movie['id']}.json"
+            self._write_json(details_dir / detail_name, to_detail_record(movie), compact=True)
+            written.add(detail_name)
+
+        # Remove details for movies no longer in the dataset
+        for stale in details_dir.glob('*.json'):
+            if stale.name not in written:
+                stale.unlink()
+                logger.debug(f"Removed stale detail file {stale}")
+
+        logger.info(f"Successfully generated {len(written)} detail files in {details_dir}")
+        return details_dir
+
+    def generate_compact_json(
+        self,
+        movies: List[Dict],
+        output_file: str = 'movies.compact.json'
+    ) -> Path:
+        """
+        Generate a columnar, dictionary-encoded copy of movies.json.
+
+        Args:
+            movies: Movie entries as written to movies.json
+            output_file: Output filename
+
+        Returns:
+            Path to the generated JSON file
+        """
+        logger.info("Generating movies.compact.json")
+
+        output_path = self.output_dir / output_file
+        payload = self._write_json(output_path, encode_compact_movies(movies), compact=True)
+
+        logger.info(f"Successfully generated {output_path} ({len(payload)} bytes)")
+        return output_path
+
+    def generate_search_index(
+        self,
+        movies: List[Dict],
+        version: Optional[str] = None,
+        output_file: str = 'search-index.json'
+    ) -> Path:
+        """
+        Generate the inverted search index used by the web interface.
+
+        Args:
+            movies: Movie entries as written to movies.json
+            version: Dataset version the index rows belong to
+            output_file: Output filename
+
+        Returns:
+            Path to the generated JSON file
+        """
+        logger.info("Generating search-index.json")
+
+        index = build_search_index(sort_movies_for_table(movies), version)
+
+        output_path = self.output_dir / output_file
+        payload = self._write_json(output_path, index, compact=True)
+
+        logger.info(
+            f"Successfully generated {output_path} with {len(index['tokens'])} tokens "
+            f"({len(payload)} bytes)"
+        )
+        return output_path
+
+    def generate_delta_json(
+        self,
+        previous_movies: List[Dict],
+        movies: List[Dict],
+        previous_versions: Optional[List[Dict]] = None
+    ) -> List[Dict]:
+        """
+        Write a delta from the previous dataset and extend the version chain.
+
+        Args:
+            previous_movies: Movies from the previous movies.json (ids assigned)
+            movies: Current movie entries
+            previous_versions: Version chain from the previous metadata.json
+
+        Returns:
+            Version chain, newest first. Each entry has 'version', 'previous'
+            and 'delta' (path relative to output_dir, or None).
+        """
+        previous_versions = previous_versions or []
+        version = dataset_version(movies)
+        delta_dir = self.output_dir / self.DELTA_DIR
+
+        if not previous_movies:
+            versions = [{'version': version, 'previous': None, 'delta': None}]
+        elif previous_versions and previous_versions[0]['version'] == version:
+            logger.info(f"Dataset unchanged at version {version}, no delta written")
+            versions = previous_versions
+        else:
+            delta = compute_movie_delta(previous_movies, movies)
+            if delta['from_version'] == version:
+                logger.info(f"Dataset unchanged at version {version}, no delta written")
+                versions = [{'version': version, 'previous': None, 'delta': None}]
+            else:
+                delta_dir.mkdir(parents=True, exist_ok=True)
+                delta_name = f"delta-{delta['from_version']}-{version}.json"
+                payload = self._write_json(delta_dir / delta_name, delta, compact=True)
+                self.publisher.write_compressed(delta_dir / delta_name, payload)
+
+                logger.info(
+                    f"Generated delta {delta['from_version']} -> {version}: "
+                    f"{len(delta['added'])} added, {len(delta['removed'])} removed, "
+                    f"{len(delta['changed'])} changed ({len(payload)} bytes)"
+                )
+                versions = [{
+                    'version': version,
+                    'previous': delta['from_version'],
+                    'delta': f"{self.DELTA_DIR}/{delta_name}",
+                    'bytes': len(payload),
+                    'generated': datetime.utcnow().isoformat() + 'Z'
+                }] + previous_versions
+
+        versions = versions[:self.DELTA_HISTORY]
+
+        # Remove deltas that fell out of the chain
+        if delta_dir.exists():
+            referenced = {
+                name
+                for v in versions if v.get('delta')
+                for name in self.publisher.variant_names(Path(v['delta']).name)
+            }
+            for stale in delta_dir.glob('delta-*'):
+                if stale.name not in referenced:
+                    stale.unlink()
+                    logger.debug(f"Removed stale delta {stale}")
+
+        return versions
+
+    def load_previous_movies(self, movies_file: str = 'movies.json') -> List[Dict]:
+        """
+        Load movies from the previously generated movies.json, if any.
+
+        The file is read at most once per generator, before it is
+        overwritten, and not at all if previous_movies was given.
+
+        Args:
+            movies_file: Movies filename inside output_dir
+
+        Returns:
+            Previous movie entries with ids assigned (empty if none)
+        """
+        if self.previous_movies is None:
+            data = self._read_json(self.output_dir / movies_file)
+            self.previous_movies = assign_movie_ids(data.get('movies', [])) if data else []
+        return self.previous_movies
+
+    def load_ratings(self) -> RatingsStore:
+        """
+        Load the host ratings store.
+
+        Ratings come from the database if one is attached and holds any,
+        after re-importing ratings.json into it if the file changed since it
+        was last synced (ratings merged locally and committed). Otherwise
+        they are read from ratings.json; if there is no store yet,
+        it is seeded from the ratings merged into the previous movies.json
+        so they survive the first regeneration.
+
+        Returns:
+            RatingsStore keyed by movie_key
+        """
+        if self.ratings is not None:
+            return self.ratings
+
+        store = RatingsStore(self.output_dir / self.RATINGS_FILE)
+        if self.database is not None:
+            self.database.sync_ratings(store.path)
+        if self.database is not None and self.database.has_ratings():
+            self.database.load_ratings(store)
+            logger.info(f"Loaded {len(store.ratings)} host ratings from {self.database.path}")
+            return store
+
+        if store.path.exists():
+            store.load()
+            logger.info(f"Loaded {len(store.ratings)} host ratings from {store.path}")
+            return store
+
+        for movie in self.load_previous_movies():
+            if any(movie.get(field) for field in RATING_FIELDS):
+                store.set(movie_key(movie), movie)
+
+        if store.ratings:
+            store.save()
+        return store
+
+    def load_previous_metadata(self, metadata_file: str = 'metadata.json') -> Dict:
+        """
+        Load the previously generated metadata.json, if any.
+
+        Args:
+            metadata_file: Metadata filename inside output_dir
+
+        Returns:
+            Previous metadata (empty if none)
+        """
+        return self._read_json(self.output_dir / metadata_file) or {}
+
     def generate_metadata_json(
         self,
         total_movies: int,
         successful_omdb: int,
         successful_streaming: int,
-        output_file: str = 'metadata.json'
+        output_file: str = 'metadata.json',
+        files: Optional[Dict[str, Dict]] = None,
+        versions: Optional[List[Dict]] = None
     ) -> Path:
         """
         Generate metadata file with information about the last update.
 
+        Also publishes a content-hashed copy of the metadata and writes
+        version.json, a tiny file naming the current dataset version and
+        that copy. Clients revalidate only version.json and fetch everything
+        else from cache until the version changes. The run timestamp is only
+        written to version.json, so the hashed metadata of an unchanged
+        dataset keeps its name.
+
         Args:
             total_movies: Total number of movies processed
             successful_omdb: Number of successful OMDB queries
             successful_streaming: Number of successful streaming queries
             output_file: Output filename
+            files: Published data assets by name (see AssetPublisher.publish)
+            versions: Dataset version chain, newest first (see generate_delta_json)
 
         Returns:
             Path to the generated JSON file
         """
         logger.info("Generating metadata.json")
 
+        now = datetime.utcnow()
         metadata = {
-            'last_updated': datetime.utcnow().isoformat() + 'Z',
-            'last_updated_readable': datetime.utcnow().strftime('%B %d, %Y at %H:%M UTC'),
             'statistics': {
                 'total_movies': total_movies,
                 'successful_omdb_queries': successful_omdb,
@@ -172,10 +556,25 @@ class JSONGenerator:
             }
         }
 
+        if files:
+            metadata['files'] = files
+
+        if versions:
+            metadata['version'] = versions[0]['version']
+            metadata['versions'] = versions
+
         output_path = self.output_dir / output_file
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(metadata, f, indent=2, ensure_ascii=False)
 
+        published = self.publisher.publish(output_path)
+        self._write_json(self.output_dir / self.VERSION_FILE, {
+            'version': metadata.get('version'),
+            'last_updated': now.isoformat() + 'Z',
+            'last_updated_readable': now.strftime('%B %d, %Y at %H:%M UTC'),
+            'metadata': published['path']
+        }, compact=True)
+
         logger.info(f"Successfully generated {output_path}")
         return output_path
 
@@ -183,7 +582,8 @@ class JSONGenerator:
         self,
         episodes_df: pd.DataFrame,
         omdb_data: List[Optional[Dict]],
-        streaming_data: List[Optional[Dict]]
+        streaming_data: List[Optional[Dict]],
+        posters: Optional[Dict[str, Dict]] = None
     ) -> Dict[str, Path]:
         """
         Generate all JSON output files.
@@ -192,40 +592,232 @@ class JSONGenerator:
             episodes_df: DataFrame with episode data
             omdb_data: List of OMDB API responses
             streaming_data: List of Streaming API responses
+            posters: Poster thumbnails by IMDb ID (see api.poster_cache)
 
         Returns:
             Dictionary mapping file type to output path
         """
+        # Capture the previous run's output before it is overwritten
+        previous_movies = self.load_previous_movies()
+        previous_metadata = self.load_previous_metadata()
+
         # Generate movies JSON
         movies_path = self.generate_movies_json(
             episodes_df,
             omdb_data,
-            streaming_data
+            streaming_data,
+            posters=posters
+        )
+
+        # Generate delta from the previous run for incremental client updates
+        versions = self.generate_delta_json(
+            previous_movies,
+            self.movies,
+            previous_metadata.get('versions')
         )
 
+        # Generate shards and manifest for lazy frontend loading
+        manifest_path = self.generate_movie_shards(self.movies)
+
+        # Generate compact columnar copy of movies.json
+        compact_path = self.generate_compact_json(self.movies)
+
+        # Generate search index over the table rows
+        search_path = self.generate_search_index(self.movies, versions[0]['version'])
+
         # Calculate statistics
         total_movies = len(episodes_df)
         successful_omdb = sum(1 for d in omdb_data if d and d.get('imdbID'))
         successful_streaming = sum(1 for d in streaming_data if d and d.get('streaming_options'))
 
+        # Publish content-hashed copies for long-lived caching.
+        # movies.json stays unhashed; the web interface loads the smaller files.
+        files = {
+            name: self.publisher.publish(path)
+            for name, path in [
+                ('manifest', manifest_path),
+                ('compact', compact_path),
+                ('search', search_path)
+            ]
+        }
+
         # Generate metadata JSON
         metadata_path = self.generate_metadata_json(
             total_movies,
             successful_omdb,
-            successful_streaming
+            successful_streaming,
+            files=files,
+            versions=versions
         )
 
         return {
             'movies': movies_path,
-            'metadata': metadata_path
+            'manifest': manifest_path,
+            'compact': compact_path,
+            'search': search_path,
+            'metadata': metadata_path,
+            'version': self.output_dir / self.VERSION_FILE
         }
 
+    def _serialize_json(self, data, compact: bool = False) -> bytes:
+        """
+        Serialize data to UTF-8 encoded JSON.
+
+        Args:
+            data: JSON-serializable data
+            compact: Serialize without indentation or extra whitespace
+
+        Returns:
+            Encoded JSON bytes
+        """
+        if compact:
+            text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        else:
+            text = json.dumps(data, indent=2, ensure_ascii=False)
+
+        return text.encode('utf-8')
+
+    def _read_json(self, path: Path) -> Optional[Dict]:
+        """
+        Read a previously generated JSON file.
+
+        Args:
+            path: File to read
+
+        Returns:
+            Parsed data, or None if the file is missing or unreadable
+        """
+        if not path.exists():
+            return None
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Could not read previous {path}: {e}")
+            return None
+
+    def _write_json(self, path: Path, data, compact: bool = False) -> bytes:
+        """
+        Serialize data to a JSON file.
+
+        Args:
+            path: Destination path
+            data: JSON-serializable data
+            compact: Write without indentation or extra whitespace
+
+        Returns:
+            The exact bytes written
+        """
+        payload = self._serialize_json(data, compact=compact)
+        with open(path, 'wb') as f:
+            f.write(payload)
+        return payload
+
+
+def to_table_record(movie: Dict) -> Dict:
+    """
+    Project a movie onto the fields the web table displays and sorts on.
+
+    Streaming options are reduced to a 'streaming' summary with just enough
+    to draw badges and filter by service; links live in the detail record.
+
+    Args:
+        movie: Movie entry
+
+    Returns:
+        Lean table record
+    """
+    record = {field: movie.get(field) for field in TABLE_FIELDS}
+    record['streaming'] = [
+        {k: option[k] for k in STREAMING_SUMMARY_FIELDS if k in option}
+        for option in movie.get('streaming_options') or []
+    ]
+    return record
+
+
+def to_detail_record(movie: Dict) -> Dict:
+    """
+    Project a movie onto the fields loaded on demand by the frontend.
+
+    Args:
+        movie: Movie entry
+
+    Returns:
+        Detail record keyed by the movie id
+    """
+    return {
+        field: value for field, value in movie.items()
+        if field == 'id' or field not in TABLE_FIELDS
+    }
+
+
+def build_subscription_facets(movies: List[Dict]) -> Dict[str, Dict]:
+    """
+    Precompute which rows each subscription service covers.
+
+    Each service gets a bitmap over table rows (bit i of byte i // 8 is row
+    i, base64-encoded) and a count, so the frontend can filter by service
+    with bitmap operations instead of scanning streaming options.
+
+    Args:
+        movies: Movie entries in table order
+
+    Returns:
+        Dictionary mapping service id to {'count': int, 'rows': base64 bitmap}
+    """
+    size = (len(movies) + 7) // 8
+    bitmaps = {}
+
+    for row, movie in enumerate(movies):
+        for option in movie.get('streaming_options') or []:
+            service = option.get('service')
+            if not service or (option.get('type') or 'subscription') != 'subscription':
+                continue
+            bitmap = bitmaps.setdefault(service, bytearray(size))
+            bitmap[row // 8] |= 1 << (row % 8)
+
+    return {
+        service: {
+            'count': sum(bin(byte).count('1') for byte in bitmap),
+            'rows': base64.b64encode(bytes(bitmap)).decode('ascii')
+        }
+        for service, bitmap in sorted(bitmaps.items())
+    }
+
+
+def sort_movies_for_table(movies: List[Dict]) -> List[Dict]:
+    """
+    Sort movies the way the web table sorts by default: newest episode first.
+
+    Movies without a numeric episode number keep their relative order and
+    sort after numbered episodes.
+
+    Args:
+        movies: Movie entries
+
+    Returns:
+        New list of movies in table order
+    """
+    def sort_key(movie: Dict):
+        try:
+            return (0, -int(movie.get('episode_number')))
+        except (TypeError, ValueError):
+            return (1, 0)
+
+    return sorted(movies, key=sort_key)
+
 
 def generate_json_output(
     episodes_df: pd.DataFrame,
     omdb_data: List[Optional[Dict]],
     streaming_data: List[Optional[Dict]],
-    output_dir: str = 'docs/data'
+    output_dir: str = 'docs/data',
+    posters: Optional[Dict[str, Dict]] = None,
+    previous_movies: Optional[List[Dict]] = None,
+    database=None,
+    ratings: Optional[RatingsStore] = None,
+    precompress: bool = False
 ) -> Dict[str, Path]:
     """
     Convenience function to generate all JSON output files.
@@ -235,9 +827,14 @@ def generate_json_output(
         omdb_data: List of OMDB API responses
         streaming_data: List of Streaming API responses
         output_dir: Directory to write JSON files to
+        posters: Poster thumbnails by IMDb ID (see api.poster_cache)
+        previous_movies: Movies from the previous run, if already parsed
+        database: MovieDatabase to read ratings from and record movies in
+        ratings: Host ratings to join, if already loaded
+        precompress: Also write .gz/.br variants of the published files
 
     Returns:
         Dictionary mapping file type to output path
     """
-    generator = JSONGenerator(output_dir)
-    return generator.generate_all(episodes_df, omdb_data, streaming_data)
+    generator = JSONGenerator(output_dir, previous_movies, database, ratings, precompress)
+    return generator.generate_all(episodes_df, omdb_data, streaming_data, posters)
@@ -0,0 +1,132 @@
+"""
+Deltas between two versions of the movies dataset.
+
+A delta lets a client that already holds version N-1 of the data move to
+version N by applying a small patch instead of downloading everything again.
+Movies are matched by their 'id' (see movie_keys.movie_key).
+
+Delta layout:
+{
+    'format': 'ff-delta',
+    'version': 1,
+    'from_version': '3f2a9c1b0d4e',
+    'to_version': '8a086c4ee53e',
+    'added': [{...full movie...}],
+    'removed': ['tt0000001'],
+    'changed': [{'id': 'tt0023969', 'set': {'imdb_votes': '65,102'}, 'unset': []}],
+    'order': ['tt0023969', ...]          # ids in the new dataset order
+}
+"""
+
+import hashlib
+import json
+import logging
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+FORMAT_NAME = 'ff-delta'
+FORMAT_VERSION = 1
+VERSION_LENGTH = 12
+
+
+def dataset_version(movies: List[Dict]) -> str:
+    """
+    Compute a short content hash identifying a version of the dataset.
+
+    Args:
+        movies: Movie entries (with ids assigned)
+
+    Returns:
+        Hex version string
+    """
+    canonical = json.dumps(movies, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:VERSION_LENGTH]
+
+
+def compute_movie_delta(old_movies: List[Dict], new_movies: List[Dict]) -> Dict:
+    """
+    Compute added, removed and changed movies between two dataset versions.
+
+    Changed movies carry field-level patches: 'set' holds new or modified
+    fields and 'unset' lists fields that no longer exist.
+
+    Args:
+        old_movies: Previous movie entries (with ids assigned)
+        new_movies: Current movie entries (with ids assigned)
+
+    Returns:
+        Delta dictionary (JSON-serializable)
+    """
+    old_by_id = {movie['id']: movie for movie in old_movies}
+    new_ids = {movie['id'] for movie in new_movies}
+
+    added = []
+    changed = []
+
+    for movie in new_movies:
+        old = old_by_id.get(movie['id'])
+        if old is None:
+            added.append(movie)
+            continue
+
+        patch = {
+            field: value for field, value in movie.items()
+            if field not in old or old[field] != value
+        }
+        unset = [field for field in old if field not in movie]
+
+        if patch or unset:
+            changed.append({'id': movie['id'], 'set': patch, 'unset': unset})
+
+    removed = [movie['id'] for movie in old_movies if movie['id'] not in new_ids]
+
+    return {
+        'format': FORMAT_NAME,
+        'version': FORMAT_VERSION,
+        'from_version': dataset_version(old_movies),
+        'to_version': dataset_version(new_movies),
+        'added': added,
+        'removed': removed,
+        'changed': changed,
+        'order': [movie['id'] for movie in new_movies]
+    }
+
+
+def apply_movie_delta(movies: List[Dict], delta: Dict) -> List[Dict]:
+    """
+    Apply a delta to the movies it was computed from.
+
+    Args:
+        movies: Movie entries at delta['from_version']
+        delta: Output of compute_movie_delta
+
+    Returns:
+        Movie entries at delta['to_version']
+
+    Raises:
+        ValueError: If the delta format is unsupported or does not apply
+    """
+    if delta.get('format') != FORMAT_NAME or delta.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported delta format: {delta.get('format')} v{delta.get('version')}")
+
+    by_id = {movie['id']: dict(movie) for movie in movies}
+
+    for movie_id in delta['removed']:
+        by_id.pop(movie_id, None)
+
+    for patch in delta['changed']:
+        if patch['id'] not in by_id:
+            raise ValueError(f"Delta changes unknown movie: {patch['id']}")
+        movie = by_id[patch['id']]
+        movie.update(patch['set'])
+        for field in patch['unset']:
+            movie.pop(field, None)
+
+    for movie in delta['added']:
+        by_id[movie['id']] = dict(movie)
+
+    try:
+        return [by_id[movie_id] for movie_id in delta['order']]
+    except KeyError as e:
+        raise ValueError(f"Delta order references unknown movie: {e}") from e
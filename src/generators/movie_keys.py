@@ -0,0 +1,62 @@
+"""
+Stable keys and ids for movie entries.
+
+movie_key identifies a movie across runs (the ratings store, the database
+and the delta files are keyed by it), and assign_movie_ids turns it into a
+unique 'id' per movie entry.
+
+This module has no third-party dependencies so the standalone
+utils/merge_ratings.py script can use it too.
+"""
+
+import re
+from typing import Dict, List
+
+
+def movie_key(movie: Dict) -> str:
+    """
+    Build a stable, filename-safe key for a movie.
+
+    Uses the IMDb ID when available, otherwise a slug of the episode URL
+    (or of title and year for episodes without a URL).
+
+    Args:
+        movie: Movie entry
+
+    Returns:
+        Key string such as 'tt0023969' or 'ep-duck-soup-1933'
+    """
+    if movie.get('imdb_id'):
+        return movie['imdb_id']
+
+    slug = (movie.get('episode_url') or '').rstrip('/').rsplit('/', 1)[-1]
+    if not slug:
+        slug = f"{movie.get('title', '')} {movie.get('year', '')}"
+
+    return 'ep-' + re.sub(r'[^a-z0-9]+', '-', slug.lower()).strip('-')
+
+
+def assign_movie_ids(movies: List[Dict]) -> List[Dict]:
+    """
+    Give every movie a unique 'id' derived from movie_key.
+
+    The same movie can be covered by more than one episode, so repeated
+    keys get a numeric suffix in order of appearance ('tt0086567-2').
+
+    Args:
+        movies: Movie entries
+
+    Returns:
+        New list of movie entries with 'id' as the first field
+    """
+    seen = {}
+    result = []
+
+    for movie in movies:
+        key = movie_key(movie)
+        seen[key] = seen.get(key, 0) + 1
+        movie_id = key if seen[key] == 1 else f"{key}-{seen[key]}"
+        fields = {k: v for k, v in movie.items() if k != 'id'}
+        result.append({'id': movie_id, **fields})
+
+    return result
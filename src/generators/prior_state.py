@@ -0,0 +1,231 @@
+"""
+Prior pipeline state: the previously generated movies.json, parsed once.
+
+Pipeline stages that reuse earlier results (--skip-scraping, --skip-apis,
+--skip-streaming) and the JSON generator (deltas, ratings seed) all read the
+same file. PriorState loads it a single time and indexes the movies by IMDb
+ID, episode URL and normalized title/year, so stages join against it by key
+rather than by list position.
+"""
+
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+import pandas as pd
+
+from .movie_keys import assign_movie_ids
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_title(title) -> str:
+    """
+    Normalize a title the way data_cleaner builds 'episode_normalized'.
+
+    Quotes are dropped first, as data_cleaner does for episode names, so
+    "Kelly's Heroes" and "Kellys Heroes" normalize alike.
+
+    Args:
+        title: Movie or episode title
+
+    Returns:
+        Lowercase title with runs of non-word characters collapsed to spaces
+    """
+    if title is None or (isinstance(title, float) and pd.isna(title)):
+        return ''
+    title = re.sub(r'[\'"\u2019]', '', str(title))
+    return re.sub(r'\W+', ' ', title).lower().strip()
+
+
+def title_year_key(title, year) -> tuple:
+    """Index key for a title and year."""
+    year = '' if year is None or (isinstance(year, float) and pd.isna(year)) else str(year).strip()
+    return normalize_title(title), year
+
+
+class PriorState:
+    """Movies from the previous run, indexed for joins."""
+
+    def __init__(
+        self,
+        movies: Optional[List[Dict]] = None,
+        omdb: Optional[Dict[str, Dict]] = None,
+        streaming: Optional[Dict[str, List[Dict]]] = None
+    ):
+        """
+        Initialize the prior state.
+
+        Args:
+            movies: Movie entries from the previous movies.json
+            omdb: Stored OMDB responses by IMDb ID; rebuilt from the movie
+                entries if not given
+            streaming: Stored streaming options by IMDb ID; taken from the
+                movie entries if not given
+        """
+        self.movies = assign_movie_ids(movies or [])
+        self.omdb = omdb or {}
+        self.streaming = streaming or {}
+        self.by_imdb_id = {}
+        self.by_episode_url = {}
+        self.by_title_year = {}
+
+        # First occurrence wins, as in the order of the previous movies.json.
+        # Some episodes only link a shared page (e.g. a live-show listing), so
+        # a URL is a key only if exactly one movie has it.
+        shared_urls = set()
+        for movie in self.movies:
+            if movie.get('imdb_id'):
+                self.by_imdb_id.setdefault(movie['imdb_id'], movie)
+            url = movie.get('episode_url')
+            if url:
+                if url in self.by_episode_url:
+                    shared_urls.add(url)
+                self.by_episode_url.setdefault(url, movie)
+            self.by_title_year.setdefault(title_year_key(movie.get('title'), movie.get('year')), movie)
+
+        for url in shared_urls:
+            del self.by_episode_url[url]
+
+    @classmethod
+    def load(cls, path: str = 'docs/data/movies.json') -> 'PriorState':
+        """
+        Parse a previously generated movies.json.
+
+        Args:
+            path: Path to movies.json
+
+        Returns:
+            PriorState (empty if the file is missing or unreadable)
+        """
+        path = Path(path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                movies = json.load(f).get('movies', [])
+        except FileNotFoundError:
+            logger.info(f"No prior state at {path}")
+            return cls()
+        except (json.JSONDecodeError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable prior state {path}: {e}")
+            return cls()
+
+        logger.info(f"Loaded prior state: {len(movies)} movies from {path}")
+        return cls(movies)
+
+    def __len__(self) -> int:
+        return len(self.movies)
+
+    def find(self, episode_url: Optional[str] = None, title=None, year=None) -> Optional[Dict]:
+        """
+        Find the prior movie for an episode.
+
+        Matches on episode URL first (if only one movie had it), then on
+        normalized title and year.
+
+        Args:
+            episode_url: Episode page URL
+            title: Episode or movie title
+            year: Release year
+
+        Returns:
+            Prior movie entry, or None
+        """
+        if episode_url and episode_url in self.by_episode_url:
+            return self.by_episode_url[episode_url]
+        if title:
+            return self.by_title_year.get(title_year_key(title, year))
+        return None
+
+    def raw_episodes(self) -> List[Dict]:
+        """
+        Rebuild scraper output from the prior movies.
+
+        Returns:
+            List of dictionaries with 'raw_title' and 'episode_url'
+        """
+        return [
+            {
+                'raw_title': f"{movie.get('title', '')} ({movie.get('year', '')})",
+                'episode_url': movie.get('episode_url', '')
+            }
+            for movie in self.movies
+        ]
+
+    def omdb_data(self, episodes_df: pd.DataFrame) -> List[Optional[Dict]]:
+        """
+        Rebuild OMDB responses for the rows of episodes_df.
+
+        Args:
+            episodes_df: DataFrame with episode data (from data_cleaner)
+
+        Returns:
+            List aligned with the rows of episodes_df; None where no prior
+            movie with an IMDb ID matches the row
+        """
+        omdb_data = []
+        for _, row in episodes_df.iterrows():
+            movie = self.find(row.get('episode_url'), row.get('episode'), row.get('year'))
+            if movie and movie.get('imdb_id'):
+                omdb_data.append(self.omdb.get(movie['imdb_id']) or to_omdb_record(movie))
+            else:
+                omdb_data.append(None)
+        return omdb_data
+
+    def streaming_data(self, imdb_ids: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Rebuild streaming responses from the prior movies.
+
+        Args:
+            imdb_ids: Restrict to these IMDb IDs (all prior movies by default)
+
+        Returns:
+            List of {'imdb_id', 'streaming_options'} for movies with options
+        """
+        ids = self.by_imdb_id if imdb_ids is None else dict.fromkeys(imdb_ids)
+        streaming_data = []
+        for imdb_id in ids:
+            if imdb_id in self.streaming:
+                options = self.streaming[imdb_id]
+            else:
+                options = (self.by_imdb_id.get(imdb_id) or {}).get('streaming_options')
+            if options:
+                streaming_data.append({'imdb_id': imdb_id, 'streaming_options': options})
+        return streaming_data
+
+
+def to_omdb_record(movie: Dict) -> Dict:
+    """
+    Convert a movie entry back to the OMDB response fields it came from.
+
+    Args:
+        movie: Movie entry with an IMDb ID
+
+    Returns:
+        OMDB-shaped dictionary
+    """
+    return {
+        'imdbID': movie.get('imdb_id'),
+        'Title': movie.get('title'),
+        'Year': movie.get('year'),
+        'imdbRating': movie.get('imdb_rating'),
+        'imdbVotes': movie.get('imdb_votes'),
+        'Runtime': movie.get('runtime'),
+        'Genre': movie.get('genre'),
+        'Director': movie.get('director'),
+        'Plot': movie.get('plot'),
+        'Poster': movie.get('poster')
+    }
+
+
+def load_prior_state(path: str = 'docs/data/movies.json') -> PriorState:
+    """
+    Convenience function to load the prior pipeline state.
+
+    Args:
+        path: Path to the previous movies.json
+
+    Returns:
+        PriorState
+    """
+    return PriorState.load(path)
@@ -0,0 +1,164 @@
+"""
+Persistent store of host ratings, keyed by movie.
+
+utils/merge_ratings.py fuzzy-matches the ratings spreadsheet to movies and
+records the result here; JSONGenerator joins it into every pipeline run with
+one dictionary lookup per movie, so ratings survive regeneration without
+matching again.
+
+Layout (docs/data/ratings.json):
+{
+    'format': 'ff-ratings',
+    'version': 1,
+    'updated': '2026-10-18T12:00:00Z',
+    'source': 'ratings_converted.csv',
+    'ratings': {
+        'tt0023969': {'ar': '4.5', 'br': '4', 'jr': '5', 'rating': 'Medals',
+                      'rating_notes': '', 'csv_title': 'Duck Soup (1933)',
+                      'confidence': 1.0}
+    },
+    'rows': {'3f2a9c1b...': 'tt0023969', '8a086c4e...': None}
+}
+
+Keys are movie_keys.movie_key values: the IMDb ID, or an episode key for
+movies without one. 'rows' maps a fingerprint of every imported CSV row to
+the movie it matched (None if unmatched), so an incremental import only
+matches rows that are new or changed.
+
+This module has no third-party dependencies so the standalone
+utils/merge_ratings.py script can use it too.
+"""
+
+import hashlib
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+FORMAT_NAME = 'ff-ratings'
+FORMAT_VERSION = 1
+
+# Movie fields filled from the store
+RATING_FIELDS = ['ar', 'br', 'jr', 'rating', 'rating_notes']
+
+
+def row_fingerprint(row: Dict) -> str:
+    """
+    Fingerprint a CSV row by its contents.
+
+    Args:
+        row: Row as read by csv.DictReader
+
+    Returns:
+        Hex digest that changes whenever any cell changes
+    """
+    canonical = json.dumps(row, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class RatingsStore:
+    """Host ratings keyed by movie, persisted as JSON."""
+
+    def __init__(self, path: str = 'docs/data/ratings.json'):
+        """
+        Initialize the ratings store.
+
+        Args:
+            path: Path of the store file
+        """
+        self.path = Path(path)
+        self.ratings = {}
+        self.rows = {}
+        self.source = None
+
+    def load(self) -> 'RatingsStore':
+        """
+        Load the store from disk; a missing file is an empty store.
+
+        Returns:
+            self, for chaining
+
+        Raises:
+            ValueError: If the file is not a supported ratings store
+        """
+        if not self.path.exists():
+            return self
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        if data.get('format') != FORMAT_NAME or data.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported ratings store: {data.get('format')} v{data.get('version')}")
+
+        self.ratings = data.get('ratings', {})
+        self.rows = data.get('rows', {})
+        self.source = data.get('source')
+
+        logger.debug(f"Loaded {len(self.ratings)} ratings from {self.path}")
+        return self
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Rating fields for a movie.
+
+        Args:
+            key: Movie key (see movie_keys.movie_key)
+
+        Returns:
+            Dictionary with RATING_FIELDS, or None if the movie has no rating
+        """
+        entry = self.ratings.get(key)
+        if entry is None:
+            return None
+        return {field: entry.get(field) for field in RATING_FIELDS}
+
+    def set(self, key: str, fields: Dict, **details):
+        """
+        Store rating fields for a movie.
+
+        Args:
+            key: Movie key
+            fields: Values for RATING_FIELDS
+            **details: Extra information to keep with the entry (CSV title, confidence)
+        """
+        self.ratings[key] = {**{field: fields.get(field) for field in RATING_FIELDS}, **details}
+
+    def retain(self, fingerprints: Iterable[str]):
+        """
+        Forget rows that are no longer in the CSV, and ratings that no
+        remaining row matched.
+
+        Args:
+            fingerprints: Fingerprints of the rows in the current CSV
+        """
+        current = set(fingerprints)
+        self.rows = {fp: key for fp, key in self.rows.items() if fp in current}
+
+        matched = set(self.rows.values())
+        self.ratings = {key: entry for key, entry in self.ratings.items() if key in matched}
+
+    def save(self, source: Optional[str] = None):
+        """
+        Write the store to disk.
+
+        Args:
+            source: Name of the CSV the ratings were imported from
+        """
+        if source:
+            self.source = source
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'format': FORMAT_NAME,
+                'version': FORMAT_VERSION,
+                'updated': datetime.utcnow().isoformat() + 'Z',
+                'source': self.source,
+                'ratings': dict(sorted(self.ratings.items())),
+                'rows': dict(sorted(self.rows.items()))
+            }, f, indent=2, ensure_ascii=False)
+
+        logger.info(f"Saved {len(self.ratings)} ratings to {self.path}")
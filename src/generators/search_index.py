@@ -0,0 +1,142 @@
+"""
+Inverted search index for the web interface.
+
+The index maps every token in a movie's searchable fields to the rows that
+contain it. It replaces DataTables' search once loaded, so it covers every
+column the table shows: episode number, title, year, IMDb rating and ID,
+host ratings and streaming services (by key and display name), plus the
+director, genre and plot. Tokens are stored sorted, so the frontend can find all tokens
+starting with a typed prefix with a binary search instead of scanning every
+table cell on each keystroke.
+
+Layout:
+{
+    'format': 'ff-search',
+    'version': 1,
+    'dataset_version': '8a086c4ee53e',
+    'count': 168,
+    'fields': ['episode_number', 'title', 'year', ..., 'streaming'],
+    'tokens': ['1933', 'comedy', 'duck', ...],    # sorted
+    'postings': [[0, 3, 1], ...]                 # row gaps, per token
+}
+
+Rows are positions in table order (see sort_movies_for_table). Postings are
+gap-encoded: [0, 3, 1] means rows 0, 3 and 4. docs/app.js tokenizes queries
+the same way as tokenize() below.
+"""
+
+import logging
+import re
+import unicodedata
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+FORMAT_NAME = 'ff-search'
+FORMAT_VERSION = 1
+
+SEARCH_FIELDS = [
+    'episode_number', 'title', 'year', 'director', 'genre', 'plot',
+    'imdb_rating', 'imdb_id', 'ar', 'br', 'jr', 'rating', 'streaming'
+]
+
+# Keep in sync with serviceNames in docs/app.js
+SERVICE_NAMES = {
+    'netflix': 'Netflix',
+    'prime': 'Prime Video',
+    'disney': 'Disney+',
+    'hbo': 'HBO Max',
+    'hulu': 'Hulu',
+    'apple': 'Apple TV+',
+    'paramount': 'Paramount+',
+    'peacock': 'Peacock',
+    'mubi': 'MUBI',
+    'stan': 'Stan'
+}
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text) -> List[str]:
+    """
+    Split text into lowercase ASCII tokens with accents removed.
+
+    Args:
+        text: Text to tokenize (non-strings are converted, None is empty)
+
+    Returns:
+        List of tokens in order of appearance
+    """
+    if text is None:
+        return []
+
+    decomposed = unicodedata.normalize('NFKD', str(text))
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return TOKEN_PATTERN.findall(stripped.lower())
+
+
+def movie_tokens(movie: Dict) -> set:
+    """
+    Tokens of a movie's searchable fields.
+
+    'streaming' is not a movie field: it stands for the services of the
+    movie's streaming options, by key and by display name.
+
+    Args:
+        movie: Movie entry
+
+    Returns:
+        Set of tokens
+    """
+    tokens = set()
+    for field in SEARCH_FIELDS:
+        if field == 'streaming':
+            for option in movie.get('streaming_options') or []:
+                service = option.get('service')
+                tokens.update(tokenize(service))
+                tokens.update(tokenize(SERVICE_NAMES.get(service)))
+        else:
+            tokens.update(tokenize(movie.get(field)))
+    return tokens
+
+
+def build_search_index(movies: List[Dict], dataset_version: Optional[str] = None) -> Dict:
+    """
+    Build an inverted index over the searchable fields of movies.
+
+    Args:
+        movies: Movie entries in table order
+        dataset_version: Version of the dataset the rows belong to
+
+    Returns:
+        Search index payload (JSON-serializable)
+    """
+    postings = {}
+
+    for row, movie in enumerate(movies):
+        for token in movie_tokens(movie):
+            postings.setdefault(token, []).append(row)
+
+    vocabulary = sorted(postings)
+
+    logger.debug(f"Indexed {len(movies)} movies with {len(vocabulary)} distinct tokens")
+
+    return {
+        'format': FORMAT_NAME,
+        'version': FORMAT_VERSION,
+        'dataset_version': dataset_version,
+        'count': len(movies),
+        'fields': SEARCH_FIELDS,
+        'tokens': vocabulary,
+        'postings': [_gap_encode(postings[token]) for token in vocabulary]
+    }
+
+
+def _gap_encode(rows: List[int]) -> List[int]:
+    """Encode ascending row numbers as differences from the previous row."""
+    previous = 0
+    gaps = []
+    for row in rows:
+        gaps.append(row - previous)
+        previous = row
+    return gaps
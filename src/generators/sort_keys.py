@@ -0,0 +1,160 @@
+"""
+Numeric sort keys for the display strings in movie entries.
+
+OMDB and the ratings spreadsheet deliver numbers as display strings
+('7.1', '65,041', '69 min', '4.5'), and some host ratings are free text
+('Pieces of pita bread'). Parsing them once here lets the web table sort on
+pre-typed values instead of calling parseFloat on every comparison.
+
+Each key is stored right after the field it is derived from:
+
+    'episode_number': '156', 'episode_number_num': 156,   # None for 'Bonus'
+    'imdb_rating': '7.1',    'imdb_rating_num': 7.1,
+    'imdb_votes': '65,041',  'imdb_votes_num': 65041,
+    'runtime': '69 min',     'runtime_min': 69,
+    'ar': '4.5',             'ar_num': 4.5,
+    'rating': 'Medals',      'rating_num': -1,     # TEXT_RATING
+
+Missing values ('N/A', '', None) become None.
+
+This module has no third-party dependencies so the standalone
+utils/merge_ratings.py script can use it too.
+"""
+
+import math
+import re
+from typing import Dict, Optional, Union
+
+# Sort key for host ratings that are text rather than a score. Scores are
+# never negative, so text ratings sort below every score and above missing
+# ratings.
+TEXT_RATING = -1
+
+HOST_RATING_FIELDS = ['ar', 'br', 'jr', 'rating']
+
+# Source field -> sort key field, in the order keys are inserted
+SORT_KEY_FIELDS = {
+    'episode_number': 'episode_number_num',
+    'imdb_rating': 'imdb_rating_num',
+    'imdb_votes': 'imdb_votes_num',
+    'runtime': 'runtime_min',
+    **{field: f"{field}_num" for field in HOST_RATING_FIELDS}
+}
+
+MISSING_VALUES = {'', 'n/a', 'none', '-'}
+
+RUNTIME_PATTERN = re.compile(r'^(\d+)\s*min', re.IGNORECASE)
+
+Number = Union[int, float]
+
+
+def parse_number(value) -> Optional[Number]:
+    """
+    Parse a display string such as '7.1' or '65,041' into a number.
+
+    Args:
+        value: Display value (string, number or None)
+
+    Returns:
+        int or float, or None if the value is missing or not numeric
+    """
+    if value is None or isinstance(value, bool):
+        return None
+
+    if isinstance(value, (int, float)):
+        number = value
+    else:
+        text = str(value).strip().replace(',', '')
+        if text.lower() in MISSING_VALUES:
+            return None
+        try:
+            number = float(text)
+        except ValueError:
+            return None
+
+    if isinstance(number, float):
+        if not math.isfinite(number):
+            return None
+        if number.is_integer():
+            return int(number)
+    return number
+
+
+def parse_runtime(value) -> Optional[int]:
+    """
+    Parse an OMDB runtime such as '69 min' into minutes.
+
+    Args:
+        value: Runtime display string
+
+    Returns:
+        Minutes, or None if the runtime is missing or not in minutes
+    """
+    if value is None:
+        return None
+
+    match = RUNTIME_PATTERN.match(str(value).strip())
+    return int(match.group(1)) if match else None
+
+
+def host_rating_sort_key(value) -> Optional[Number]:
+    """
+    Sort key for a host rating: the score, TEXT_RATING, or None if missing.
+
+    Args:
+        value: Host rating display value
+
+    Returns:
+        Numeric sort key or None
+    """
+    number = parse_number(value)
+    if number is not None:
+        return number
+
+    if value is None or str(value).strip().lower() in MISSING_VALUES:
+        return None
+    return TEXT_RATING
+
+
+def sort_key(field: str, value) -> Optional[Number]:
+    """
+    Compute the sort key for one source field.
+
+    Args:
+        field: Source field name (a key of SORT_KEY_FIELDS)
+        value: Display value of that field
+
+    Returns:
+        Numeric sort key or None
+    """
+    if field == 'runtime':
+        return parse_runtime(value)
+    if field in HOST_RATING_FIELDS:
+        return host_rating_sort_key(value)
+    return parse_number(value)
+
+
+def with_sort_keys(movie: Dict) -> Dict:
+    """
+    Return a copy of a movie entry with sort keys next to their source fields.
+
+    Existing sort keys are recomputed, so this can be called again after a
+    source field changes (e.g. when host ratings are merged).
+
+    Args:
+        movie: Movie entry
+
+    Returns:
+        New movie entry with sort keys added
+    """
+    key_fields = set(SORT_KEY_FIELDS.values())
+    result = {}
+
+    for field, value in movie.items():
+        if field in key_fields:
+            continue
+        result[field] = value
+        if field in SORT_KEY_FIELDS:
+            result[SORT_KEY_FIELDS[field]] = sort_key(field, value)
+
+    return result
@@ -2,18 +2,35 @@
 """
 Friendly Fire Movie Tracker - Main Orchestration Script
 
-This script coordinates the entire data pipeline:
-1. Scrape Maximum Fun for podcast episodes
-2. Clean and parse episode data
-3. Query OMDB API for movie metadata
-4. Query Streaming Availability API for where to watch
-5. Generate JSON output files for the web interface
+This script coordinates the entire data pipeline (see pipeline/stages.py):
+1. scrape     - Scrape Maximum Fun for podcast episodes
+2. clean      - Clean and parse episode data
+3. omdb       - Query OMDB API for movie metadata (new or stale episodes only)
+4. streaming  - Query Streaming Availability API for where to watch (likewise)
+5. posters    - Cache posters and publish thumbnails
+6. ratings    - Load host ratings
+7. generate   - Generate JSON output files for the web interface
+8. html       - Pre-render the table page and static movie pages
+
+Stages whose inputs, code and settings are unchanged since their last run
+reuse the cached outputs (.cache/pipeline). With --overlap, stages 1-4 run
+concurrently as a single fetch stage. Per-stage timings, memory, requests and
+cache hits are written to docs/data/metrics.json, together with request
+latency percentiles, status codes, retries and rate-limit sleeps per API host;
+daily request counts per host are kept in data/api_quota.json.
 
 Usage:
-    python src/main.py                    # Run full pipeline
-    python src/main.py --skip-apis        # Skip OMDB and streaming APIs (use cached data)
+    python src/main.py                    # Run full pipeline (APIs for new episodes only)
+    python src/main.py --full-refresh     # Look up every episode again
+    python src/main.py --skip-apis        # Skip OMDB and streaming APIs (offline)
     python src/main.py --skip-streaming   # Skip only streaming API
     python src/main.py --skip-scraping    # Skip scraping, use existing data
+    python src/main.py --skip-posters     # Skip poster thumbnails
+    python src/main.py --only generate    # Re-run one stage on cached inputs
+    python src/main.py --from omdb --to generate --force
+    python src/main.py --overlap          # Overlap scraping with API lookups
+    python src/main.py --resume           # Continue lookups of a run that failed
+    python src/main.py --profile          # Also dump cProfile statistics per stage
 """
 
 import argparse
@@ -25,11 +42,11 @@ from dotenv import load_dotenv
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from scrapers.maximumfun_scraper import scrape_friendly_fire_episodes
-from scrapers.data_cleaner import clean_friendly_fire_data
-from api.omdb_client import OMDBClient
-from api.streaming_client import StreamingAvailabilityClient
-from generators.json_generator import generate_json_output
+from api.http_telemetry import telemetry
+from pipeline.metrics import metrics, write_metrics
+from pipeline.runner import PipelineRunner
+from pipeline.stages import PipelineContext, build_stages
+from storage.movie_database import open_movie_database
 
 # Setup logging
 logging.basicConfig(
@@ -51,10 +68,22 @@ def parse_args():
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
-  python src/main.py                    # Run full pipeline
+  python src/main.py                    # Run full pipeline (APIs for new episodes only)
+  python src/main.py --full-refresh     # Look up every episode again
   python src/main.py --skip-apis        # Skip all API calls (use existing data)
   python src/main.py --skip-streaming   # Skip only streaming API
   python src/main.py --skip-scraping    # Use existing scraped data
+  python src/main.py --skip-posters     # Skip poster thumbnails
+  python src/main.py --only generate    # Re-run one stage on cached inputs
+  python src/main.py --from omdb        # Run omdb and everything after it
+  python src/main.py --to clean --force # Re-run scrape and clean regardless
+  python src/main.py --overlap          # Look up each episode as soon as it is scraped
+  python src/main.py --resume           # Reuse lookups recorded before a failure
+  python src/main.py --retry-failed     # ... and look up the failed ones again
+  python src/main.py --profile          # cProfile each stage into .cache/pipeline/profiles
+
+Stages: scrape, clean, omdb, streaming, posters, ratings, generate, html
+(with --overlap: fetch, posters, ratings, generate, html)
         """
     )
     parser.add_argument(
@@ -72,6 +101,64 @@ Examples:
         action='store_true',
         help='Skip scraping podcast episodes (uses existing data files)'
     )
+    parser.add_argument(
+        '--skip-posters',
+        action='store_true',
+        help='Skip downloading posters and generating thumbnails'
+    )
+    parser.add_argument(
+        '--full-refresh',
+        action='store_true',
+        help='Query the APIs for every episode instead of only new, unresolved or stale ones'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Reuse the API lookups checkpointed by a run that did not finish'
+    )
+    parser.add_argument(
+        '--retry-failed',
+        action='store_true',
+        help='Like --resume, but look up items that failed or were not found again'
+    )
+    parser.add_argument(
+        '--precompress',
+        action='store_true',
+        help='Also write .gz/.br copies of the published data files (for hosts that serve them)'
+    )
+    parser.add_argument(
+        '--overlap',
+        action='store_true',
+        help='Run scraping, cleaning, OMDB and streaming lookups concurrently'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Dump cProfile statistics of each stage to .cache/pipeline/profiles'
+    )
+    parser.add_argument(
+        '--from',
+        dest='start',
+        metavar='STAGE',
+        help='Run this stage and the stages that depend on it'
+    )
+    parser.add_argument(
+        '--to',
+        dest='stop',
+        metavar='STAGE',
+        help='Run this stage and the stages it depends on'
+    )
+    parser.add_argument(
+        '--only',
+        action='append',
+        metavar='STAGE',
+        help='Run only this stage (repeatable); other inputs come from the last run'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Run selected stages even if their inputs are unchanged'
+    )
     return parser.parse_args()
 
 
@@ -89,134 +176,36 @@ def main():
         logger.info("⚠️  Skipping scraping (using existing data)")
     logger.info("="*60)
 
+    database = None
     try:
         # Load environment variables from .env file if it exists
         load_dotenv()
         logger.info("Environment variables loaded")
 
-        # Step 1: Scrape podcast episodes (or load from cache)
-        if args.skip_scraping:
-            logger.info("\n[Step 1/5] Loading existing episode data...")
-            import json
-            with open('docs/data/movies.json', 'r') as f:
-                existing_data = json.load(f)
-            # Reconstruct raw episodes format
-            raw_episodes = []
-            for movie in existing_data['movies']:
-                raw_episodes.append({
-                    'raw_title': f"{movie.get('title', '')} ({movie.get('year', '')})",
-                    'episode_url': movie.get('episode_url', '')
-                })
-            logger.info(f"✓ Loaded {len(raw_episodes)} episodes from existing data")
-        else:
-            logger.info("\n[Step 1/5] Scraping Maximum Fun for episodes...")
-            raw_episodes = scrape_friendly_fire_episodes(max_pages=20)
-            logger.info(f"✓ Scraped {len(raw_episodes)} raw episodes")
-
-        if not raw_episodes:
-            logger.error("No episodes found. Exiting.")
-            return 1
-
-        # Step 2: Clean and parse episode data
-        logger.info("\n[Step 2/5] Cleaning and parsing episode data...")
-        episodes_df = clean_friendly_fire_data(raw_episodes)
-        logger.info(f"✓ Cleaned data: {len(episodes_df)} valid movie episodes")
-
-        if episodes_df.empty:
-            logger.error("No valid episodes after cleaning. Exiting.")
-            return 1
-
-        # Step 3: Query OMDB API (or use cache)
-        if args.skip_apis:
-            logger.info("\n[Step 3/5] Skipping OMDB API (using cached data)...")
-            import json
-            with open('docs/data/movies.json', 'r') as f:
-                existing_data = json.load(f)
-            # Reconstruct OMDB data format
-            omdb_data = []
-            for movie in existing_data['movies']:
-                if movie.get('imdb_id'):
-                    omdb_data.append({
-                        'imdbID': movie.get('imdb_id'),
-                        'Title': movie.get('title'),
-                        'Year': movie.get('year'),
-                        'imdbRating': movie.get('imdb_rating'),
-                        'imdbVotes': movie.get('imdb_votes'),
-                        'Runtime': movie.get('runtime'),
-                        'Genre': movie.get('genre'),
-                        'Director': movie.get('director'),
-                        'Plot': movie.get('plot'),
-                        'Poster': movie.get('poster')
-                    })
-                else:
-                    omdb_data.append(None)
-            successful_omdb = len([d for d in omdb_data if d])
-            logger.info(f"✓ Using cached OMDB data: {successful_omdb}/{len(omdb_data)} movies")
-        else:
-            logger.info("\n[Step 3/5] Querying OMDB API for movie metadata...")
-            titles = episodes_df['episode_normalized'].tolist()
-            years = episodes_df['year'].tolist()
-
-            with OMDBClient() as omdb:
-                omdb_data = omdb.search_movies_batch(titles, years)
-
-            successful_omdb = sum(1 for d in omdb_data if d and d.get('imdbID'))
-            logger.info(f"✓ OMDB queries complete: {successful_omdb}/{len(titles)} successful")
-
-        # Step 4: Query Streaming Availability API (or use cache/skip)
-        if args.skip_apis or args.skip_streaming:
-            logger.info("\n[Step 4/5] Skipping Streaming API (using cached data)...")
-            import json
-            with open('docs/data/movies.json', 'r') as f:
-                existing_data = json.load(f)
-            # Reconstruct streaming data format
-            streaming_data = []
-            for movie in existing_data['movies']:
-                if movie.get('streaming_options'):
-                    streaming_data.append({
-                        'imdb_id': movie.get('imdb_id'),
-                        'streaming_options': movie.get('streaming_options')
-                    })
-                else:
-                    streaming_data.append(None)
-            successful_streaming = len([d for d in streaming_data if d and d.get('streaming_options')])
-            logger.info(f"✓ Using cached streaming data: {successful_streaming} movies with streaming info")
-        else:
-            logger.info("\n[Step 4/5] Querying Streaming Availability API...")
-            imdb_ids = [d.get('imdbID') for d in omdb_data if d and d.get('imdbID')]
-
-            if not imdb_ids:
-                logger.warning("No IMDb IDs found. Skipping streaming queries.")
-                streaming_data = []
-            else:
-                with StreamingAvailabilityClient() as streaming:
-                    streaming_data = streaming.get_streaming_options_batch(imdb_ids, country='us')
-
-                successful_streaming = sum(1 for d in streaming_data if d)
-                logger.info(f"✓ Streaming queries complete: {successful_streaming}/{len(imdb_ids)} successful")
-
-        # Step 5: Generate JSON output
-        logger.info("\n[Step 5/5] Generating JSON output files...")
-
-        output_paths = generate_json_output(
-            episodes_df,
-            omdb_data,
-            streaming_data,
-            output_dir='docs/data'
-        )
-
-        logger.info(f"✓ Generated {output_paths['movies']}")
-        logger.info(f"✓ Generated {output_paths['metadata']}")
+        # The database is the source of truth; stages record into it and the
+        # JSON files are exported from it. Its stored state is read once and
+        # shared by every stage.
+        database = open_movie_database('data/friendly_fire.db', data_dir='docs/data')
+        context = PipelineContext(args, database, database.prior_state())
+
+        profile_dir = '.cache/pipeline/profiles' if args.profile else None
+        runner = PipelineRunner(build_stages(context), profile_dir=profile_dir)
+        artifacts = runner.run(args.start, args.stop, args.only, force=args.force)
 
         # Summary
         logger.info("\n" + "="*60)
         logger.info("Pipeline Complete!")
         logger.info("="*60)
-        logger.info(f"Total episodes processed: {len(raw_episodes)}")
-        logger.info(f"Valid movie episodes: {len(episodes_df)}")
-        logger.info(f"Movies with OMDB data: {len([d for d in omdb_data if d])}")
-        logger.info(f"Movies with streaming data: {len([d for d in streaming_data if d])}")
-        logger.info(f"Output files: {', '.join(str(p) for p in output_paths.values())}")
+        if 'raw_episodes' in artifacts:
+            logger.info(f"Total episodes processed: {len(artifacts['raw_episodes'])}")
+        if 'episodes_df' in artifacts:
+            logger.info(f"Valid movie episodes: {len(artifacts['episodes_df'])}")
+        if 'omdb_data' in artifacts:
+            logger.info(f"Movies with OMDB data: {len([d for d in artifacts['omdb_data'] if d])}")
+        if 'streaming_data' in artifacts:
+            logger.info(f"Movies with streaming data: {len([d for d in artifacts['streaming_data'] if d])}")
+        if 'output_paths' in artifacts:
+            logger.info(f"Output files: {', '.join(str(p) for p in artifacts['output_paths'].values())}")
         logger.info("="*60)
 
         return 0
@@ -225,6 +214,17 @@ def main():
         logger.error(f"\n❌ Pipeline failed with error: {e}", exc_info=True)
         return 1
 
+    finally:
+        if database is not None:
+            database.close()
+        if metrics.stages:
+            logger.info("Stage metrics:\n" + metrics.summary())
+            http = telemetry.to_dict()
+            if http:
+                logger.info("HTTP telemetry:\n" + telemetry.summary())
+            write_metrics('docs/data/metrics.json', http)
+        telemetry.save_quota()
+
 
 if __name__ == '__main__':
     exit_code = main()
@@ -0,0 +1,268 @@
+"""
+Incremental enrichment: only new or unresolved episodes hit the APIs.
+
+Each cleaned episode row is joined to the stored movies (see PriorState.find):
+
+    new episode              search OMDB by title and year
+    stored, no IMDb ID       search again (unresolved)
+    stored, with IMDb ID     carry the stored OMDB response forward, unless
+                             it is due for refresh (then look it up by ID)
+
+Streaming availability is fetched for IMDb IDs never checked before and for
+those due for refresh; every other movie keeps its stored options.
+
+Refreshes go oldest first and are capped per run, so API usage per run is the
+number of new episodes plus at most MAX_REFRESH lookups per API, whatever the
+size of the archive. A failed refresh keeps the stored data.
+
+With checkpoints (see api.batch_checkpoint), every lookup result is recorded
+on disk, so a resumed run repeats none of the lookups that succeeded.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from api.batch_checkpoint import BatchCheckpoint
+from generators.prior_state import PriorState, to_omdb_record
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_time(timestamp: str) -> datetime:
+    return datetime.fromisoformat(timestamp.rstrip('Z'))
+
+
+def _checkpointed(checkpoint: Optional[BatchCheckpoint], key: str, fetch: Callable):
+    return checkpoint.call(key, fetch) if checkpoint is not None else fetch()
+
+
+class IncrementalEnrichment:
+    """Decide per episode whether to query the APIs or carry stored data forward."""
+
+    OMDB_REFRESH_AGE = timedelta(days=90)  # IMDb ratings and votes drift slowly
+    STREAMING_REFRESH_AGE = timedelta(days=28)  # Catalogs change monthly
+    MAX_REFRESH = 25  # Refresh lookups per API per run
+
+    def __init__(
+        self,
+        prior: PriorState,
+        omdb_checked: Optional[Dict[str, str]] = None,
+        streaming_checked: Optional[Dict[str, str]] = None,
+        full: bool = False,
+        omdb_checkpoint: Optional[BatchCheckpoint] = None,
+        streaming_checkpoint: Optional[BatchCheckpoint] = None,
+        now: Optional[datetime] = None
+    ):
+        """
+        Initialize the enrichment plan.
+
+        Args:
+            prior: Stored movies, OMDB responses and streaming options
+            omdb_checked: When each OMDB response was last checked (ISO
+                timestamps by IMDb ID, see MovieDatabase.omdb_checked)
+            streaming_checked: When each movie's streaming availability was
+                last fetched (see MovieDatabase.streaming_checked)
+            full: Query the APIs for every episode (no carrying forward)
+            omdb_checkpoint: Record OMDB lookups here, reusing recorded ones
+            streaming_checkpoint: Likewise for streaming lookups
+            now: Current time (UTC), for testing
+        """
+        self.prior = prior
+        self.full = full
+        self.omdb_checkpoint = omdb_checkpoint
+        self.streaming_checkpoint = streaming_checkpoint
+        now = now or datetime.utcnow()
+
+        imdb_ids = set(prior.by_imdb_id)
+        self.omdb_refresh = self._due(omdb_checked or {}, imdb_ids, now - self.OMDB_REFRESH_AGE)
+        self.streaming_refresh = self._due(streaming_checked or {}, imdb_ids, now - self.STREAMING_REFRESH_AGE)
+
+        # Responses actually fetched this run (to record in the database)
+        self.fetched_omdb = []
+        self.fetched_streaming = []
+        self.counts = {
+            'omdb_carried': 0, 'omdb_refreshed': 0, 'omdb_searched': 0,
+            'streaming_carried': 0, 'streaming_fetched': 0
+        }
+
+    def _due(self, checked: Dict[str, str], imdb_ids: Set[str], cutoff: datetime) -> Set[str]:
+        """The MAX_REFRESH stored movies checked longest ago, if before the cutoff."""
+        due = sorted(
+            (_parse_time(timestamp), imdb_id)
+            for imdb_id, timestamp in checked.items()
+            if imdb_id in imdb_ids and _parse_time(timestamp) < cutoff
+        )
+        return {imdb_id for _, imdb_id in due[:self.MAX_REFRESH]}
+
+    def lookup_omdb(self, client, row: Dict) -> Optional[Dict]:
+        """
+        OMDB data for a cleaned episode row, querying the API only if needed.
+
+        Args:
+            client: api.omdb_client.OMDBClient
+            row: Episode row (episode, episode_normalized, year, episode_url)
+
+        Returns:
+            OMDB response, or None if the movie is not found
+        """
+        movie = None if self.full else self.prior.find(row.get('episode_url'), row.get('episode'), row.get('year'))
+        imdb_id = movie.get('imdb_id') if movie else None
+
+        if imdb_id:
+            stored = self.prior.omdb.get(imdb_id) or to_omdb_record(movie)
+            if imdb_id not in self.omdb_refresh:
+                self.counts['omdb_carried'] += 1
+                metrics.count_cache('stored_omdb', hit=True)
+                return stored
+
+            self.counts['omdb_refreshed'] += 1
+            metrics.count_cache('stored_omdb', hit=False)
+            try:
+                result = _checkpointed(self.omdb_checkpoint, f"omdb:id:{imdb_id}",
+                                       lambda: client.get_movie_by_imdb_id(imdb_id))
+            except Exception as e:
+                logger.error(f"Failed to refresh OMDB data for {imdb_id}: {e}")
+                result = None
+            if not result:
+                return stored
+        else:
+            self.counts['omdb_searched'] += 1
+            metrics.count_cache('stored_omdb', hit=False)
+            try:
+                title, year = row['episode_normalized'], row['year']
+                result = _checkpointed(self.omdb_checkpoint, f"omdb:search:{title}|{year or ''}",
+                                       lambda: client.search_movie(title, year))
+            except Exception as e:
+                logger.error(f"Failed to search for {row['episode_normalized']}: {e}")
+                result = None
+            if not result:
+                return None
+
+        self.fetched_omdb.append(result)
+        return result
+
+    def lookup_streaming(self, client, imdb_id: str, country: str = 'us') -> Optional[Dict]:
+        """
+        Streaming options for a movie, querying the API only if needed.
+
+        Args:
+            client: api.streaming_client.StreamingAvailabilityClient
+            imdb_id: IMDb ID
+            country: Country code
+
+        Returns:
+            Streaming response ({'imdb_id', 'streaming_options', ...}), or
+            None if the lookup failed and nothing is stored
+        """
+        stored = None
+        if imdb_id in self.prior.streaming:
+            stored = {'imdb_id': imdb_id, 'streaming_options': self.prior.streaming[imdb_id]}
+            if not self.full and imdb_id not in self.streaming_refresh:
+                self.counts['streaming_carried'] += 1
+                metrics.count_cache('stored_streaming', hit=True)
+                return stored
+
+        self.counts['streaming_fetched'] += 1
+        metrics.count_cache('stored_streaming', hit=False)
+        try:
+            result = _checkpointed(self.streaming_checkpoint, f"streaming:{imdb_id}:{country}",
+                                   lambda: client.get_streaming_options(imdb_id, country))
+        except Exception as e:
+            logger.error(f"Failed to get streaming options for {imdb_id}: {e}")
+            result = None
+        if not result:
+            return stored
+
+        self.fetched_streaming.append(result)
+        return result
+
+    def lookup_omdb_batch(self, client, rows: Iterable[Dict]) -> List[Optional[Dict]]:
+        """
+        OMDB data for each episode row (see lookup_omdb).
+
+        Args:
+            client: OMDB client
+            rows: Episode rows
+
+        Returns:
+            List aligned with rows
+        """
+        try:
+            results = [self.lookup_omdb(client, row) for row in rows]
+        finally:
+            self.flush()
+        logger.info(
+            f"OMDB: {self.counts['omdb_searched']} searched, {self.counts['omdb_refreshed']} refreshed, "
+            f"{self.counts['omdb_carried']} carried forward"
+        )
+        if self.omdb_checkpoint is not None and self.omdb_checkpoint.reused:
+            logger.info(f"OMDB: {self.omdb_checkpoint.reused} lookups reused from {self.omdb_checkpoint.path}")
+        return results
+
+    def lookup_streaming_batch(self, client, imdb_ids: Iterable[str], country: str = 'us') -> List[Optional[Dict]]:
+        """
+        Streaming options for each IMDb ID (see lookup_streaming).
+
+        Args:
+            client: Streaming client
+            imdb_ids: IMDb IDs
+            country: Country code
+
+        Returns:
+            List aligned with imdb_ids
+        """
+        try:
+            results = [self.lookup_streaming(client, imdb_id, country) for imdb_id in imdb_ids]
+        finally:
+            self.flush()
+        logger.info(
+            f"Streaming: {self.counts['streaming_fetched']} fetched, "
+            f"{self.counts['streaming_carried']} carried forward"
+        )
+        if self.streaming_checkpoint is not None and self.streaming_checkpoint.reused:
+            logger.info(f"Streaming: {self.streaming_checkpoint.reused} lookups reused from {self.streaming_checkpoint.path}")
+        return results
+
+    def flush(self):
+        """Write buffered checkpoint results to disk."""
+        for checkpoint in (self.omdb_checkpoint, self.streaming_checkpoint):
+            if checkpoint is not None:
+                checkpoint.flush()
+
+    def clear(self):
+        """Remove the checkpoints once their results are stored."""
+        for checkpoint in (self.omdb_checkpoint, self.streaming_checkpoint):
+            if checkpoint is not None:
+                checkpoint.clear()
+
+
+def plan_enrichment(
+    database,
+    prior: PriorState,
+    full: bool = False,
+    omdb_checkpoint: Optional[BatchCheckpoint] = None,
+    streaming_checkpoint: Optional[BatchCheckpoint] = None
+) -> IncrementalEnrichment:
+    """
+    Convenience function to plan enrichment against the pipeline database.
+
+    Args:
+        database: storage.movie_database.MovieDatabase
+        prior: Stored movies (database.prior_state())
+        full: Query the APIs for every episode
+        omdb_checkpoint: Checkpoint for OMDB lookups
+        streaming_checkpoint: Checkpoint for streaming lookups
+
+    Returns:
+        IncrementalEnrichment
+    """
+    return IncrementalEnrichment(
+        prior,
+        database.omdb_checked(),
+        database.streaming_checked(),
+        full=full,
+        omdb_checkpoint=omdb_checkpoint,
+        streaming_checkpoint=streaming_checkpoint
+    )
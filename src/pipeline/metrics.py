@@ -0,0 +1,249 @@
+"""
+Per-stage instrumentation for the data pipeline.
+
+The runner measures every stage: wall and CPU time, and peak memory traced by
+tracemalloc. The stages pass the metrics singleton to the clients, caches and
+scrapers they create (see api.hooks): HTTP sessions report each response
+through a requests hook (record_response) and caches report lookups
+(count_cache); both are attributed to the stage running at the time,
+including its worker threads.
+
+The results are written to metrics.json next to metadata.json:
+
+    {
+      "generated_at": "...",
+      "total": {"wall_seconds": 12.3, "requests": 57, ...},
+      "stages": {
+        "omdb": {
+          "status": "ran",              # ran | skipped | cached (not selected)
+          "wall_seconds": 8.1, "cpu_seconds": 0.4, "peak_memory_bytes": 1843200,
+          "requests": {"count": 14, "bytes": 21504, "errors": 0},
+          "cache": {"stored_omdb": {"hits": 166, "misses": 2}, ...}
+        }
+      },
+      "http": {...}                     # per host and endpoint, see api.http_telemetry
+    }
+
+With a profile directory, each stage that runs does so under cProfile and its
+statistics are dumped to <stage>.prof (for pstats or snakeviz) and a
+<stage>.txt summary. cProfile sees only the thread it runs in, so worker
+threads of the overlapped fetch are not profiled.
+"""
+
+import cProfile
+import io
+import json
+import logging
+import pstats
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter, process_time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineMetrics:
+    """Timing, memory, request and cache counters per pipeline stage."""
+
+    PROFILE_LINES = 40  # Functions listed in each <stage>.txt summary
+
+    def __init__(self):
+        """Initialize empty metrics."""
+        self.stages = {}
+        self._current = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Measure a stage.
+
+        Args:
+            name: Stage name
+
+        Yields:
+            The stage's metrics dictionary (set 'status' on it)
+        """
+        entry = {
+            'status': 'ran',
+            'requests': {'count': 0, 'bytes': 0, 'errors': 0},
+            'cache': {}
+        }
+        self.stages[name] = entry
+        self._current = entry
+
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.start()
+
+        wall = perf_counter()
+        cpu = process_time()
+        try:
+            yield entry
+        finally:
+            entry['wall_seconds'] = round(perf_counter() - wall, 3)
+            entry['cpu_seconds'] = round(process_time() - cpu, 3)
+            entry['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+            if not tracing:
+                tracemalloc.stop()
+            self._current = None
+
+    @contextmanager
+    def profile(self, name: str, profile_dir: Optional[str]):
+        """
+        Run the enclosed code under cProfile and dump its statistics.
+
+        Args:
+            name: Stage name (the files are <name>.prof and <name>.txt)
+            profile_dir: Output directory; None disables profiling
+        """
+        if not profile_dir:
+            yield
+            return
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            self._dump_profile(profiler, Path(profile_dir), name)
+
+    def record_response(self, response, *args, **kwargs):
+        """
+        Count an HTTP response (a requests 'response' hook).
+
+        Usage:
+            session.hooks['response'].append(metrics.record_response)
+
+        Args:
+            response: requests.Response
+
+        Returns:
+            None, so requests keeps the response as is
+        """
+        entry = self._current
+        if entry is None:
+            return None
+
+        length = response.headers.get('Content-Length')
+        size = int(length) if length and length.isdigit() else len(response.content or b'')
+        with self._lock:
+            entry['requests']['count'] += 1
+            entry['requests']['bytes'] += size
+            if response.status_code >= 400:
+                entry['requests']['errors'] += 1
+        return None
+
+    def count_cache(self, cache: str, hit: bool, amount: int = 1):
+        """
+        Count a cache lookup.
+
+        Args:
+            cache: Cache name (e.g. 'omdb_client', 'posters')
+            hit: Whether the lookup was served from the cache
+            amount: Number of lookups
+        """
+        entry = self._current
+        if entry is None:
+            return
+
+        with self._lock:
+            counts = entry['cache'].setdefault(cache, {'hits': 0, 'misses': 0})
+            counts['hits' if hit else 'misses'] += amount
+
+    def to_dict(self, http: Optional[Dict] = None) -> Dict:
+        """
+        Metrics of every measured stage, with totals.
+
+        Args:
+            http: Request-level telemetry to include (HTTPTelemetry.to_dict())
+
+        Returns:
+            Dictionary as written to metrics.json
+        """
+        stages = self.stages.values()
+        total = {
+            'wall_seconds': round(sum(s.get('wall_seconds', 0) for s in stages), 3),
+            'cpu_seconds': round(sum(s.get('cpu_seconds', 0) for s in stages), 3),
+            'peak_memory_bytes': max((s.get('peak_memory_bytes', 0) for s in stages), default=0),
+            'requests': sum(s['requests']['count'] for s in stages),
+            'bytes': sum(s['requests']['bytes'] for s in stages),
+            'cache_hits': sum(c['hits'] for s in stages for c in s['cache'].values()),
+            'cache_misses': sum(c['misses'] for s in stages for c in s['cache'].values())
+        }
+        result = {
+            'generated_at': datetime.utcnow().isoformat() + 'Z',
+            'total': total,
+            'stages': self.stages
+        }
+        if http:
+            result['http'] = http
+        return result
+
+    def save(self, path: str, http: Optional[Dict] = None) -> Path:
+        """
+        Write metrics.json.
+
+        Args:
+            path: Output file
+            http: Request-level telemetry to include
+
+        Returns:
+            Path written
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(http), f, indent=2)
+        logger.info(f"Wrote stage metrics to {path}")
+        return path
+
+    def summary(self) -> str:
+        """One line per stage: status, times, memory, requests and cache hits."""
+        lines = []
+        for name, entry in self.stages.items():
+            hits = sum(c['hits'] for c in entry['cache'].values())
+            lookups = hits + sum(c['misses'] for c in entry['cache'].values())
+            lines.append(
+                f"{name:10} {entry['status']:8} {entry.get('wall_seconds', 0):8.2f}s wall "
+                f"{entry.get('cpu_seconds', 0):7.2f}s cpu "
+                f"{entry.get('peak_memory_bytes', 0) / 1e6:7.1f} MB peak "
+                f"{entry['requests']['count']:5} requests "
+                f"{hits}/{lookups} cache hits"
+            )
+        return '\n'.join(lines)
+
+    def _dump_profile(self, profiler: cProfile.Profile, profile_dir: Path, name: str):
+        """Write <name>.prof and a <name>.txt summary sorted by cumulative time."""
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(profile_dir / f"{name}.prof")
+
+        text = io.StringIO()
+        pstats.Stats(profiler, stream=text).sort_stats('cumulative').print_stats(self.PROFILE_LINES)
+        (profile_dir / f"{name}.txt").write_text(text.getvalue(), encoding='utf-8')
+        logger.info(f"Profile of {name} written to {profile_dir / name}.prof")
+
+
+# Shared by the runner, the API clients and the caches of one process
+metrics = PipelineMetrics()
+
+
+def write_metrics(path: str = 'docs/data/metrics.json', http: Optional[Dict] = None) -> Path:
+    """
+    Convenience function to write the metrics collected in this process.
+
+    Args:
+        path: Output file
+        http: Request-level telemetry to include
+
+    Returns:
+        Path written
+    """
+    return metrics.save(path, http)
@@ -0,0 +1,262 @@
+"""
+Overlapped scrape, clean, OMDB and streaming stages.
+
+The staged pipeline runs these as barriers: no OMDB lookup starts until every
+page is scraped and cleaned, and no streaming lookup until every OMDB lookup
+is done. Here each step runs in its own thread, connected by bounded queues:
+
+    pages ─> clean ─> episode rows ─> OMDB ─> imdbID ─> streaming
+                 └─> final clean (detail pages)
+
+Cleaning needs the whole episode list (transcript entries on one page number
+episodes on another), so each page re-cleans the episodes seen so far without
+fetching detail pages and forwards titles it has not seen. Those only affect
+episode numbers, not the title and year OMDB is queried with, so once the
+last page arrives the full clean runs while the lookups continue. Results are
+collected by key and joined to the final rows at the end.
+
+Wall time is close to that of the slowest step rather than the sum of all.
+"""
+
+import logging
+import queue
+import threading
+from time import monotonic
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from api.http_telemetry import telemetry
+from generators.prior_state import PriorState
+from scrapers.data_cleaner import EpisodeDataCleaner
+from .enrichment import IncrementalEnrichment
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()  # End-of-stream marker passed down each queue
+
+
+class OverlappedFetch:
+    """Scrape, clean and enrich episodes with the steps running concurrently."""
+
+    QUEUE_SIZE = 32  # Bounds each queue so a fast producer waits for its consumer
+    POLL_INTERVAL = 0.5  # seconds between checks for a failed step
+
+    def __init__(
+        self,
+        pages: Iterable[List[Dict[str, str]]],
+        omdb_client,
+        streaming_client=None,
+        enrichment: Optional[IncrementalEnrichment] = None,
+        country: str = 'us'
+    ):
+        """
+        Initialize the fetch.
+
+        Args:
+            pages: Raw episode pages, e.g. MaximumFunScraper.iter_pages()
+            omdb_client: api.omdb_client.OMDBClient
+            streaming_client: api.streaming_client.StreamingAvailabilityClient,
+                or None to skip streaming lookups
+            enrichment: Decides which lookups reach the APIs; by default
+                every episode is looked up
+            country: Country code for streaming lookups
+        """
+        self.pages = pages
+        self.omdb_client = omdb_client
+        self.streaming_client = streaming_client
+        self.country = country
+        self.enrichment = enrichment or IncrementalEnrichment(PriorState(), full=True)
+
+        self.raw_episodes = []
+        self.episodes_df = None
+        self.omdb_results = {}  # (title, year) -> OMDB data or None
+        self.streaming_results = {}  # imdbID -> streaming data or None
+        self.timings = {}  # step -> seconds spent working (excluding waits)
+
+        self._pages_queue = queue.Queue(self.QUEUE_SIZE)
+        self._omdb_queue = queue.Queue(self.QUEUE_SIZE)
+        self._streaming_queue = queue.Queue(self.QUEUE_SIZE)
+        self._failed = threading.Event()
+        self._errors = []
+
+    def run(self) -> Dict:
+        """
+        Run all steps and join their results to the cleaned episodes.
+
+        Returns:
+            Dictionary with raw_episodes, episodes_df, omdb_data (one entry
+            per row of episodes_df) and streaming_data (the streaming data
+            found, one entry per IMDb ID in order of omdb_data, or None if
+            streaming lookups were skipped)
+
+        Raises:
+            Exception: The first error raised by any step
+        """
+        steps = [('scrape', self._scrape), ('clean', self._clean), ('omdb', self._lookup_omdb)]
+        if self.streaming_client is not None:
+            steps.append(('streaming', self._lookup_streaming))
+
+        started = monotonic()
+        threads = [
+            threading.Thread(target=self._run_step, args=(name, step), name=f"fetch-{name}", daemon=True)
+            for name, step in steps
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = monotonic() - started
+
+        if self._errors:
+            raise self._errors[0]
+
+        busy = ', '.join(f"{name} {seconds:.1f}s" for name, seconds in self.timings.items())
+        logger.info(f"Overlapped fetch finished in {elapsed:.1f}s (busy: {busy})")
+
+        omdb_data = [
+            self.omdb_results.get(self._key(row))
+            for row in self.episodes_df.to_dict('records')
+        ]
+        streaming_data = None
+        if self.streaming_client is not None:
+            # Results are collected in claim order, with None for claimed IDs
+            # whose lookup failed or found nothing; keep the IDs' table order
+            imdb_ids = dict.fromkeys(d['imdbID'] for d in omdb_data if d and d.get('imdbID'))
+            streaming_data = [
+                self.streaming_results[imdb_id]
+                for imdb_id in imdb_ids
+                if self.streaming_results.get(imdb_id) is not None
+            ]
+
+        return {
+            'raw_episodes': self.raw_episodes,
+            'episodes_df': self.episodes_df,
+            'omdb_data': omdb_data,
+            'streaming_data': streaming_data
+        }
+
+    @staticmethod
+    def _key(row: Dict) -> Tuple[str, str]:
+        """OMDB lookup key of a cleaned episode row (the query's title and year)."""
+        return row['episode_normalized'], row['year']
+
+    def _run_step(self, name: str, step: Callable):
+        """Run one step, recording its busy time; a failure stops every step."""
+        self.timings[name] = 0.0
+        try:
+            step(name)
+        except Exception as e:
+            logger.error(f"Overlapped fetch step '{name}' failed: {e}")
+            self._errors.append(e)
+            self._failed.set()
+
+    def _put(self, q: queue.Queue, item):
+        """Put an item, waiting for room unless another step has failed."""
+        while not self._failed.is_set():
+            try:
+                q.put(item, timeout=self.POLL_INTERVAL)
+                return
+            except queue.Full:
+                continue
+
+    def _items(self, q: queue.Queue):
+        """Yield items until the end marker, or until another step has failed."""
+        while not self._failed.is_set():
+            try:
+                item = q.get(timeout=self.POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            if item is _DONE:
+                return
+            yield item
+
+    def _scrape(self, name: str):
+        pages = iter(self.pages)
+        while True:
+            started = monotonic()
+            page = next(pages, _DONE)
+            self.timings[name] += monotonic() - started
+            self._put(self._pages_queue, page)
+            if page is _DONE or self._failed.is_set():
+                return
+
+    def _clean(self, name: str):
+        cleaner = EpisodeDataCleaner(metrics, telemetry)
+        submitted = set()
+
+        def submit(df: pd.DataFrame):
+            for row in df.to_dict('records'):
+                key = self._key(row)
+                if key not in submitted:
+                    submitted.add(key)
+                    self._put(self._omdb_queue, row)
+
+        for page in self._items(self._pages_queue):
+            started = monotonic()
+            self.raw_episodes.extend(page)
+            try:
+                df = cleaner.clean_episodes(self.raw_episodes, fetch_detail_pages=False)
+            except ValueError:
+                df = None  # No movie episodes yet
+            self.timings[name] += monotonic() - started
+            if df is not None:
+                submit(df)
+
+        if self._failed.is_set():
+            return
+
+        # The full clean fetches missing episode numbers from detail pages;
+        # lookups for the titles already submitted continue meanwhile
+        started = monotonic()
+        self.episodes_df = cleaner.clean_episodes(self.raw_episodes)
+        self.timings[name] += monotonic() - started
+        submit(self.episodes_df)
+        self._put(self._omdb_queue, _DONE)
+
+    def _lookup_omdb(self, name: str):
+        for row in self._items(self._omdb_queue):
+            started = monotonic()
+            result = self.enrichment.lookup_omdb(self.omdb_client, row)
+            self.omdb_results[self._key(row)] = result
+            self.timings[name] += monotonic() - started
+
+            imdb_id = result.get('imdbID') if result else None
+            if imdb_id and self.streaming_client is not None and imdb_id not in self.streaming_results:
+                self.streaming_results[imdb_id] = None  # Claimed; filled by the streaming step
+                self._put(self._streaming_queue, imdb_id)
+
+        if not self._failed.is_set():
+            self._put(self._streaming_queue, _DONE)
+
+    def _lookup_streaming(self, name: str):
+        for imdb_id in self._items(self._streaming_queue):
+            started = monotonic()
+            self.streaming_results[imdb_id] = self.enrichment.lookup_streaming(
+                self.streaming_client, imdb_id, self.country
+            )
+            self.timings[name] += monotonic() - started
+
+
+def fetch_overlapped(
+    pages: Iterable[List[Dict[str, str]]],
+    omdb_client,
+    streaming_client=None,
+    enrichment: Optional[IncrementalEnrichment] = None,
+    country: str = 'us'
+) -> Dict:
+    """
+    Convenience function to run the overlapped scrape, clean and lookups.
+
+    Args:
+        pages: Raw episode pages
+        omdb_client: OMDB client
+        streaming_client: Streaming client, or None to skip streaming lookups
+        enrichment: Decides which lookups reach the APIs (all by default)
+        country: Country code for streaming lookups
+
+    Returns:
+        Dictionary with raw_episodes, episodes_df, omdb_data and streaming_data
+    """
+    return OverlappedFetch(pages, omdb_client, streaming_client, enrichment, country).run()
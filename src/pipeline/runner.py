@@ -0,0 +1,421 @@
+"""
+Small DAG runner for the data pipeline.
+
+Each Stage declares the artifacts it consumes and produces, the source files
+its behaviour depends on, and any parameters. Stages are ordered by their
+artifacts, and each run is fingerprinted by a hash of its input artifacts,
+code and parameters. A stage whose fingerprint matches its last successful
+run reuses the cached outputs instead of running again. Every stage is
+measured (see metrics.py), whether it runs or not.
+
+State lives in a cache directory (not published):
+
+    .cache/pipeline/
+        state.json        {stage: {fingerprint, finished_at, outputs: {artifact: hash}}}
+        <stage>.pkl       the stage's outputs from its last run
+"""
+
+import ast
+import hashlib
+import json
+import logging
+import pickle
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def artifact_hash(value: Any) -> str:
+    """
+    Hash an artifact value.
+
+    DataFrames are hashed by their JSON form and paths by the content of the
+    file they point to; everything else by its JSON form.
+
+    Args:
+        value: Artifact value
+
+    Returns:
+        Hex digest
+    """
+    if hasattr(value, 'to_json'):
+        data = value.to_json(orient='split', date_format='iso').encode('utf-8')
+    elif isinstance(value, Path):
+        data = value.read_bytes() if value.is_file() else str(value).encode('utf-8')
+    else:
+        data = json.dumps(value, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+def module_sources(*paths: str, root: str = 'src') -> List[str]:
+    """
+    Source files of modules and of every module under root they import.
+
+    Imports are followed transitively, including relative and
+    function-local ones, so a stage's code list can't miss a helper module.
+
+    Args:
+        *paths: Module files, e.g. 'src/generators/json_generator.py'
+        root: Directory that top-level imports resolve against
+
+    Returns:
+        Sorted file paths, relative like the arguments
+    """
+    root = Path(root)
+    seen = set()
+    pending = [Path(p) for p in paths]
+
+    while pending:
+        path = pending.pop()
+        if path in seen or not path.is_file():
+            continue
+        seen.add(path)
+
+        package = path.parent.relative_to(root).parts
+        for node in ast.walk(ast.parse(path.read_text(encoding='utf-8'))):
+            if isinstance(node, ast.Import):
+                names = [alias.name.split('.') for alias in node.names]
+            elif isinstance(node, ast.ImportFrom):
+                base = list(package[:len(package) - node.level + 1]) if node.level else []
+                base += node.module.split('.') if node.module else []
+                # 'from package import name' may import a submodule
+                names = [base] + [base + [alias.name] for alias in node.names]
+            else:
+                continue
+
+            for parts in names:
+                module = root.joinpath(*parts) if parts else root
+                pending += [module.with_suffix('.py'), module / '__init__.py']
+
+    return sorted(p.as_posix() for p in seen)
+
+
+class Stage:
+    """A pipeline step: a function from named input artifacts to named outputs."""
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[..., Dict[str, Any]],
+        inputs: Iterable[str] = (),
+        outputs: Iterable[str] = (),
+        code: Iterable[str] = (),
+        params: Optional[Dict] = None,
+        products: Iterable[str] = (),
+        max_age: Optional[timedelta] = None,
+        always_run: bool = False
+    ):
+        """
+        Define a stage.
+
+        Args:
+            name: Stage name, used on the command line
+            run: Function called with the input artifacts as keyword
+                arguments; returns a dictionary with every output artifact
+            inputs: Artifacts produced by upstream stages
+            outputs: Artifacts this stage produces
+            code: Glob patterns of files whose content affects the result
+            params: Settings that affect the result (e.g. command line flags)
+            products: Files the stage writes; a missing one forces a re-run
+            max_age: Re-run once the last run is older than this, for stages
+                that read external sources (websites, APIs)
+            always_run: Run every time (for cheap stages reading local state)
+        """
+        self.name = name
+        self.run = run
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.code = list(code)
+        self.params = params or {}
+        self.products = [Path(p) for p in products]
+        self.max_age = max_age
+        self.always_run = always_run
+
+    def code_hash(self) -> str:
+        """Hash of the stage's source files (paths and contents)."""
+        digest = hashlib.sha256()
+        for pattern in self.code:
+            for path in sorted(Path('.').glob(pattern)):
+                if path.is_file():
+                    digest.update(path.as_posix().encode('utf-8'))
+                    digest.update(hashlib.sha256(path.read_bytes()).digest())
+        return digest.hexdigest()
+
+    def fingerprint(self, input_hashes: Dict[str, str]) -> str:
+        """
+        Fingerprint a run of this stage.
+
+        Args:
+            input_hashes: Hash of each input artifact
+
+        Returns:
+            Hex digest of the inputs, code and parameters
+        """
+        payload = {
+            'stage': self.name,
+            'inputs': {name: input_hashes[name] for name in self.inputs},
+            'code': self.code_hash(),
+            'params': self.params
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class PipelineRunner:
+    """Run stages in dependency order, skipping those whose inputs are unchanged."""
+
+    STATE_FILE = 'state.json'
+
+    def __init__(self, stages: List[Stage], cache_dir: str = '.cache/pipeline', profile_dir: Optional[str] = None):
+        """
+        Initialize the runner.
+
+        Args:
+            stages: Pipeline stages, in any order
+            cache_dir: Directory for stage state and cached outputs
+            profile_dir: Dump cProfile statistics of each stage run here
+
+        Raises:
+            ValueError: If an input has no producing stage, an artifact has
+                two producers, or the stages form a cycle
+        """
+        self.stages = {stage.name: stage for stage in stages}
+        self.cache_dir = Path(cache_dir)
+        self.profile_dir = profile_dir
+        self.state = self._load_state()
+
+        self.producers = {}
+        for stage in stages:
+            for artifact in stage.outputs:
+                if artifact in self.producers:
+                    raise ValueError(f"Artifact '{artifact}' is produced by both "
+                                     f"'{self.producers[artifact]}' and '{stage.name}'")
+                self.producers[artifact] = stage.name
+        for stage in stages:
+            for artifact in stage.inputs:
+                if artifact not in self.producers:
+                    raise ValueError(f"Stage '{stage.name}' needs '{artifact}', which no stage produces")
+
+        self.order = self._topological_order()
+
+    def upstream(self, name: str) -> Set[str]:
+        """Names of all stages the given stage depends on, directly or not."""
+        result = set()
+        pending = [name]
+        while pending:
+            for artifact in self.stages[pending.pop()].inputs:
+                producer = self.producers[artifact]
+                if producer not in result:
+                    result.add(producer)
+                    pending.append(producer)
+        return result
+
+    def downstream(self, name: str) -> Set[str]:
+        """Names of all stages that depend on the given stage, directly or not."""
+        return {other for other in self.stages if name in self.upstream(other)}
+
+    def select(
+        self,
+        start: Optional[str] = None,
+        stop: Optional[str] = None,
+        only: Optional[Iterable[str]] = None
+    ) -> List[str]:
+        """
+        Choose the stages to run.
+
+        Args:
+            start: Run this stage and everything downstream of it (--from)
+            stop: Run this stage and everything upstream of it (--to)
+            only: Run exactly these stages (--only)
+
+        Returns:
+            Selected stage names, in run order
+
+        Raises:
+            ValueError: For unknown stage names
+        """
+        for name in [start, stop, *(only or [])]:
+            if name is not None and name not in self.stages:
+                raise ValueError(f"Unknown stage '{name}' (stages: {', '.join(self.order)})")
+
+        selected = set(self.stages)
+        if only:
+            selected = set(only)
+        if start:
+            selected &= {start} | self.downstream(start)
+        if stop:
+            selected &= {stop} | self.upstream(stop)
+        return [name for name in self.order if name in selected]
+
+    def run(
+        self,
+        start: Optional[str] = None,
+        stop: Optional[str] = None,
+        only: Optional[Iterable[str]] = None,
+        force: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Run the selected stages.
+
+        Unselected stages whose outputs are needed are not run; their
+        outputs from the last run are loaded from the cache (or, if there
+        are none, they are run after all).
+
+        Args:
+            start: See select
+            stop: See select
+            only: See select
+            force: Run selected stages even if their inputs are unchanged
+
+        Returns:
+            Dictionary of every artifact produced or loaded
+        """
+        selected = self.select(start, stop, only)
+        needed = set(selected)
+        for name in selected:
+            needed |= self.upstream(name)
+
+        artifacts = {}
+        hashes = {}
+        plan = [name for name in self.order if name in needed]
+
+        for number, name in enumerate(plan, 1):
+            with metrics.stage(name) as measured:
+                self._run_stage(number, len(plan), name, selected, force, artifacts, hashes, measured)
+
+        return artifacts
+
+    def _run_stage(
+        self,
+        number: int,
+        count: int,
+        name: str,
+        selected: List[str],
+        force: bool,
+        artifacts: Dict[str, Any],
+        hashes: Dict[str, str],
+        measured: Dict
+    ):
+        """Run or skip one stage, adding its outputs to artifacts and hashes."""
+        stage = self.stages[name]
+        label = f"[Stage {number}/{count}] {name}"
+        input_hashes = {artifact: hashes[artifact] for artifact in stage.inputs}
+
+        if name not in selected:
+            cached = self._load_outputs(stage)
+            if cached is not None:
+                logger.info(f"{label}: not selected, using outputs from the last run")
+                measured['status'] = 'cached'
+                artifacts.update(cached)
+                hashes.update(self.state[name]['outputs'])
+                return
+            logger.info(f"{label}: not selected, but has no cached outputs; running it")
+
+        fingerprint = stage.fingerprint(input_hashes)
+        reason = None if force else self._skip_reason(stage, fingerprint)
+        if reason:
+            cached = self._load_outputs(stage)
+            if cached is not None:
+                logger.info(f"{label}: skipped ({reason})")
+                measured['status'] = 'skipped'
+                artifacts.update(cached)
+                hashes.update(self.state[name]['outputs'])
+                return
+
+        logger.info(f"\n{label}...")
+        inputs = {artifact: artifacts[artifact] for artifact in stage.inputs}
+        with metrics.profile(name, self.profile_dir):
+            outputs = stage.run(**inputs)
+
+        missing = set(stage.outputs) - set(outputs)
+        if missing:
+            raise ValueError(f"Stage '{name}' did not produce {', '.join(sorted(missing))}")
+
+        artifacts.update(outputs)
+        output_hashes = {artifact: artifact_hash(outputs[artifact]) for artifact in stage.outputs}
+        hashes.update(output_hashes)
+
+        # Fingerprint again: a stage may rewrite one of its own code files
+        # (html rewrites the docs/index.html template it reads)
+        self._save_outputs(stage, outputs, stage.fingerprint(input_hashes), output_hashes)
+
+    def _skip_reason(self, stage: Stage, fingerprint: str) -> Optional[str]:
+        """Why the last run can be reused, or None if the stage must run."""
+        if stage.always_run:
+            return None
+
+        state = self.state.get(stage.name)
+        if not state or state.get('fingerprint') != fingerprint:
+            return None
+        if any(not path.exists() for path in stage.products):
+            return None
+
+        if stage.max_age is not None:
+            finished = datetime.fromisoformat(state['finished_at'].rstrip('Z'))
+            age = datetime.utcnow() - finished
+            if age > stage.max_age:
+                return None
+            return f"inputs unchanged, last run {age.total_seconds() / 3600:.1f}h ago"
+
+        return "inputs unchanged"
+
+    def _topological_order(self) -> List[str]:
+        """Stage names ordered so that producers run before consumers."""
+        order = []
+        visiting = set()
+
+        def visit(name):
+            if name in order:
+                return
+            if name in visiting:
+                raise ValueError(f"Pipeline stages form a cycle through '{name}'")
+            visiting.add(name)
+            for artifact in self.stages[name].inputs:
+                visit(self.producers[artifact])
+            visiting.discard(name)
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    def _load_state(self) -> Dict:
+        try:
+            with open(self.cache_dir / self.STATE_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _load_outputs(self, stage: Stage) -> Optional[Dict[str, Any]]:
+        """Cached outputs of the stage's last run, or None."""
+        if stage.name not in self.state:
+            return None
+        try:
+            with open(self.cache_dir / f"{stage.name}.pkl", 'rb') as f:
+                outputs = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+            logger.debug(f"No usable cached outputs for {stage.name}: {e}")
+            return None
+        return outputs if set(stage.outputs) <= set(outputs) else None
+
+    def _save_outputs(self, stage: Stage, outputs: Dict[str, Any], fingerprint: str, output_hashes: Dict[str, str]):
+        """Cache the stage's outputs and record its fingerprint."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = self.cache_dir / f"{stage.name}.pkl.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({artifact: outputs[artifact] for artifact in stage.outputs}, f)
+        tmp_path.replace(self.cache_dir / f"{stage.name}.pkl")
+
+        self.state[stage.name] = {
+            'fingerprint': fingerprint,
+            'finished_at': datetime.utcnow().isoformat() + 'Z',
+            'outputs': output_hashes
+        }
+        tmp_path = self.cache_dir / f"{self.STATE_FILE}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2, sort_keys=True)
+        tmp_path.replace(self.cache_dir / self.STATE_FILE)
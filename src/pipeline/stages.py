@@ -0,0 +1,264 @@
+"""
+Stages of the Friendly Fire data pipeline.
+
+    scrape ─> clean ─> omdb ─┬─> streaming ─┐
+                             └─> posters ───┼─> generate ─> html
+                                 ratings ───┘
+
+The omdb and streaming stages look up only new, unresolved or stale episodes
+and carry every other record forward (see pipeline/enrichment.py).
+
+Stages that call external services are reused for a day when their inputs
+are unchanged; generate and html re-run only when their inputs or code
+change, so a frontend-only change (app.js, styles.css) re-runs nothing but
+the cheap ratings lookup.
+
+With --overlap, scrape, clean, omdb and streaming are replaced by a single
+fetch stage that runs them concurrently (see pipeline/overlap.py).
+"""
+
+import logging
+from contextlib import nullcontext
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, List
+
+from scrapers.maximumfun_scraper import MaximumFunScraper, scrape_friendly_fire_episodes
+from scrapers.data_cleaner import clean_friendly_fire_data
+from api.omdb_client import OMDBClient
+from api.streaming_client import StreamingAvailabilityClient
+from api.poster_cache import cache_poster_thumbnails
+from generators.json_generator import JSONGenerator, generate_json_output
+from generators.html_generator import generate_html_output
+from generators.ratings_store import RatingsStore
+from api.batch_checkpoint import open_checkpoint
+from api.http_telemetry import telemetry
+from .enrichment import plan_enrichment
+from .metrics import metrics
+from .overlap import fetch_overlapped
+from .runner import Stage, module_sources
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = 'docs/data'
+DOCS_DIR = 'docs'
+CHECKPOINT_DIR = '.cache/pipeline/checkpoints'  # Lookup results of unfinished batches (--resume)
+
+# External sources change slowly; reuse their results within this window
+EXTERNAL_MAX_AGE = timedelta(days=1)
+
+# Source files of the JSON generator and the database it records movies in,
+# with every module they import (html_generator.py belongs to html)
+GENERATOR_CODE = module_sources('src/generators/json_generator.py', 'src/storage/movie_database.py')
+
+
+class PipelineContext:
+    """Shared resources and settings for the stages of one run."""
+
+    def __init__(self, args, database, prior):
+        """
+        Initialize the context.
+
+        Args:
+            args: Parsed command line arguments (--skip-*, --overlap, --full-refresh,
+                --resume, --retry-failed, --precompress)
+            database: Open storage.movie_database.MovieDatabase
+            prior: PriorState of the stored movies
+        """
+        self.args = args
+        self.database = database
+        self.prior = prior
+
+
+def build_stages(context: PipelineContext) -> List[Stage]:
+    """
+    Define the pipeline stages.
+
+    Args:
+        context: Shared resources and settings
+
+    Returns:
+        List of stages
+    """
+    args = context.args
+    database = context.database
+    prior = context.prior
+    skip_omdb = args.skip_apis
+    skip_streaming = args.skip_apis or args.skip_streaming
+    resume = args.resume or args.retry_failed
+    enrichment = plan_enrichment(
+        database,
+        prior,
+        full=args.full_refresh,
+        omdb_checkpoint=open_checkpoint(CHECKPOINT_DIR, 'omdb', resume, args.retry_failed, metrics),
+        streaming_checkpoint=open_checkpoint(CHECKPOINT_DIR, 'streaming', resume, args.retry_failed, metrics)
+    )
+
+    def scrape() -> Dict:
+        if args.skip_scraping:
+            raw_episodes = prior.raw_episodes()
+            logger.info(f"✓ Loaded {len(raw_episodes)} episodes from existing data")
+        else:
+            raw_episodes = scrape_friendly_fire_episodes(max_pages=20, metrics=metrics)
+            logger.info(f"✓ Scraped {len(raw_episodes)} raw episodes")
+
+        if not raw_episodes:
+            raise RuntimeError("No episodes found")
+        return {'raw_episodes': raw_episodes}
+
+    def clean(raw_episodes) -> Dict:
+        episodes_df = clean_friendly_fire_data(raw_episodes, metrics, telemetry)
+        logger.info(f"✓ Cleaned data: {len(episodes_df)} valid movie episodes")
+
+        if episodes_df.empty:
+            raise RuntimeError("No valid episodes after cleaning")
+        database.record_episodes(episodes_df)
+        return {'episodes_df': episodes_df}
+
+    def omdb(episodes_df) -> Dict:
+        if skip_omdb:
+            # Join prior OMDB fields to the cleaned rows by episode URL, then title/year
+            omdb_data = prior.omdb_data(episodes_df)
+            logger.info(f"✓ Using cached OMDB data: {sum(1 for d in omdb_data if d)}/{len(omdb_data)} movies")
+        else:
+            # Only new, unresolved and stale episodes are looked up
+            with OMDBClient(metrics=metrics) as client:
+                omdb_data = enrichment.lookup_omdb_batch(client, episodes_df.to_dict('records'))
+            database.record_omdb(enrichment.fetched_omdb)
+            enrichment.omdb_checkpoint.clear()
+            successful = sum(1 for d in omdb_data if d and d.get('imdbID'))
+            logger.info(f"✓ OMDB data complete: {successful}/{len(omdb_data)} movies")
+        return {'omdb_data': omdb_data}
+
+    def streaming(omdb_data) -> Dict:
+        imdb_ids = list(dict.fromkeys(d.get('imdbID') for d in omdb_data if d and d.get('imdbID')))
+        if skip_streaming:
+            # Streaming options are joined to movies by IMDb ID
+            streaming_data = prior.streaming_data(imdb_ids)
+            logger.info(f"✓ Using cached streaming data: {len(streaming_data)} movies with streaming info")
+        elif not imdb_ids:
+            logger.warning("No IMDb IDs found. Skipping streaming queries.")
+            streaming_data = []
+        else:
+            with StreamingAvailabilityClient(metrics=metrics) as client:
+                streaming_data = enrichment.lookup_streaming_batch(client, imdb_ids, country='us')
+            database.record_streaming(enrichment.fetched_streaming)
+            enrichment.streaming_checkpoint.clear()
+            successful = sum(1 for d in streaming_data if d)
+            logger.info(f"✓ Streaming data complete: {successful}/{len(imdb_ids)} movies")
+        return {'streaming_data': streaming_data}
+
+    def fetch() -> Dict:
+        streaming_client = nullcontext() if skip_streaming else StreamingAvailabilityClient(metrics=metrics)
+        with OMDBClient(metrics=metrics) as omdb_client, streaming_client as streaming_client:
+            try:
+                if args.skip_scraping:
+                    raw_episodes = prior.raw_episodes()
+                    logger.info(f"✓ Loaded {len(raw_episodes)} episodes from existing data")
+                    result = fetch_overlapped([raw_episodes], omdb_client, streaming_client, enrichment)
+                else:
+                    with MaximumFunScraper(max_pages=20, metrics=metrics) as scraper:
+                        result = fetch_overlapped(scraper.iter_pages(), omdb_client, streaming_client, enrichment)
+            finally:
+                enrichment.flush()
+
+        episodes_df = result['episodes_df']
+        omdb_data = result['omdb_data']
+        logger.info(f"✓ Cleaned data: {len(episodes_df)} valid movie episodes")
+        logger.info(f"✓ OMDB data complete: {sum(1 for d in omdb_data if d and d.get('imdbID'))}/{len(omdb_data)} movies")
+        database.record_episodes(episodes_df)
+        database.record_omdb(enrichment.fetched_omdb)
+        enrichment.omdb_checkpoint.clear()
+
+        if skip_streaming:
+            imdb_ids = [d.get('imdbID') for d in omdb_data if d and d.get('imdbID')]
+            result['streaming_data'] = prior.streaming_data(imdb_ids)
+            logger.info(f"✓ Using cached streaming data: {len(result['streaming_data'])} movies with streaming info")
+        else:
+            imdb_ids = {d.get('imdbID') for d in omdb_data if d and d.get('imdbID')}
+            database.record_streaming(enrichment.fetched_streaming)
+            enrichment.streaming_checkpoint.clear()
+            logger.info(f"✓ Streaming data complete: {len(result['streaming_data'])}/{len(imdb_ids)} movies")
+        return result
+
+    def posters(omdb_data) -> Dict:
+        if args.skip_posters:
+            logger.info("Skipping poster thumbnails")
+            return {'posters': None}
+        thumbnails = cache_poster_thumbnails(omdb_data, output_dir=DATA_DIR, metrics=metrics)
+        logger.info(f"✓ Poster thumbnails: {len(thumbnails)} movies")
+        return {'posters': thumbnails}
+
+    def ratings() -> Dict:
+        store = JSONGenerator(DATA_DIR, prior.movies, database).load_ratings()
+        return {'ratings': store.ratings}
+
+    def generate(episodes_df, omdb_data, streaming_data, posters, ratings) -> Dict:
+        store = RatingsStore(Path(DATA_DIR) / JSONGenerator.RATINGS_FILE)
+        store.ratings = ratings
+        output_paths = generate_json_output(
+            episodes_df,
+            omdb_data,
+            streaming_data,
+            output_dir=DATA_DIR,
+            posters=posters,
+            previous_movies=prior.movies,
+            database=database,
+            ratings=store,
+            precompress=args.precompress
+        )
+        logger.info(f"✓ Generated {output_paths['movies']}")
+        logger.info(f"✓ Generated {output_paths['manifest']}")
+        logger.info(f"✓ Generated {output_paths['metadata']}")
+        return {'movies_json': Path(output_paths['movies']), 'output_paths': output_paths}
+
+    def html(movies_json) -> Dict:
+        html_paths = generate_html_output(movies_json, docs_dir=DOCS_DIR)
+        logger.info(f"✓ Generated {html_paths['index']} and {html_paths['movie_pages']}/")
+        return {'html_paths': html_paths}
+
+    if args.overlap and not skip_omdb:
+        sources = [
+            Stage('fetch', fetch, outputs=['raw_episodes', 'episodes_df', 'omdb_data', 'streaming_data'],
+                  code=['src/scrapers/*.py', 'src/api/omdb_client.py', 'src/api/streaming_client.py',
+                        'src/pipeline/overlap.py', 'src/pipeline/enrichment.py'],
+                  params={'skip_scraping': args.skip_scraping, 'skip_streaming': skip_streaming,
+                          'full_refresh': args.full_refresh},
+                  max_age=EXTERNAL_MAX_AGE)
+        ]
+    else:
+        sources = [
+            Stage('scrape', scrape, outputs=['raw_episodes'],
+                  code=['src/scrapers/maximumfun_scraper.py'],
+                  params={'skip_scraping': args.skip_scraping},
+                  max_age=None if args.skip_scraping else EXTERNAL_MAX_AGE,
+                  always_run=args.skip_scraping),
+            Stage('clean', clean, inputs=['raw_episodes'], outputs=['episodes_df'],
+                  code=['src/scrapers/data_cleaner.py']),
+            Stage('omdb', omdb, inputs=['episodes_df'], outputs=['omdb_data'],
+                  code=['src/api/omdb_client.py', 'src/pipeline/enrichment.py'],
+                  params={'skip_apis': skip_omdb, 'full_refresh': args.full_refresh},
+                  max_age=None if skip_omdb else EXTERNAL_MAX_AGE),
+            Stage('streaming', streaming, inputs=['omdb_data'], outputs=['streaming_data'],
+                  code=['src/api/streaming_client.py', 'src/pipeline/enrichment.py'],
+                  params={'skip_streaming': skip_streaming, 'full_refresh': args.full_refresh},
+                  max_age=None if skip_streaming else EXTERNAL_MAX_AGE)
+        ]
+
+    return sources + [
+        Stage('posters', posters, inputs=['omdb_data'], outputs=['posters'],
+              code=['src/api/poster_cache.py'],
+              params={'skip_posters': args.skip_posters},
+              products=[] if args.skip_posters else [f"{DATA_DIR}/posters/index.json"]),
+        Stage('ratings', ratings, outputs=['ratings'], always_run=True),
+        Stage('generate', generate,
+              inputs=['episodes_df', 'omdb_data', 'streaming_data', 'posters', 'ratings'],
+              outputs=['movies_json', 'output_paths'],
+              code=GENERATOR_CODE,
+              params={'precompress': args.precompress},
+              products=[f"{DATA_DIR}/movies.json", f"{DATA_DIR}/metadata.json",
+                        f"{DATA_DIR}/{JSONGenerator.VERSION_FILE}"]),
+        Stage('html', html, inputs=['movies_json'], outputs=['html_paths'],
+              code=module_sources('src/generators/html_generator.py') + [f"{DOCS_DIR}/index.html"],
+              products=[f"{DOCS_DIR}/index.html", f"{DOCS_DIR}/movies"])
+    ]
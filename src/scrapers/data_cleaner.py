@@ -7,6 +7,8 @@ import re
 from typing import List, Dict
 import pandas as pd
 
+from api.hooks import null_telemetry
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,9 +26,17 @@ class EpisodeDataCleaner:
         'Over and Out',
     ]
 
-    def __init__(self):
-        """Initialize the data cleaner."""
-        pass
+    def __init__(self, metrics=None, telemetry=None):
+        """
+        Initialize the data cleaner.
+
+        Args:
+            metrics: Stage metrics hook for detail page requests (see api.hooks)
+            telemetry: Telemetry hook the polite delays between detail pages
+                are accounted to; by default they are only slept
+        """
+        self.metrics = metrics
+        self.telemetry = telemetry or null_telemetry
 
     def clean_episodes(self, raw_episodes: List[Dict[str, str]], fetch_detail_pages: bool = True) -> pd.DataFrame:
         """
@@ -254,7 +264,7 @@ class EpisodeDataCleaner:
 
         logger.info(f"Fetching episode numbers from detail pages for {missing_count} episodes")
 
-        with MaximumFunScraper() as scraper:
+        with MaximumFunScraper(metrics=self.metrics) as scraper:
             for idx in df[missing_numbers_mask].index:
                 episode_url = df.loc[idx, 'episode_url']
                 episode_title = df.loc[idx, 'episode']
@@ -270,8 +280,7 @@ class EpisodeDataCleaner:
                         logger.warning(f"  -> No episode number found on detail page")
 
                     # Be polite: small delay between requests
-                    from time import sleep
-                    sleep(0.5)
+                    self.telemetry.sleep(0.5, episode_url, 'polite')
 
         filled_count = missing_count - df['number'].isna().sum()
         logger.info(f"Successfully filled {filled_count}/{missing_count} missing episode numbers")
@@ -279,15 +288,17 @@ class EpisodeDataCleaner:
         return df
 
 
-def clean_friendly_fire_data(raw_episodes: List[Dict[str, str]]) -> pd.DataFrame:
+def clean_friendly_fire_data(raw_episodes: List[Dict[str, str]], metrics=None, telemetry=None) -> pd.DataFrame:
     """
     Convenience function to clean episode data.
 
     Args:
         raw_episodes: List of episode dictionaries from scraper
+        metrics: Stage metrics hook (see api.hooks)
+        telemetry: Telemetry hook for the polite delays (see api.hooks)
 
     Returns:
         Cleaned pandas DataFrame
     """
-    cleaner = EpisodeDataCleaner()
+    cleaner = EpisodeDataCleaner(metrics, telemetry)
     return cleaner.clean_episodes(raw_episodes)
@@ -4,12 +4,14 @@ Scraper for Maximum Fun podcast website to extract Friendly Fire episodes.
 
 import logging
 import re
-from time import sleep
 from random import uniform
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional
 from bs4 import BeautifulSoup
 import requests
 
+from api.http_telemetry import telemetry
+from api.http_transport import create_session
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,20 +20,23 @@ class MaximumFunScraper:
 
     BASE_URL = "https://maximumfun.org/podcasts/friendly-fire/"
     MAX_RETRIES = 3
-    RETRY_DELAY = 2  # seconds
+    RETRY_DELAY = 2  # seconds; base of the transport's jittered backoff
 
-    def __init__(self, max_pages: int = 20):
+    def __init__(self, max_pages: int = 20, metrics=None):
         """
         Initialize the scraper.
 
         Args:
             max_pages: Maximum number of pages to scrape
+            metrics: Stage metrics hook counting each response (see api.hooks)
         """
         self.max_pages = max_pages
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'FriendlyFireBot/1.0 (Educational Project)'
-        })
+        self.session = create_session(
+            {'User-Agent': 'FriendlyFireBot/1.0 (Educational Project)'},
+            retries=self.MAX_RETRIES,
+            backoff_factor=self.RETRY_DELAY,
+            metrics=metrics
+        )
 
     def scrape_episodes(self) -> List[Dict[str, str]]:
         """
@@ -46,6 +51,23 @@ class MaximumFunScraper:
         logger.info(f"Starting to scrape episodes from {self.BASE_URL}")
         episodes = []
 
+        for page_episodes in self.iter_pages():
+            episodes.extend(page_episodes)
+
+        logger.info(f"Successfully scraped {len(episodes)} episodes")
+        return episodes
+
+    def iter_pages(self) -> Iterator[List[Dict[str, str]]]:
+        """
+        Scrape episode pages one at a time, so consumers can start on a page
+        while the next one is fetched.
+
+        Yields:
+            List of episode dictionaries for each non-empty page
+
+        Raises:
+            Exception: If scraping a page fails after max retries
+        """
         for page in range(1, self.max_pages + 1):
             logger.info(f"Scraping page {page}/{self.max_pages}")
 
@@ -55,24 +77,25 @@ class MaximumFunScraper:
                 logger.warning(f"No episodes found on page {page}, stopping pagination")
                 break
 
-            episodes.extend(page_episodes)
+            yield page_episodes
 
             # Be polite: random delay between requests
             if page < self.max_pages:
                 delay = uniform(1, 3)
                 logger.debug(f"Waiting {delay:.2f} seconds before next request")
-                sleep(delay)
-
-        logger.info(f"Successfully scraped {len(episodes)} episodes")
-        return episodes
+                telemetry.sleep(delay, self.BASE_URL, 'polite')
 
     def _scrape_page(self, page_num: int, retry_count: int = 0) -> List[Dict[str, str]]:
         """
         Scrape a single page of episodes.
 
+        Connection errors, timeouts and 429/5xx responses are retried by the
+        session (see api.http_transport); a page that fails validation (e.g.
+        truncated or partially served) is fetched again here.
+
         Args:
             page_num: Page number to scrape
-            retry_count: Current retry attempt
+            retry_count: Current retry attempt for a page that failed validation
 
         Returns:
             List of episode dictionaries from this page
@@ -80,7 +103,7 @@ class MaximumFunScraper:
         url = f"{self.BASE_URL}?_paged={page_num}"
 
         try:
-            response = self.session.get(url, timeout=10)
+            response = self.session.get(url)
             response.raise_for_status()
 
             # Validate response
@@ -116,24 +139,28 @@ class MaximumFunScraper:
             logger.debug(f"Found {len(episodes)} episodes on page {page_num}")
             return episodes
 
-        except (requests.RequestException, ValueError) as e:
+        except ValueError as e:
             if retry_count < self.MAX_RETRIES:
                 logger.warning(
-                    f"Error scraping page {page_num} (attempt {retry_count + 1}/{self.MAX_RETRIES}): {e}"
+                    f"Invalid page {page_num} (attempt {retry_count + 1}/{self.MAX_RETRIES}): {e}"
                 )
-                sleep(self.RETRY_DELAY * (retry_count + 1))  # Exponential backoff
+                telemetry.sleep(self.RETRY_DELAY * (retry_count + 1), url, 'backoff')
                 return self._scrape_page(page_num, retry_count + 1)
-            else:
-                logger.error(f"Failed to scrape page {page_num} after {self.MAX_RETRIES} retries: {e}")
-                raise
+            logger.error(f"Failed to scrape page {page_num} after {self.MAX_RETRIES} retries: {e}")
+            raise
+
+        except requests.RequestException as e:
+            logger.error(f"Failed to scrape page {page_num}: {e}")
+            raise
 
-    def get_episode_number_from_detail(self, episode_url: str, retry_count: int = 0) -> Optional[str]:
+    def get_episode_number_from_detail(self, episode_url: str) -> Optional[str]:
         """
         Fetch episode number from individual episode detail page.
 
+        Failed requests are retried by the session (see api.http_transport).
+
         Args:
             episode_url: URL of the episode detail page
-            retry_count: Current retry attempt
 
         Returns:
             Episode number as string, or None if not found
@@ -143,7 +170,7 @@ class MaximumFunScraper:
 
         try:
             logger.debug(f"Fetching episode number from detail page: {episode_url}")
-            response = self.session.get(episode_url, timeout=10)
+            response = self.session.get(episode_url)
             response.raise_for_status()
 
             soup = BeautifulSoup(response.text, 'html.parser')
@@ -161,15 +188,8 @@ class MaximumFunScraper:
             return None
 
         except requests.RequestException as e:
-            if retry_count < self.MAX_RETRIES:
-                logger.warning(
-                    f"Error fetching detail page (attempt {retry_count + 1}/{self.MAX_RETRIES}): {e}"
-                )
-                sleep(self.RETRY_DELAY * (retry_count + 1))
-                return self.get_episode_number_from_detail(episode_url, retry_count + 1)
-            else:
-                logger.error(f"Failed to fetch detail page after {self.MAX_RETRIES} retries: {e}")
-                return None
+            logger.error(f"Failed to fetch detail page {episode_url}: {e}")
+            return None
 
     def close(self):
         """Close the requests session."""
@@ -184,15 +204,16 @@ class MaximumFunScraper:
         self.close()
 
 
-def scrape_friendly_fire_episodes(max_pages: int = 20) -> List[Dict[str, str]]:
+def scrape_friendly_fire_episodes(max_pages: int = 20, metrics=None) -> List[Dict[str, str]]:
     """
     Convenience function to scrape Friendly Fire episodes.
 
     Args:
         max_pages: Maximum number of pages to scrape
+        metrics: Stage metrics hook (see api.hooks)
 
     Returns:
         List of episode dictionaries
     """
-    with MaximumFunScraper(max_pages=max_pages) as scraper:
+    with MaximumFunScraper(max_pages=max_pages, metrics=metrics) as scraper:
         return scraper.scrape_episodes()
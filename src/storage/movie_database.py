@@ -0,0 +1,694 @@
+"""
+SQLite store behind the data pipeline.
+
+The database (data/friendly_fire.db, not published) is the source of truth;
+docs/data/movies.json and docs/data/ratings.json are exports of it. Every
+stage upserts only the rows that changed:
+
+    episodes           cleaned episode list, with position in the latest scrape
+    omdb               OMDB responses by IMDb ID
+    omdb_checks        when OMDB was last queried per IMDb ID
+    streaming_checks   when streaming availability was last fetched per IMDb ID
+    streaming_options  one row per option, indexed by service and type
+    ratings            host ratings by movie key (see ratings_store.py)
+    rating_rows        fingerprint of every imported CSV row -> movie key
+    movies             generated movie entries, in table order
+    meta               bookkeeping values, e.g. the hash of the last synced
+                       ratings.json
+
+A missing or empty database is bootstrapped from the published JSON files,
+so a lost database (e.g. a CI cache miss) costs nothing but the import.
+ratings.json is committed and the database is not, so the ratings tables
+are re-imported whenever ratings.json differs from the copy last synced
+(see sync_ratings).
+
+Usage:
+    python src/storage/movie_database.py stats
+    python src/storage/movie_database.py sql "SELECT service, COUNT(*) FROM streaming_options GROUP BY 1"
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+import pandas as pd
+
+# Allow running as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generators.prior_state import PriorState, to_omdb_record
+from generators.ratings_store import RATING_FIELDS, RatingsStore
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+# Check time of records imported from JSON, whose real check time is unknown:
+# they are due for refresh at once (oldest first, capped per run)
+NEVER_CHECKED = '1970-01-01T00:00:00Z'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS episodes (
+    id INTEGER PRIMARY KEY,
+    episode_url TEXT NOT NULL DEFAULT '',
+    title TEXT NOT NULL,
+    year TEXT NOT NULL DEFAULT '',
+    number TEXT,
+    position INTEGER,  -- row in the latest episode list, NULL if no longer listed
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    UNIQUE (episode_url, title, year)
+);
+CREATE INDEX IF NOT EXISTS idx_episodes_number ON episodes (number);
+CREATE INDEX IF NOT EXISTS idx_episodes_position ON episodes (position);
+
+CREATE TABLE IF NOT EXISTS omdb (
+    imdb_id TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    fetched_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS omdb_checks (
+    imdb_id TEXT PRIMARY KEY,
+    checked_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS streaming_checks (
+    imdb_id TEXT PRIMARY KEY,
+    checked_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS streaming_options (
+    imdb_id TEXT NOT NULL REFERENCES streaming_checks (imdb_id) ON DELETE CASCADE,
+    rank INTEGER NOT NULL,
+    service TEXT NOT NULL,
+    type TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (imdb_id, rank)
+);
+CREATE INDEX IF NOT EXISTS idx_streaming_service ON streaming_options (service, type);
+
+CREATE TABLE IF NOT EXISTS ratings (
+    movie_key TEXT PRIMARY KEY,
+    ar TEXT,
+    br TEXT,
+    jr TEXT,
+    rating TEXT,
+    rating_notes TEXT NOT NULL DEFAULT '',
+    details TEXT NOT NULL DEFAULT '{}',
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS rating_rows (
+    fingerprint TEXT PRIMARY KEY,
+    movie_key TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_rating_rows_key ON rating_rows (movie_key);
+
+CREATE TABLE IF NOT EXISTS movies (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    imdb_id TEXT,
+    episode_url TEXT,
+    episode_number_num INTEGER,
+    title TEXT,
+    year TEXT,
+    imdb_rating_num REAL,
+    record TEXT NOT NULL,
+    record_hash TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_movies_position ON movies (position);
+CREATE INDEX IF NOT EXISTS idx_movies_imdb_id ON movies (imdb_id);
+CREATE INDEX IF NOT EXISTS idx_movies_episode_number ON movies (episode_number_num);
+CREATE INDEX IF NOT EXISTS idx_movies_year ON movies (year);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat() + 'Z'
+
+
+def _dumps(data) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def _text(value) -> str:
+    """DataFrame cell as text ('' for missing values)."""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ''
+    return str(value)
+
+
+class MovieDatabase:
+    """SQLite store for episodes, API responses, host ratings and movies."""
+
+    def __init__(self, path: str = 'data/friendly_fire.db'):
+        """
+        Open (and create if needed) the database.
+
+        Args:
+            path: Database file path
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        self.conn.execute('PRAGMA journal_mode = WAL')
+
+        version = self.conn.execute('PRAGMA user_version').fetchone()[0]
+        if version > SCHEMA_VERSION:
+            raise ValueError(f"{self.path} has schema version {version}; this code supports {SCHEMA_VERSION}")
+        self.conn.executescript(SCHEMA)
+        self.conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+    def is_empty(self) -> bool:
+        """True if no movies have been recorded yet."""
+        return self.conn.execute('SELECT 1 FROM movies LIMIT 1').fetchone() is None
+
+    # Episodes
+
+    def record_episodes(self, episodes_df: pd.DataFrame) -> int:
+        """
+        Upsert the cleaned episode list and record each row's position.
+
+        Episodes no longer listed keep their row with a NULL position.
+
+        Args:
+            episodes_df: DataFrame with episode data (from data_cleaner)
+
+        Returns:
+            Number of episodes seen for the first time
+        """
+        now = _now()
+        with self.conn:
+            before = self.conn.execute('SELECT COUNT(*) FROM episodes').fetchone()[0]
+            self.conn.execute('UPDATE episodes SET position = NULL WHERE position IS NOT NULL')
+            for position, (_, row) in enumerate(episodes_df.iterrows()):
+                self.conn.execute(
+                    """
+                    INSERT INTO episodes (episode_url, title, year, number, position, first_seen, last_seen)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (episode_url, title, year) DO UPDATE SET
+                        number = excluded.number,
+                        position = excluded.position,
+                        last_seen = excluded.last_seen
+                    """,
+                    (_text(row.get('episode_url')), _text(row.get('episode')), _text(row.get('year')),
+                     _text(row.get('number')) or None, position, now, now)
+                )
+            added = self.conn.execute('SELECT COUNT(*) FROM episodes').fetchone()[0] - before
+
+        logger.info(f"Recorded {len(episodes_df)} episodes ({added} new)")
+        return added
+
+    # OMDB
+
+    def record_omdb(self, omdb_data: List[Optional[Dict]], checked_at: Optional[str] = None) -> int:
+        """
+        Upsert OMDB responses; unchanged responses are not rewritten, but
+        the time each movie was checked is.
+
+        Args:
+            omdb_data: List of OMDB API responses (None entries are skipped)
+            checked_at: ISO timestamp to record as the check time (now by default)
+
+        Returns:
+            Number of responses inserted or changed
+        """
+        now = checked_at or _now()
+        changed = 0
+        with self.conn:
+            for payload in omdb_data:
+                if not payload or not payload.get('imdbID'):
+                    continue
+                cursor = self.conn.execute(
+                    """
+                    INSERT INTO omdb (imdb_id, payload, fetched_at) VALUES (?, ?, ?)
+                    ON CONFLICT (imdb_id) DO UPDATE SET
+                        payload = excluded.payload,
+                        fetched_at = excluded.fetched_at
+                    WHERE payload != excluded.payload
+                    """,
+                    (payload['imdbID'], _dumps(payload), now)
+                )
+                changed += cursor.rowcount
+                self.conn.execute(
+                    """
+                    INSERT INTO omdb_checks (imdb_id, checked_at) VALUES (?, ?)
+                    ON CONFLICT (imdb_id) DO UPDATE SET checked_at = excluded.checked_at
+                    """,
+                    (payload['imdbID'], now)
+                )
+
+        logger.info(f"Recorded OMDB data: {changed} responses new or changed")
+        return changed
+
+    def omdb_payloads(self) -> Dict[str, Dict]:
+        """
+        All stored OMDB responses.
+
+        Returns:
+            Dictionary mapping IMDb ID to OMDB response
+        """
+        return {
+            row['imdb_id']: json.loads(row['payload'])
+            for row in self.conn.execute('SELECT imdb_id, payload FROM omdb')
+        }
+
+    def omdb_checked(self) -> Dict[str, str]:
+        """
+        When each stored OMDB response was last checked.
+
+        Returns:
+            Dictionary mapping IMDb ID to an ISO timestamp
+        """
+        return {
+            row['imdb_id']: row['checked_at']
+            for row in self.conn.execute(
+                """
+                SELECT o.imdb_id, COALESCE(c.checked_at, o.fetched_at) AS checked_at
+                FROM omdb o LEFT JOIN omdb_checks c ON c.imdb_id = o.imdb_id
+                """
+            )
+        }
+
+    # Streaming
+
+    def record_streaming(self, streaming_data: List[Optional[Dict]], checked_at: Optional[str] = None) -> int:
+        """
+        Store streaming options per movie; a movie's options are replaced
+        only if they changed.
+
+        Args:
+            streaming_data: List of Streaming API responses (None entries,
+                i.e. failed lookups, are skipped)
+            checked_at: ISO timestamp to record as the check time (now by default)
+
+        Returns:
+            Number of movies whose options changed
+        """
+        now = checked_at or _now()
+        stored = self.streaming_options()
+        changed = 0
+        with self.conn:
+            for result in streaming_data:
+                if not result or not result.get('imdb_id'):
+                    continue
+                imdb_id = result['imdb_id']
+                options = result.get('streaming_options') or []
+
+                self.conn.execute(
+                    """
+                    INSERT INTO streaming_checks (imdb_id, checked_at) VALUES (?, ?)
+                    ON CONFLICT (imdb_id) DO UPDATE SET checked_at = excluded.checked_at
+                    """,
+                    (imdb_id, now)
+                )
+                if stored.get(imdb_id) == options:
+                    continue
+
+                self.conn.execute('DELETE FROM streaming_options WHERE imdb_id = ?', (imdb_id,))
+                self.conn.executemany(
+                    'INSERT INTO streaming_options (imdb_id, rank, service, type, data) VALUES (?, ?, ?, ?, ?)',
+                    [
+                        (imdb_id, rank, option.get('service', 'unknown'), option.get('type', ''), _dumps(option))
+                        for rank, option in enumerate(options)
+                    ]
+                )
+                changed += 1
+
+        logger.info(f"Recorded streaming data: {changed} movies changed")
+        return changed
+
+    def streaming_options(self) -> Dict[str, List[Dict]]:
+        """
+        Stored streaming options of every checked movie.
+
+        Returns:
+            Dictionary mapping IMDb ID to its options (possibly empty)
+        """
+        options = {row['imdb_id']: [] for row in self.conn.execute('SELECT imdb_id FROM streaming_checks')}
+        for row in self.conn.execute('SELECT imdb_id, data FROM streaming_options ORDER BY imdb_id, rank'):
+            options[row['imdb_id']].append(json.loads(row['data']))
+        return options
+
+    def streaming_checked(self) -> Dict[str, str]:
+        """
+        When streaming availability was last fetched for each movie.
+
+        Returns:
+            Dictionary mapping IMDb ID to an ISO timestamp
+        """
+        return {
+            row['imdb_id']: row['checked_at']
+            for row in self.conn.execute('SELECT imdb_id, checked_at FROM streaming_checks')
+        }
+
+    # Host ratings
+
+    def load_ratings(self, store: RatingsStore) -> RatingsStore:
+        """
+        Fill a ratings store from the database.
+
+        Args:
+            store: Store to fill (its current contents are replaced)
+
+        Returns:
+            The store
+        """
+        store.ratings = {}
+        for row in self.conn.execute('SELECT * FROM ratings'):
+            store.set(row['movie_key'], dict(row), **json.loads(row['details']))
+        store.rows = {
+            row['fingerprint']: row['movie_key']
+            for row in self.conn.execute('SELECT fingerprint, movie_key FROM rating_rows')
+        }
+        return store
+
+    def has_ratings(self) -> bool:
+        """True if any host ratings or imported CSV rows are stored."""
+        return self.conn.execute(
+            'SELECT 1 FROM ratings UNION ALL SELECT 1 FROM rating_rows LIMIT 1'
+        ).fetchone() is not None
+
+    def save_ratings(self, store: RatingsStore) -> int:
+        """
+        Make the ratings tables match a ratings store, row by row.
+
+        Args:
+            store: Ratings store (see ratings_store.py)
+
+        Returns:
+            Number of ratings inserted, changed or removed
+        """
+        current = self.load_ratings(RatingsStore())
+        now = _now()
+        changed = 0
+        with self.conn:
+            for key in set(current.ratings) - set(store.ratings):
+                self.conn.execute('DELETE FROM ratings WHERE movie_key = ?', (key,))
+                changed += 1
+
+            for key, entry in store.ratings.items():
+                if current.ratings.get(key) == entry:
+                    continue
+                details = {k: v for k, v in entry.items() if k not in RATING_FIELDS}
+                self.conn.execute(
+                    """
+                    INSERT OR REPLACE INTO ratings
+                        (movie_key, ar, br, jr, rating, rating_notes, details, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (key, entry.get('ar'), entry.get('br'), entry.get('jr'), entry.get('rating'),
+                     entry.get('rating_notes') or '', _dumps(details), now)
+                )
+                changed += 1
+
+            self.conn.executemany(
+                'DELETE FROM rating_rows WHERE fingerprint = ?',
+                [(fp,) for fp in set(current.rows) - set(store.rows)]
+            )
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO rating_rows (fingerprint, movie_key) VALUES (?, ?)',
+                [(fp, key) for fp, key in store.rows.items() if fp not in current.rows or current.rows[fp] != key]
+            )
+
+        logger.info(f"Saved host ratings: {changed} changed")
+        return changed
+
+    def sync_ratings(self, path: str = 'docs/data/ratings.json') -> int:
+        """
+        Import a ratings store file if it changed since it was last synced.
+
+        The file's SHA-256 is kept in the meta table, so a ratings.json
+        committed after the database was cached (e.g. merged locally and
+        pushed) replaces the stored ratings on the next run.
+
+        Args:
+            path: Ratings store file (see ratings_store.py)
+
+        Returns:
+            Number of ratings inserted, changed or removed
+        """
+        path = Path(path)
+        if not path.exists():
+            return 0
+
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        if digest == self._get_meta('ratings_json_sha256'):
+            return 0
+
+        try:
+            store = RatingsStore(path).load()
+        except ValueError as e:
+            logger.warning(f"Not importing host ratings: {e}")
+            return 0
+
+        changed = self.save_ratings(store)
+        self._set_meta('ratings_json_sha256', digest)
+        logger.info(f"Synced host ratings from {path}: {changed} changed")
+        return changed
+
+    # Movies
+
+    def record_movies(self, movies: List[Dict]) -> Dict[str, int]:
+        """
+        Make the movies table match a generated movie list, row by row.
+
+        Args:
+            movies: Movie entries with ids (see generators.movie_keys.assign_movie_ids),
+                in table order
+
+        Returns:
+            Dictionary with 'added', 'changed', 'removed' and 'moved' counts
+        """
+        existing = {
+            row['id']: (row['record_hash'], row['position'])
+            for row in self.conn.execute('SELECT id, record_hash, position FROM movies')
+        }
+        now = _now()
+        counts = {'added': 0, 'changed': 0, 'removed': 0, 'moved': 0}
+        ids = set()
+
+        with self.conn:
+            for position, movie in enumerate(movies):
+                movie_id = movie['id']
+                ids.add(movie_id)
+                record = _dumps(movie)
+                record_hash = hashlib.sha256(record.encode('utf-8')).hexdigest()
+
+                previous = existing.get(movie_id)
+                if previous == (record_hash, position):
+                    continue
+                if previous and previous[0] == record_hash:
+                    self.conn.execute('UPDATE movies SET position = ? WHERE id = ?', (position, movie_id))
+                    counts['moved'] += 1
+                    continue
+
+                self.conn.execute(
+                    """
+                    INSERT OR REPLACE INTO movies
+                        (id, position, imdb_id, episode_url, episode_number_num, title, year,
+                         imdb_rating_num, record, record_hash, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (movie_id, position, movie.get('imdb_id'), movie.get('episode_url'),
+                     movie.get('episode_number_num'), movie.get('title'), movie.get('year'),
+                     movie.get('imdb_rating_num'), record, record_hash, now)
+                )
+                counts['changed' if previous else 'added'] += 1
+
+            removed = set(existing) - ids
+            self.conn.executemany('DELETE FROM movies WHERE id = ?', [(movie_id,) for movie_id in removed])
+            counts['removed'] = len(removed)
+
+        logger.info(
+            f"Recorded movies: {counts['added']} added, {counts['changed']} changed, "
+            f"{counts['removed']} removed, {counts['moved']} moved"
+        )
+        return counts
+
+    def export_movies(self) -> List[Dict]:
+        """
+        Movie entries in table order, as written to movies.json.
+
+        Returns:
+            List of movie entries
+        """
+        return [json.loads(row['record']) for row in self.conn.execute('SELECT record FROM movies ORDER BY position')]
+
+    def prior_state(self) -> PriorState:
+        """
+        Snapshot of the stored movies for the pipeline stages.
+
+        Returns:
+            PriorState with stored OMDB responses and streaming options
+        """
+        return PriorState(self.export_movies(), omdb=self.omdb_payloads(), streaming=self.streaming_options())
+
+    # Bootstrap
+
+    def import_json(self, data_dir: str = 'docs/data') -> bool:
+        """
+        Populate an empty database from published JSON files.
+
+        Movies (and the OMDB fields and streaming options they carry) come
+        from movies.json, host ratings from ratings.json. movies.json does
+        not say when each movie was looked up, so its OMDB and streaming
+        records are stamped NEVER_CHECKED: rather than restarting every
+        refresh clock, a lost database makes them due, and the enrichment
+        refreshes them oldest first at its usual cap per run.
+
+        Args:
+            data_dir: Directory containing movies.json and ratings.json
+
+        Returns:
+            True if anything was imported
+        """
+        data_dir = Path(data_dir)
+        prior = PriorState.load(data_dir / 'movies.json')
+
+        if prior.movies:
+            with self.conn:
+                now = _now()
+                for position, movie in enumerate(prior.movies):
+                    self.conn.execute(
+                        """
+                        INSERT OR IGNORE INTO episodes
+                            (episode_url, title, year, number, position, first_seen, last_seen)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        (movie.get('episode_url') or '', movie.get('title') or '', _text(movie.get('year')),
+                         movie.get('episode_number'), position, now, now)
+                    )
+            self.record_omdb(
+                [to_omdb_record(m) for m in prior.movies if m.get('imdb_id')],
+                checked_at=NEVER_CHECKED
+            )
+            self.record_streaming([
+                {'imdb_id': imdb_id, 'streaming_options': movie.get('streaming_options') or []}
+                for imdb_id, movie in prior.by_imdb_id.items()
+            ], checked_at=NEVER_CHECKED)
+            self.record_movies(prior.movies)
+
+        self.sync_ratings(data_dir / 'ratings.json')
+
+        imported = bool(prior.movies)
+        if imported:
+            logger.info(f"Imported {len(prior.movies)} movies from {data_dir} into {self.path}")
+        return imported
+
+    # Bookkeeping
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row['value'] if row else None
+
+    def _set_meta(self, key: str, value: str):
+        with self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+
+    # Reporting
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Row counts per table.
+
+        Returns:
+            Dictionary mapping table name to row count
+        """
+        tables = ['episodes', 'omdb', 'omdb_checks', 'streaming_checks', 'streaming_options', 'ratings', 'rating_rows', 'movies']
+        return {
+            table: self.conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+            for table in tables
+        }
+
+    def query(self, sql: str, params=()) -> List[Dict]:
+        """
+        Run a read-only query for debugging and reporting.
+
+        Args:
+            sql: SELECT statement
+            params: Query parameters
+
+        Returns:
+            Result rows as dictionaries
+        """
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
+
+def open_movie_database(path: str = 'data/friendly_fire.db', data_dir: str = 'docs/data') -> MovieDatabase:
+    """
+    Convenience function to open the database, importing the published JSON
+    files if it has no movies yet.
+
+    Args:
+        path: Database file path
+        data_dir: Directory with the published JSON files
+
+    Returns:
+        MovieDatabase
+    """
+    database = MovieDatabase(path)
+    if database.is_empty():
+        database.import_json(data_dir)
+    return database
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect the pipeline database')
+    parser.add_argument('--database', default='data/friendly_fire.db', help='Database file (default: data/friendly_fire.db)')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('stats', help='Row counts per table')
+    sql = commands.add_parser('sql', help='Run a query and print the rows as JSON lines')
+    sql.add_argument('statement')
+
+    args = parser.parse_args()
+    if not Path(args.database).exists():
+        print(f"Error: {args.database} does not exist")
+        return 1
+
+    with MovieDatabase(args.database) as database:
+        if args.command == 'stats':
+            for table, count in database.stats().items():
+                print(f"{table:18} {count:>6}")
+        else:
+            # Read-only: the statement cannot modify the database
+            database.conn.execute('PRAGMA query_only = ON')
+            try:
+                rows = database.query(args.statement)
+            except sqlite3.Error as e:
+                print(f"Error: {e}")
+                return 1
+            for row in rows:
+                print(json.dumps(row, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
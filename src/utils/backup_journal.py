@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+Backup journal for data files, kept outside the published docs/ directory.
+
+Each snapshot records the content of one or more files at a point in time.
+Contents are stored once, gzip-compressed and addressed by their SHA-256, so
+snapshots of unchanged files cost one journal line. Files that did not exist
+are recorded with a null sha256 and are removed on restore. The journal is an
+append-only JSON Lines file:
+
+    .backups/
+        journal.jsonl       {"timestamp": "20260108_104700", "file": "docs/data/movies.json",
+                             "sha256": "3f2a...", "size": 317204, "note": "merge_ratings"}
+        objects/3f2a....json.gz
+
+Usage:
+    python src/utils/backup_journal.py list
+    python src/utils/backup_journal.py snapshot docs/data/movies.json docs/data/ratings.json
+    python src/utils/backup_journal.py restore --to 20260108_104700
+    python src/utils/backup_journal.py restore --to 2026-01-08 --file docs/data/movies.json
+    python src/utils/backup_journal.py import docs/data/movies.backup_20260108_104700.json
+    python src/utils/backup_journal.py prune --keep 20 --max-age-days 180
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TIMESTAMP_FORMAT = '%Y%m%d_%H%M%S'
+
+# movies.backup_20260108_104700.json, as written by the old full-copy backups
+LEGACY_BACKUP_PATTERN = re.compile(r'^(?P<stem>.+)\.backup_(?P<timestamp>\d{8}_\d{6})(?P<suffix>\.[^.]+)$')
+
+
+def parse_timestamp(value: str) -> str:
+    """
+    Normalize a user-supplied point in time to TIMESTAMP_FORMAT.
+
+    Accepts '20260108_104700', '2026-01-08', '2026-01-08T10:47' and other ISO
+    8601 forms. A date without a time means the end of that day.
+
+    Args:
+        value: Timestamp string
+
+    Returns:
+        Timestamp in TIMESTAMP_FORMAT
+
+    Raises:
+        ValueError: If the value cannot be parsed
+    """
+    value = value.strip()
+    try:
+        return datetime.strptime(value, TIMESTAMP_FORMAT).strftime(TIMESTAMP_FORMAT)
+    except ValueError:
+        pass
+
+    moment = datetime.fromisoformat(value.rstrip('Z'))
+    if len(value) == 10:  # date only
+        moment = moment.replace(hour=23, minute=59, second=59)
+    return moment.strftime(TIMESTAMP_FORMAT)
+
+
+class BackupJournal:
+    """Compressed, content-addressed snapshots of data files with a journal."""
+
+    JOURNAL_FILE = 'journal.jsonl'
+    OBJECT_DIR = 'objects'
+    KEEP_SNAPSHOTS = 20  # Most recent snapshots always kept by prune
+    MAX_AGE_DAYS = 180  # Older snapshots beyond KEEP_SNAPSHOTS are pruned
+
+    def __init__(self, root: str = '.backups', base_dir: str = '.'):
+        """
+        Initialize the backup journal.
+
+        Args:
+            root: Directory holding the journal and objects (not published)
+            base_dir: Directory that recorded file paths are relative to
+        """
+        self.root = Path(root)
+        self.base_dir = Path(base_dir).resolve()
+        self.journal_path = self.root / self.JOURNAL_FILE
+        self.object_dir = self.root / self.OBJECT_DIR
+
+    def entries(self) -> List[Dict]:
+        """
+        Read the journal.
+
+        Returns:
+            Journal entries, oldest first
+        """
+        if not self.journal_path.exists():
+            return []
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def snapshot(
+        self,
+        paths: Iterable,
+        note: str = '',
+        timestamp: Optional[str] = None
+    ) -> str:
+        """
+        Record the current content of files.
+
+        Args:
+            paths: Files to back up; missing files are recorded as absent
+            note: Free-form description stored with each entry
+            timestamp: Snapshot time in TIMESTAMP_FORMAT (now by default,
+                moved past the latest snapshot so snapshots stay distinct)
+
+        Returns:
+            Timestamp of the snapshot
+        """
+        if timestamp is None:
+            moment = datetime.now()
+            entries = self.entries()
+            if entries:
+                latest = datetime.strptime(max(e['timestamp'] for e in entries), TIMESTAMP_FORMAT)
+                moment = max(moment, latest + timedelta(seconds=1))
+            timestamp = moment.strftime(TIMESTAMP_FORMAT)
+        self.object_dir.mkdir(parents=True, exist_ok=True)
+
+        new_entries = []
+        for path in map(Path, paths):
+            if not path.exists():
+                new_entries.append({
+                    'timestamp': timestamp,
+                    'file': self._relative(path),
+                    'sha256': None,
+                    'size': 0,
+                    'note': note
+                })
+                logger.debug(f"Recorded {path} as absent")
+                continue
+
+            content = path.read_bytes()
+            digest = hashlib.sha256(content).hexdigest()
+            stored = self._write_object(digest, content)
+            new_entries.append({
+                'timestamp': timestamp,
+                'file': self._relative(path),
+                'sha256': digest,
+                'size': len(content),
+                'note': note
+            })
+            logger.info(f"Backed up {path} ({len(content)} bytes, {'stored' if stored else 'unchanged'})")
+
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            for entry in new_entries:
+                f.write(json.dumps(entry, sort_keys=True) + '\n')
+
+        return timestamp
+
+    def import_legacy_backup(self, path) -> Optional[str]:
+        """
+        Record a full-copy backup such as movies.backup_20260108_104700.json
+        as a snapshot of movies.json at that time.
+
+        Args:
+            path: Legacy backup file
+
+        Returns:
+            Snapshot timestamp, or None if the name is not a legacy backup
+        """
+        path = Path(path)
+        match = LEGACY_BACKUP_PATTERN.match(path.name)
+        if not match:
+            return None
+
+        original = path.with_name(match.group('stem') + match.group('suffix'))
+        content = path.read_bytes()
+        digest = hashlib.sha256(content).hexdigest()
+        self.object_dir.mkdir(parents=True, exist_ok=True)
+        self._write_object(digest, content)
+
+        entry = {
+            'timestamp': match.group('timestamp'),
+            'file': self._relative(original),
+            'sha256': digest,
+            'size': len(content),
+            'note': f"imported from {path.name}"
+        }
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, sort_keys=True) + '\n')
+        return entry['timestamp']
+
+    def resolve(self, to: str, files: Optional[Iterable] = None) -> Dict[str, Dict]:
+        """
+        Find the latest entry at or before a point in time for each file.
+
+        Args:
+            to: Point in time (see parse_timestamp)
+            files: Restrict to these files (all journaled files by default)
+
+        Returns:
+            Dictionary mapping relative file path to its journal entry
+        """
+        limit = parse_timestamp(to)
+        wanted = {self._relative(Path(f)) for f in files} if files else None
+
+        latest = {}
+        for entry in self.entries():
+            if entry['timestamp'] > limit:
+                continue
+            if wanted is not None and entry['file'] not in wanted:
+                continue
+            current = latest.get(entry['file'])
+            if current is None or entry['timestamp'] >= current['timestamp']:
+                latest[entry['file']] = entry
+        return latest
+
+    def restore(
+        self,
+        to: str,
+        files: Optional[Iterable] = None,
+        dry_run: bool = False
+    ) -> List[Dict]:
+        """
+        Restore files to their content at a point in time.
+
+        The current content is snapshotted first, so a restore can itself be
+        undone.
+
+        Args:
+            to: Point in time (see parse_timestamp)
+            files: Restrict to these files (all journaled files by default)
+            dry_run: Only report what would be restored
+
+        Returns:
+            Journal entries that were (or would be) restored
+        """
+        selected = self.resolve(to, files)
+        if not selected or dry_run:
+            return list(selected.values())
+
+        self.snapshot((self.base_dir / name for name in selected), note=f"before restore to {to}")
+
+        for name, entry in selected.items():
+            target = self.base_dir / name
+            if entry['sha256'] is None:
+                target.unlink(missing_ok=True)
+                logger.info(f"Removed {name} (absent at {entry['timestamp']})")
+                continue
+
+            content = self._read_object(entry['sha256'])
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = target.with_name(target.name + '.tmp')
+            tmp_path.write_bytes(content)
+            os.replace(tmp_path, target)
+            logger.info(f"Restored {name} from {entry['timestamp']}")
+
+        return list(selected.values())
+
+    def prune(self, keep: int = KEEP_SNAPSHOTS, max_age_days: Optional[int] = MAX_AGE_DAYS) -> int:
+        """
+        Apply the retention policy and delete unreferenced objects.
+
+        The newest `keep` snapshots are always kept; older ones are kept only
+        while younger than max_age_days (None keeps them indefinitely).
+
+        Args:
+            keep: Number of most recent snapshots to keep
+            max_age_days: Age limit for snapshots beyond the newest `keep`
+
+        Returns:
+            Number of journal entries removed
+        """
+        entries = self.entries()
+        timestamps = sorted({entry['timestamp'] for entry in entries}, reverse=True)
+
+        kept = set(timestamps[:keep])
+        if max_age_days is not None:
+            cutoff = (datetime.now() - timedelta(days=max_age_days)).strftime(TIMESTAMP_FORMAT)
+            kept.update(ts for ts in timestamps[keep:] if ts >= cutoff)
+        else:
+            kept.update(timestamps)
+
+        remaining = [entry for entry in entries if entry['timestamp'] in kept]
+        removed = len(entries) - len(remaining)
+        if removed:
+            tmp_path = self.journal_path.with_name(self.JOURNAL_FILE + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for entry in remaining:
+                    f.write(json.dumps(entry, sort_keys=True) + '\n')
+            os.replace(tmp_path, self.journal_path)
+
+        referenced = {entry['sha256'] for entry in remaining}
+        if self.object_dir.exists():
+            for obj in self.object_dir.glob('*.json.gz'):
+                if obj.name.split('.', 1)[0] not in referenced:
+                    obj.unlink()
+
+        logger.info(f"Pruned {removed} journal entries; {len(kept)} snapshots kept")
+        return removed
+
+    def _object_path(self, digest: str) -> Path:
+        return self.object_dir / f"{digest}.json.gz"
+
+    def _write_object(self, digest: str, content: bytes) -> bool:
+        """Store content unless an identical object exists; True if written."""
+        path = self._object_path(digest)
+        if path.exists():
+            return False
+        tmp_path = path.with_name(path.name + '.tmp')
+        with gzip.open(tmp_path, 'wb', compresslevel=9) as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        return True
+
+    def _read_object(self, digest: str) -> bytes:
+        """Read and verify a stored object."""
+        with gzip.open(self._object_path(digest), 'rb') as f:
+            content = f.read()
+        if hashlib.sha256(content).hexdigest() != digest:
+            raise ValueError(f"Backup object {digest} is corrupt")
+        return content
+
+    def _relative(self, path: Path) -> str:
+        """Path relative to base_dir, as recorded in the journal."""
+        resolved = path.resolve()
+        try:
+            return resolved.relative_to(self.base_dir).as_posix()
+        except ValueError:
+            return resolved.as_posix()
+
+
+def backup_files(paths: Iterable, note: str = '', root: str = '.backups') -> str:
+    """
+    Convenience function to snapshot files and apply the retention policy.
+
+    Args:
+        paths: Files to back up
+        note: Description stored with the snapshot
+        root: Backup journal directory
+
+    Returns:
+        Timestamp of the snapshot
+    """
+    journal = BackupJournal(root)
+    timestamp = journal.snapshot(paths, note=note)
+    journal.prune()
+    return timestamp
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Journaled backups of data files')
+    parser.add_argument('--root', default='.backups', help='Backup journal directory (default: .backups)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('list', help='List snapshots')
+
+    snapshot = commands.add_parser('snapshot', help='Back up files')
+    snapshot.add_argument('files', nargs='+')
+    snapshot.add_argument('--note', default='')
+
+    restore = commands.add_parser('restore', help='Restore files to a point in time')
+    restore.add_argument('--to', required=True, help='Timestamp (20260108_104700 or ISO 8601)')
+    restore.add_argument('--file', action='append', dest='files', help='Only restore this file (repeatable)')
+    restore.add_argument('--dry-run', action='store_true', help='Show what would be restored')
+
+    legacy = commands.add_parser('import', help='Import movies.backup_<timestamp>.json copies')
+    legacy.add_argument('files', nargs='+')
+
+    prune = commands.add_parser('prune', help='Apply the retention policy')
+    prune.add_argument('--keep', type=int, default=BackupJournal.KEEP_SNAPSHOTS)
+    prune.add_argument('--max-age-days', type=int, default=BackupJournal.MAX_AGE_DAYS)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    journal = BackupJournal(args.root)
+
+    if args.command == 'list':
+        snapshots = {}
+        for entry in journal.entries():
+            snapshots.setdefault(entry['timestamp'], []).append(entry)
+        for timestamp, entries in sorted(snapshots.items()):
+            files = ', '.join(
+                f"{e['file']} ({e['size']:,} bytes)" if e['sha256'] else f"{e['file']} (absent)"
+                for e in entries
+            )
+            note = f" - {entries[0]['note']}" if entries[0]['note'] else ''
+            print(f"{timestamp}  {files}{note}")
+
+    elif args.command == 'snapshot':
+        print(f"✓ Snapshot {journal.snapshot(args.files, note=args.note)}")
+
+    elif args.command == 'restore':
+        try:
+            restored = journal.restore(args.to, args.files, dry_run=args.dry_run)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 1
+        if not restored:
+            print(f"Error: no snapshot at or before {args.to}")
+            return 1
+        for entry in restored:
+            action = 'Would restore' if args.dry_run else '✓ Restored'
+            print(f"{action} {entry['file']} from {entry['timestamp']}")
+
+    elif args.command == 'import':
+        for path in args.files:
+            timestamp = journal.import_legacy_backup(path)
+            if timestamp:
+                print(f"✓ Imported {path} as {timestamp}")
+            else:
+                print(f"Skipped {path}: not a <name>.backup_<timestamp>.json file")
+
+    elif args.command == 'prune':
+        removed = journal.prune(args.keep, args.max_age_days)
+        print(f"✓ Removed {removed} journal entries")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
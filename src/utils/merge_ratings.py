@@ -1,34 +1,67 @@
 #!/usr/bin/env python3
 """
-One-time script to merge host ratings from Notion CSV export into movies.json
-
-Usage:
-    python src/utils/merge_ratings.py ratings.csv
-    python src/utils/merge_ratings.py ratings.csv --dry-run
-    python src/utils/merge_ratings.py ratings.csv --output docs/data/movies.json
+Merge host ratings from Notion CSV export into movies.json
+
+Matches are recorded in the ratings store, which the weekly pipeline joins
+into movies.json, so the merge only needs to run again when the spreadsheet
+changes. The store lives in the pipeline database (data/friendly_fire.db) if
+it exists and is exported to docs/data/ratings.json. With --incremental, only
+CSV rows that are new or changed since the last import are matched.
+
+Only the standard library is needed unless the pipeline database exists
+(reading it needs pandas, like the rest of the pipeline).
+
+Usage (from the repository root):
+    PYTHONPATH=src python -m utils.merge_ratings ratings.csv
+    PYTHONPATH=src python -m utils.merge_ratings ratings.csv --incremental
+    PYTHONPATH=src python -m utils.merge_ratings ratings.csv --dry-run
+    PYTHONPATH=src python -m utils.merge_ratings ratings.csv --output docs/data/movies.json
 """
 
 import argparse
 import json
 import csv
+import re
 import sys
 import math
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from difflib import SequenceMatcher
-from datetime import datetime
-import shutil
+
+from generators.movie_keys import assign_movie_ids, movie_key
+from generators.ratings_store import RATING_FIELDS, RatingsStore, row_fingerprint
+from generators.sort_keys import with_sort_keys
+from utils.backup_journal import backup_files
+
+# "Movie Title (1999) (LIVE) (Bonus)" -> year in parentheses and everything after it
+TITLE_SUFFIX_PATTERN = re.compile(r'\s*\(\d{4}\).*$')
+TITLE_YEAR_PATTERN = re.compile(r'\((\d{4})\)')
+TITLE_PUNCTUATION = str.maketrans('', '', ':,.!?-\'"')
 
 
 class RatingMerger:
     """Merges host ratings from CSV into movies.json"""
 
-    def __init__(self, movies_json_path: str, csv_path: str):
+    MATCH_THRESHOLD = 0.90  # Minimum title similarity for a match
+    YEAR_TOLERANCE = 1  # CSV and OMDB years may differ by this much
+    CANDIDATE_LIMIT = 10  # Titles compared per rating, by shared trigrams
+
+    def __init__(
+        self,
+        movies_json_path: str,
+        csv_path: str,
+        store_path: Optional[str] = None,
+        database_path: Optional[str] = None
+    ):
         self.movies_json_path = Path(movies_json_path)
         self.csv_path = Path(csv_path)
+        self.store = RatingsStore(store_path or self.movies_json_path.parent / 'ratings.json')
+        self.database_path = Path(database_path) if database_path else None
         self.movies_data = {}
         self.movies = []
         self.ratings = []
+        self._normalized = {}  # title -> normalize_title(title)
+        self._title_index = None  # see _build_title_index
 
     def load_movies(self):
         """Load existing movies.json"""
@@ -39,6 +72,7 @@ class RatingMerger:
         with open(self.movies_json_path, 'r', encoding='utf-8') as f:
             self.movies_data = json.load(f)
             self.movies = self.movies_data.get('movies', [])
+            self._title_index = None
             print(f"✓ Loaded {len(self.movies)} movies from {self.movies_json_path}")
 
     def load_ratings(self):
@@ -68,30 +102,52 @@ class RatingMerger:
                 if 'Name' in actual and 'Title' not in actual:
                     print(f"Note: Using 'Name' column as 'Title'")
 
+    def load_store(self):
+        """Load the ratings store from the previous import (database first)"""
+        if self.database_path and self.database_path.exists():
+            from storage.movie_database import MovieDatabase
+
+            with MovieDatabase(self.database_path) as database:
+                database.sync_ratings(self.store.path)
+                if database.has_ratings():
+                    database.load_ratings(self.store)
+                    print(f"✓ Loaded {len(self.store.ratings)} stored ratings from {self.database_path}")
+                    return
+
+        try:
+            self.store.load()
+        except (ValueError, json.JSONDecodeError) as e:
+            print(f"Error: cannot read {self.store.path}: {e}")
+            sys.exit(1)
+        print(f"✓ Loaded {len(self.store.ratings)} stored ratings from {self.store.path}")
+
     def clean_title(self, title: str) -> str:
         """Clean title by removing year and extra metadata"""
         if not title:
             return ""
-        import re
         # Remove year in parentheses and everything after it
         # e.g., "Movie Title (1999) (LIVE) (Bonus)" -> "Movie Title"
-        title = re.sub(r'\s*\(\d{4}\).*$', '', title).strip()
+        title = TITLE_SUFFIX_PATTERN.sub('', title).strip()
         return title
 
     def normalize_title(self, title: str) -> str:
-        """Normalize title for fuzzy matching"""
+        """Normalize title for fuzzy matching (memoized per title)"""
         if not title:
             return ""
+        if title in self._normalized:
+            return self._normalized[title]
+
         # First clean the title
-        title = self.clean_title(title)
+        normalized = self.clean_title(title)
         # Lowercase, remove "the", strip punctuation
-        title = title.lower().strip()
-        if title.startswith('the '):
-            title = title[4:]
+        normalized = normalized.lower().strip()
+        if normalized.startswith('the '):
+            normalized = normalized[4:]
         # Remove common punctuation
-        for char in [':', ',', '.', '!', '?', '-', "'", '"']:
-            title = title.replace(char, '')
-        return title.strip()
+        normalized = normalized.translate(TITLE_PUNCTUATION).strip()
+
+        self._normalized[title] = normalized
+        return normalized
 
     def fuzzy_match_score(self, title1: str, title2: str) -> float:
         """Calculate fuzzy match score (0.0 to 1.0)"""
@@ -99,13 +155,46 @@ class RatingMerger:
         norm2 = self.normalize_title(title2)
         return SequenceMatcher(None, norm1, norm2).ratio()
 
-    def find_matching_movie(self, rating: Dict) -> Tuple[Optional[Dict], float]:
-        """
-        Find best matching movie for a rating entry.
-        Returns (movie, confidence_score) or (None, 0.0)
+    @staticmethod
+    def title_trigrams(normalized: str) -> set:
+        """Character trigrams of a normalized title, padded to include word starts"""
+        padded = f"  {normalized} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def _build_title_index(self) -> Dict:
         """
-        import re
+        Index movies for candidate retrieval.
 
+        Movies are bucketed by year. Each bucket maps exact normalized titles
+        to the first movie with that title and each title trigram to the
+        movies containing it. Every movie gets a SequenceMatcher with its
+        normalized title preloaded as the second sequence, so only the CSV
+        title changes between comparisons.
+        """
+        entries = []
+        years = {}
+        for position, movie in enumerate(self.movies):
+            year = str(movie.get('year', '')).strip()
+            normalized = self.normalize_title(movie.get('title', ''))
+            entries.append({
+                'movie': movie,
+                'year': year,
+                'position': position,
+                'matcher': SequenceMatcher(None, '', normalized)
+            })
+
+            bucket = years.setdefault(year, {'exact': {}, 'trigrams': {}})
+            bucket['exact'].setdefault(normalized, position)
+            for trigram in self.title_trigrams(normalized):
+                bucket['trigrams'].setdefault(trigram, []).append(position)
+
+        return {'entries': entries, 'years': years}
+
+    def parse_rating(self, rating: Dict) -> Tuple[str, str]:
+        """
+        Extract the cleaned title and year of a rating entry.
+        Returns ('', '') if either is missing.
+        """
         # Support both "Title" and "Name" columns
         rating_title = rating.get('Title') or rating.get('Name', '')
         rating_year_raw = rating.get('Year', '')
@@ -118,7 +207,7 @@ class RatingMerger:
 
         # Extract year from title if present (e.g., "Movie Name (1999)")
         if rating_title and '(' in rating_title:
-            match = re.search(r'\((\d{4})\)', rating_title)
+            match = TITLE_YEAR_PATTERN.search(rating_title)
             if match:
                 extracted_year = match.group(1)
                 if not rating_year or rating_year == 'nan':
@@ -128,31 +217,126 @@ class RatingMerger:
         rating_title = self.clean_title(rating_title)
 
         if not rating_title or not rating_year or rating_year == 'nan':
-            return None, 0.0
+            return '', ''
+        return rating_title, rating_year
 
-        best_match = None
-        best_score = 0.0
+    def find_candidates(self, rating: Dict) -> List[Tuple[float, int, int]]:
+        """
+        Score the movies that could match a rating entry, best first.
 
-        for movie in self.movies:
-            movie_year = str(movie.get('year', '')).strip()
+        Candidates are movies within YEAR_TOLERANCE years. An identical
+        normalized title in the same year short-circuits to a single
+        candidate scoring 1.0. Otherwise, the CANDIDATE_LIMIT movies sharing
+        the most title trigrams are compared with SequenceMatcher.
+
+        Returns a list of (score, year_distance, movie_position).
+        """
+        rating_title, rating_year = self.parse_rating(rating)
+        if not rating_title:
+            return []
 
-            # Require exact year match
-            if movie_year != rating_year:
+        if self._title_index is None:
+            self._title_index = self._build_title_index()
+        entries = self._title_index['entries']
+        years = self._title_index['years']
+
+        normalized = self.normalize_title(rating_title)
+
+        # Identical normalized titles score 1.0, which no other movie can beat
+        bucket = years.get(rating_year)
+        if bucket and normalized in bucket['exact']:
+            return [(1.0, 0, bucket['exact'][normalized])]
+
+        if rating_year.isdigit():
+            nearby = range(int(rating_year) - self.YEAR_TOLERANCE, int(rating_year) + self.YEAR_TOLERANCE + 1)
+            year_distance = {str(year): abs(year - int(rating_year)) for year in nearby}
+        else:
+            year_distance = {rating_year: 0}
+
+        shared = {}
+        for year in year_distance:
+            bucket = years.get(year)
+            if not bucket:
                 continue
+            for trigram in self.title_trigrams(normalized):
+                for position in bucket['trigrams'].get(trigram, ()):
+                    shared[position] = shared.get(position, 0) + 1
+
+        shortlist = sorted(
+            shared,
+            key=lambda position: (-shared[position], year_distance[entries[position]['year']], position)
+        )[:self.CANDIDATE_LIMIT]
 
-            # Fuzzy title match
-            movie_title = movie.get('title', '')
-            score = self.fuzzy_match_score(rating_title, movie_title)
+        candidates = []
+        for position in shortlist:
+            matcher = entries[position]['matcher']
+            matcher.set_seq1(normalized)
+            candidates.append((matcher.ratio(), year_distance[entries[position]['year']], position))
 
-            if score > best_score:
-                best_score = score
-                best_match = movie
+        # Best score first; prefer the closer year, then the earlier movie
+        candidates.sort(key=lambda c: (-c[0], c[1], c[2]))
+        return candidates
+
+    def find_matching_movie(self, rating: Dict) -> Tuple[Optional[Dict], float]:
+        """
+        Find best matching movie for a rating entry.
+        Returns (movie, confidence_score) or (None, best_score)
+        """
+        candidates = self.find_candidates(rating)
+        if not candidates:
+            return None, 0.0
 
+        score, _, position = candidates[0]
         # Require 90% similarity threshold
-        if best_score >= 0.90:
-            return best_match, best_score
+        if score >= self.MATCH_THRESHOLD:
+            return self._title_index['entries'][position]['movie'], score
+
+        return None, score
+
+    def match_ratings(
+        self,
+        ratings: Optional[List[Dict]] = None,
+        claimed: Optional[set] = None
+    ) -> List[Tuple[Optional[Dict], float]]:
+        """
+        Match every rating entry to at most one movie, and every movie to at
+        most one rating entry.
 
-        return None, best_score
+        Candidate pairs above MATCH_THRESHOLD are assigned greedily, highest
+        score first (then closer year). Ties for the same movie go to the
+        later CSV row, as when later rows overwrote earlier ones.
+
+        ratings defaults to all loaded entries; claimed holds positions of
+        movies that are already taken and cannot be matched again.
+
+        Returns (movie, score) per rating entry, in CSV order; unmatched
+        entries get (None, best_score).
+        """
+        if ratings is None:
+            ratings = self.ratings
+
+        pairs = []
+        results = []
+        for index, rating in enumerate(ratings):
+            candidates = self.find_candidates(rating)
+            results.append((None, candidates[0][0] if candidates else 0.0))
+            pairs.extend(
+                (score, distance, -index, index, position)
+                for score, distance, position in candidates
+                if score >= self.MATCH_THRESHOLD
+            )
+
+        pairs.sort(key=lambda p: (-p[0], p[1], p[2]))
+
+        entries = self._title_index['entries'] if self._title_index else []
+        claimed = set(claimed or ())
+        for score, _, _, index, position in pairs:
+            if results[index][0] is not None or position in claimed:
+                continue
+            results[index] = (entries[position]['movie'], score)
+            claimed.add(position)
+
+        return results
 
     def sanitize_value(self, value: str) -> Optional[str]:
         """Sanitize rating value - handle empty strings, None, etc."""
@@ -163,29 +347,54 @@ class RatingMerger:
             return None
         return value
 
-    def merge(self) -> Dict:
+    def merge(self, incremental: bool = False) -> Dict:
         """
-        Merge ratings into movies.
+        Match ratings to movies, record them in the ratings store and apply
+        the store to movies.
+
+        In incremental mode, CSV rows already imported unchanged keep their
+        stored match and only new or changed rows are matched; their movies
+        stay claimed. Otherwise the store is rebuilt from the whole CSV.
+
         Returns statistics about the merge operation.
         """
         matched = 0
         unmatched = []
         match_details = []
 
-        for rating in self.ratings:
-            movie, confidence = self.find_matching_movie(rating)
+        fingerprints = [row_fingerprint(rating) for rating in self.ratings]
+        if incremental:
+            pending = [i for i, fp in enumerate(fingerprints) if fp not in self.store.rows]
+        else:
+            self.store.ratings = {}
+            self.store.rows = {}
+            pending = list(range(len(self.ratings)))
+
+        pending_set = set(pending)
+        reused_keys = {
+            self.store.rows[fp] for i, fp in enumerate(fingerprints)
+            if i not in pending_set and self.store.rows[fp]
+        }
+        claimed = {position for position, movie in enumerate(self.movies) if movie_key(movie) in reused_keys}
 
-            if movie and confidence >= 0.90:
-                # Merge rating data
-                movie['ar'] = self.sanitize_value(rating.get('AR'))
-                movie['br'] = self.sanitize_value(rating.get('BR'))
-                movie['jr'] = self.sanitize_value(rating.get('JR'))
-                movie['rating'] = self.sanitize_value(rating.get('Rating'))
-                movie['rating_notes'] = rating.get('Rating Notes', '').strip()
+        ratings = [self.ratings[i] for i in pending]
+        results = self.match_ratings(ratings, claimed)
 
-                matched += 1
+        for index, rating, (movie, confidence) in zip(pending, ratings, results):
+            if movie and confidence >= self.MATCH_THRESHOLD:
+                key = movie_key(movie)
                 csv_title = rating.get('Title') or rating.get('Name', '')
                 csv_year = rating.get('Year', '')
+                self.store.set(key, {
+                    'ar': self.sanitize_value(rating.get('AR')),
+                    'br': self.sanitize_value(rating.get('BR')),
+                    'jr': self.sanitize_value(rating.get('JR')),
+                    'rating': self.sanitize_value(rating.get('Rating')),
+                    'rating_notes': rating.get('Rating Notes', '').strip()
+                }, csv_title=csv_title, confidence=round(confidence, 3))
+                self.store.rows[fingerprints[index]] = key
+
+                matched += 1
                 match_details.append({
                     'csv_title': csv_title,
                     'csv_year': csv_year,
@@ -194,6 +403,7 @@ class RatingMerger:
                     'confidence': f"{confidence:.1%}"
                 })
             else:
+                self.store.rows[fingerprints[index]] = None
                 csv_title_raw = rating.get('Title') or rating.get('Name', '')
                 csv_year_raw = rating.get('Year', '')
                 # Convert year properly for display
@@ -207,17 +417,23 @@ class RatingMerger:
                     'best_confidence': f"{confidence:.1%}" if confidence > 0 else "No match"
                 })
 
-        # Add empty rating fields to unmatched movies
+        # Forget rows that were edited or removed since the last import
+        self.store.retain(fingerprints)
+
+        # Apply the store; movies without a stored rating get empty fields
+        empty = {field: None for field in RATING_FIELDS}
+        empty['rating_notes'] = ''
         for movie in self.movies:
-            if 'ar' not in movie:
-                movie['ar'] = None
-                movie['br'] = None
-                movie['jr'] = None
-                movie['rating'] = None
-                movie['rating_notes'] = ''
+            movie.update(self.store.get(movie_key(movie)) or empty)
+
+        # Refresh numeric sort keys (ar_num, rating_num, ...) for the merged ratings
+        self.movies[:] = [with_sort_keys(movie) for movie in self.movies]
+        self._title_index = None
 
         return {
-            'matched': matched,
+            'matched': matched + sum(1 for i, fp in enumerate(fingerprints)
+                                     if i not in pending_set and self.store.rows.get(fp)),
+            'unchanged': len(self.ratings) - len(pending),
             'unmatched': unmatched,
             'match_details': match_details,
             'total_ratings': len(self.ratings),
@@ -233,6 +449,8 @@ class RatingMerger:
         print(f"Total ratings in CSV: {stats['total_ratings']}")
         print(f"Successfully matched: {stats['matched']} ({stats['matched']/stats['total_ratings']*100:.1f}%)")
         print(f"Unmatched: {len(stats['unmatched'])}")
+        if stats['unchanged']:
+            print(f"Unchanged since last import (not re-matched): {stats['unchanged']}")
 
         if stats['match_details']:
             print("\n" + "-"*60)
@@ -253,20 +471,34 @@ class RatingMerger:
 
         print("="*60 + "\n")
 
-    def create_backup(self):
-        """Create backup of original movies.json"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        backup_path = self.movies_json_path.with_suffix(f'.backup_{timestamp}.json')
-        shutil.copy(self.movies_json_path, backup_path)
-        print(f"✓ Backup created: {backup_path}")
-        return backup_path
+    def create_backup(self, backup_dir: str = '.backups'):
+        """Snapshot movies.json and the ratings store into the backup journal"""
+        timestamp = backup_files(
+            [self.movies_json_path, self.store.path],
+            note=f"merge_ratings {self.csv_path.name}",
+            root=backup_dir
+        )
+        print(f"✓ Backup snapshot {timestamp} in {backup_dir}")
+        return timestamp
 
     def save(self):
-        """Save updated movies.json"""
+        """Save updated movies.json and the ratings store"""
         with open(self.movies_json_path, 'w', encoding='utf-8') as f:
             json.dump(self.movies_data, f, indent=2, ensure_ascii=False)
         print(f"✓ Saved updated data to {self.movies_json_path}")
 
+        self.store.save(source=self.csv_path.name)
+        print(f"✓ Exported {len(self.store.ratings)} ratings to {self.store.path}")
+
+        if self.database_path and self.database_path.exists():
+            from storage.movie_database import MovieDatabase
+
+            # Synced from the export, so the database records its hash
+            with MovieDatabase(self.database_path) as database:
+                changed = database.sync_ratings(self.store.path)
+                database.record_movies(assign_movie_ids(self.movies))
+            print(f"✓ Saved ratings to {self.database_path} ({changed} changed)")
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -281,6 +513,25 @@ def main():
         default='docs/data/movies.json',
         help='Path to movies.json file (default: docs/data/movies.json)'
     )
+    parser.add_argument(
+        '--store',
+        help='Path to the ratings store (default: ratings.json next to --output)'
+    )
+    parser.add_argument(
+        '--database',
+        default='data/friendly_fire.db',
+        help='Pipeline database to read and update, if it exists (default: data/friendly_fire.db)'
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Only match CSV rows that are new or changed since the last import'
+    )
+    parser.add_argument(
+        '--backup-dir',
+        default='.backups',
+        help='Backup journal directory (default: .backups)'
+    )
     parser.add_argument(
         '--dry-run',
         action='store_true',
@@ -290,15 +541,17 @@ def main():
     args = parser.parse_args()
 
     # Initialize merger
-    merger = RatingMerger(args.output, args.csv_file)
+    merger = RatingMerger(args.output, args.csv_file, args.store, args.database)
 
     # Load data
     merger.load_movies()
     merger.load_ratings()
+    if args.incremental:
+        merger.load_store()
 
     # Perform merge
     print("\nMatching and merging ratings...")
-    stats = merger.merge()
+    stats = merger.merge(incremental=args.incremental)
 
     # Print report
     merger.print_report(stats)
@@ -308,11 +561,11 @@ def main():
         print("DRY RUN MODE - No files were modified")
         print(f"Run without --dry-run to save changes to {args.output}")
     else:
-        merger.create_backup()
+        timestamp = merger.create_backup(args.backup_dir)
         merger.save()
         print("\n✓ Merge complete!")
         print(f"  Matched: {stats['matched']}/{stats['total_ratings']}")
-        print(f"  Review the backup file if you need to rollback")
+        print(f"  To roll back: python src/utils/backup_journal.py --root {args.backup_dir} restore --to {timestamp}")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,79 @@
+"""Round-trip tests for the compact movies encoding."""
+
+import copy
+import json
+from pathlib import Path
+
+import pytest
+
+from generators.compact_encoder import decode_compact_movies, encode_compact_movies
+
+MOVIES_JSON = Path(__file__).parent.parent / 'docs' / 'data' / 'movies.json'
+
+
+def _movie(**overrides):
+    movie = {
+        'episode_number': '156',
+        'title': 'Duck Soup',
+        'year': '1933',
+        'imdb_id': 'tt0023969',
+        'imdb_rating': '7.7',
+        'imdb_url': 'https://www.imdb.com/title/tt0023969',
+        'genre': 'Comedy, Musical',
+        'director': 'Leo McCarey',
+        'streaming_options': [
+            {'service': 'apple', 'type': 'rent', 'quality': 'hd', 'link': 'https://tv.apple.com/x', 'price': 'USD3.99'},
+            {'service': 'prime', 'type': 'subscription', 'quality': 'hd', 'link': 'https://amazon.com/x'}
+        ],
+        'rating': None
+    }
+    movie.update(overrides)
+    return movie
+
+
+def _round_trip(movies):
+    payload = json.loads(json.dumps(encode_compact_movies(copy.deepcopy(movies))))
+    return decode_compact_movies(payload)
+
+
+@pytest.mark.skipif(not MOVIES_JSON.exists(), reason='docs/data/movies.json not generated')
+def test_round_trip_published_movies():
+    with open(MOVIES_JSON, 'r', encoding='utf-8') as f:
+        movies = json.load(f)['movies']
+
+    assert _round_trip(movies) == movies
+
+
+def test_option_without_price():
+    movies = [_movie()]
+
+    decoded = _round_trip(movies)
+
+    assert decoded == movies
+    assert 'price' not in decoded[0]['streaming_options'][1]
+
+
+def test_streaming_options_none():
+    movies = [_movie(streaming_options=None), _movie(title='Greyhound', streaming_options=[])]
+
+    assert _round_trip(movies) == movies
+
+
+def test_non_uniform_fields():
+    first = _movie()
+    del first['rating']
+    second = _movie(title='Greyhound', imdb_id='tt6048922', imdb_url='https://example.com/greyhound')
+    second['rating_notes'] = 'Ben: 4 of 5'
+    third = {'title': 'Unmatched', 'year': None}
+
+    movies = [first, second, third]
+
+    decoded = _round_trip(movies)
+
+    assert decoded == movies
+    assert [set(movie) for movie in decoded] == [set(movie) for movie in movies]
+
+
+def test_unsupported_format():
+    with pytest.raises(ValueError):
+        decode_compact_movies({'format': 'other', 'version': 1})
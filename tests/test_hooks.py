@@ -0,0 +1,37 @@
+"""Tests that the API clients and scrapers report through injected hooks."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from api.batch_checkpoint import BatchCheckpoint
+
+SRC = Path(__file__).resolve().parent.parent / 'src'
+
+
+class RecordingMetrics:
+    def __init__(self):
+        self.lookups = []
+
+    def count_cache(self, cache, hit, amount=1):
+        self.lookups.append((cache, hit))
+
+
+def test_api_layer_imports_without_pipeline():
+    modules = 'api.omdb_client, api.streaming_client, api.poster_cache, scrapers.maximumfun_scraper'
+    check = f"import sys, {modules}; sys.exit(any(m.startswith('pipeline') for m in sys.modules))"
+    result = subprocess.run([sys.executable, '-c', check], cwd=SRC.parent, env={**os.environ, 'PYTHONPATH': str(SRC)})
+
+    assert result.returncode == 0
+
+
+def test_checkpoint_counts_lookups_on_its_hook(tmp_path):
+    metrics = RecordingMetrics()
+    checkpoint = BatchCheckpoint(str(tmp_path / 'omdb.jsonl'), metrics=metrics)
+
+    checkpoint.call('key', lambda: 'value')
+    checkpoint.call('key', lambda: 'other')
+
+    assert metrics.lookups == [('checkpoint', False), ('checkpoint', True)]
+    assert BatchCheckpoint(str(tmp_path / 'other.jsonl')).call('key', lambda: 'value') == 'value'
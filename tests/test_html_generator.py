@@ -0,0 +1,25 @@
+"""Tests for the pre-rendered HTML pages."""
+
+import pytest
+
+from generators.html_generator import HTMLGenerator
+
+
+@pytest.mark.parametrize('body, expected', [
+    ('<body>', '<body class="prerendered">'),
+    ('<body data-theme="dark">', '<body data-theme="dark" class="prerendered">'),
+    ('<body class="dark wide" id="top">', '<body class="dark wide prerendered" id="top">'),
+    ("<body class='dark'>", "<body class='dark prerendered'>"),
+    ('<body class="prerendered">', '<body class="prerendered">'),
+])
+def test_add_body_class(body, expected):
+    page = f"<html>\n{body}\n<p>content</p>\n</body>\n</html>"
+
+    assert HTMLGenerator._add_body_class(page, 'prerendered') == page.replace(body, expected)
+
+
+def test_rows_carry_the_movie_id_and_table_position():
+    row = HTMLGenerator().render_row({'id': 'tt0023969', 'title': 'Duck Soup'}, 3)
+
+    assert row.startswith('<tr data-id="tt0023969">')
+    assert 'class="details-link movie-title" data-row="3">Duck Soup</a>' in row
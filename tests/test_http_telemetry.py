@@ -0,0 +1,13 @@
+"""Tests for the HTTP telemetry summaries."""
+
+from api.http_telemetry import percentile
+
+
+def test_nearest_rank_percentiles():
+    values = [float(value) for value in range(100, 0, -1)]
+
+    assert percentile(values, 0.50) == 50
+    assert percentile(values, 0.95) == 95
+    assert percentile(values, 0.99) == 99
+    assert percentile(values, 1.0) == 100
+    assert percentile([7.0], 0.0) == 7
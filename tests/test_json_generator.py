@@ -0,0 +1,65 @@
+"""Tests for the published JSON assets of JSONGenerator."""
+
+import json
+
+from generators.json_generator import JSONGenerator
+
+
+def _movies(count=30):
+    return [
+        {
+            'id': f"m{number}",
+            'episode_number': str(number),
+            'episode_url': f"https://maximumfun.org/episodes/friendly-fire/movie-{number}/",
+            'title': f"Movie {number}",
+            'year': str(1950 + number),
+            'imdb_id': f"tt{number:07d}",
+            'imdb_rating': '7.0',
+            'imdb_votes': '1,000',
+            'imdb_url': f"https://www.imdb.com/title/tt{number:07d}",
+            'plot': 'A plot.',
+            'poster': '',
+            'streaming_options': [{'service': 'netflix', 'type': 'subscription', 'link': 'https://netflix.com'}],
+            'ar': None, 'br': None, 'jr': None, 'rating': None, 'rating_notes': ''
+        }
+        for number in range(1, count + 1)
+    ]
+
+
+def test_manifest_hash_stable_across_runs(tmp_path):
+    generator = JSONGenerator(str(tmp_path))
+
+    first = generator.publisher.publish(generator.generate_movie_shards(_movies()))
+    second = generator.publisher.publish(generator.generate_movie_shards(_movies()))
+
+    assert first['path'] == second['path']
+    assert 'last_updated' not in (tmp_path / 'movies-manifest.json').read_text()
+
+
+def test_metadata_hash_stable_across_runs(tmp_path):
+    generator = JSONGenerator(str(tmp_path))
+    versions = [{'version': 'abc123', 'previous': None, 'delta': None}]
+
+    paths = []
+    for _ in range(2):
+        generator.generate_metadata_json(30, 28, 20, versions=versions)
+        version = json.loads((tmp_path / 'version.json').read_text())
+        paths.append(version['metadata'])
+
+    assert paths[0] == paths[1]
+    assert version['last_updated']
+    assert 'last_updated' not in json.loads((tmp_path / 'metadata.json').read_text())
+
+
+def _compressed_files(directory):
+    return sorted(p.name for p in directory.rglob('*') if p.suffix in ('.gz', '.br'))
+
+
+def test_precompressed_copies_are_opt_in(tmp_path):
+    JSONGenerator(str(tmp_path), precompress=True).generate_movie_shards(_movies())
+    assert _compressed_files(tmp_path / JSONGenerator.SHARD_DIR)
+
+    generator = JSONGenerator(str(tmp_path))
+    generator.publisher.publish(generator.generate_movie_shards(_movies()))
+
+    assert _compressed_files(tmp_path) == []
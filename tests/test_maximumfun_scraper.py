@@ -0,0 +1,62 @@
+"""Tests for the episode list scraper."""
+
+import pytest
+
+pytest.importorskip('bs4')
+
+from scrapers import maximumfun_scraper
+from scrapers.maximumfun_scraper import MaximumFunScraper
+
+PAGE = ''.join(
+    f'<div class="latest-panel-loop-item-title"><h4><a href="/episodes/{n}/">Movie {n} (2000)</a></h4></div>'
+    for n in range(3)
+)
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, *texts):
+        self.texts = list(texts)
+        self.requests = 0
+
+    def get(self, url):
+        self.requests += 1
+        return FakeResponse(self.texts.pop(0))
+
+
+class FakeTelemetry:
+    def __init__(self):
+        self.sleeps = []
+
+    def sleep(self, seconds, url, reason='rate_limit'):
+        self.sleeps.append(reason)
+
+
+def test_truncated_page_is_fetched_again(monkeypatch):
+    telemetry = FakeTelemetry()
+    monkeypatch.setattr(maximumfun_scraper, 'telemetry', telemetry)
+    scraper = MaximumFunScraper(max_pages=1)
+    scraper.session = FakeSession('<html>', PAGE)
+
+    episodes = scraper._scrape_page(1)
+
+    assert [episode['raw_title'] for episode in episodes] == ['Movie 0 (2000)', 'Movie 1 (2000)', 'Movie 2 (2000)']
+    assert scraper.session.requests == 2
+    assert telemetry.sleeps == ['backoff']
+
+
+def test_page_that_never_validates_fails(monkeypatch):
+    monkeypatch.setattr(maximumfun_scraper, 'telemetry', FakeTelemetry())
+    scraper = MaximumFunScraper(max_pages=1)
+    scraper.session = FakeSession(*[''] * (MaximumFunScraper.MAX_RETRIES + 1))
+
+    with pytest.raises(ValueError):
+        scraper._scrape_page(1)
+    assert scraper.session.requests == MaximumFunScraper.MAX_RETRIES + 1
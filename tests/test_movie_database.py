@@ -0,0 +1,71 @@
+"""Tests for the pipeline database: bootstrapping and the host ratings sync."""
+
+import json
+
+import pytest
+
+pytest.importorskip('pandas')
+
+from generators.json_generator import JSONGenerator
+from generators.ratings_store import RatingsStore
+from pipeline.enrichment import IncrementalEnrichment
+from storage.movie_database import NEVER_CHECKED, MovieDatabase, open_movie_database
+
+
+def _save_store(data_dir, ratings):
+    store = RatingsStore(data_dir / 'ratings.json')
+    for key, rating in ratings.items():
+        store.set(key, {'rating': rating})
+        store.rows[f"row-{key}"] = key
+    store.save(source='ratings.csv')
+    return store
+
+
+def test_committed_ratings_newer_than_database(tmp_path):
+    _save_store(tmp_path, {'tt0023969': 'Medals'})
+    with open_movie_database(str(tmp_path / 'friendly_fire.db'), data_dir=str(tmp_path)) as database:
+        assert database.load_ratings(RatingsStore()).ratings['tt0023969']['rating'] == 'Medals'
+
+    # Merged locally and committed; the cached database still has the old copy
+    _save_store(tmp_path, {'tt0023969': 'Hot Garbage', 'tt0086567': 'Medals'})
+
+    with MovieDatabase(str(tmp_path / 'friendly_fire.db')) as database:
+        store = JSONGenerator(str(tmp_path), [], database).load_ratings()
+        stored = database.load_ratings(RatingsStore())
+
+    assert store.get('tt0023969')['rating'] == 'Hot Garbage'
+    assert set(store.ratings) == {'tt0023969', 'tt0086567'}
+    assert stored.ratings == store.ratings
+    assert stored.rows == store.rows
+
+
+def test_unchanged_ratings_file_is_not_reimported(tmp_path):
+    _save_store(tmp_path, {'tt0023969': 'Medals'})
+    with MovieDatabase(str(tmp_path / 'friendly_fire.db')) as database:
+        assert database.sync_ratings(tmp_path / 'ratings.json') == 1
+
+        store = database.load_ratings(RatingsStore())
+        store.set('tt0086567', {'rating': 'Medals'})
+        database.save_ratings(store)
+
+        assert database.sync_ratings(tmp_path / 'ratings.json') == 0
+        assert set(database.load_ratings(RatingsStore()).ratings) == {'tt0023969', 'tt0086567'}
+
+
+def test_bootstrap_leaves_imported_movies_due_for_refresh(tmp_path):
+    movies = [
+        {'episode_number': str(number), 'title': f"Movie {number}", 'year': '1990',
+         'imdb_id': f"tt{number:07d}", 'imdb_rating': '7.0', 'streaming_options': []}
+        for number in range(1, 41)
+    ]
+    (tmp_path / 'movies.json').write_text(json.dumps({'movies': movies}))
+
+    with open_movie_database(str(tmp_path / 'friendly_fire.db'), data_dir=str(tmp_path)) as database:
+        omdb_checked = database.omdb_checked()
+        streaming_checked = database.streaming_checked()
+        plan = IncrementalEnrichment(database.prior_state(), omdb_checked, streaming_checked)
+
+    assert set(omdb_checked.values()) == {NEVER_CHECKED}
+    assert set(streaming_checked.values()) == {NEVER_CHECKED}
+    assert len(streaming_checked) == 40
+    assert len(plan.omdb_refresh) == len(plan.streaming_refresh) == IncrementalEnrichment.MAX_REFRESH
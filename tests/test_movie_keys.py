@@ -0,0 +1,30 @@
+"""Tests for movie keys and the standalone ratings merge script's imports."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from generators.movie_keys import assign_movie_ids, movie_key
+
+SRC = Path(__file__).resolve().parent.parent / 'src'
+
+
+def test_movie_key_falls_back_to_episode_slug():
+    assert movie_key({'imdb_id': 'tt0023969'}) == 'tt0023969'
+    assert movie_key({'episode_url': 'https://example.com/episodes/duck-soup-1933/'}) == 'ep-duck-soup-1933'
+    assert movie_key({'title': 'Duck Soup', 'year': 1933}) == 'ep-duck-soup-1933'
+
+
+def test_repeated_keys_get_suffixes():
+    movies = assign_movie_ids([{'imdb_id': 'tt0086567'}, {'imdb_id': 'tt0086567', 'id': 'old'}])
+
+    assert [movie['id'] for movie in movies] == ['tt0086567', 'tt0086567-2']
+    assert list(movies[1]) == ['id', 'imdb_id']
+
+
+def test_merge_ratings_imports_without_pandas():
+    check = "import sys, utils.merge_ratings; sys.exit('pandas' in sys.modules)"
+    result = subprocess.run([sys.executable, '-c', check], cwd=SRC.parent, env={**os.environ, 'PYTHONPATH': str(SRC)})
+
+    assert result.returncode == 0
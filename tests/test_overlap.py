@@ -0,0 +1,32 @@
+"""Tests for the overlapped fetch."""
+
+import pandas as pd
+
+from pipeline import overlap
+from pipeline.overlap import OverlappedFetch
+
+
+class FakeCleaner:
+    def __init__(self, metrics=None, telemetry=None):
+        pass
+
+    def clean_episodes(self, raw_episodes, fetch_detail_pages=True):
+        return pd.DataFrame([{'episode_normalized': title, 'year': '2000'} for title in raw_episodes])
+
+
+class FakeEnrichment:
+    def lookup_omdb(self, client, row):
+        return {'imdbID': f"tt-{row['episode_normalized']}"}
+
+    def lookup_streaming(self, client, imdb_id, country):
+        # 'b' has no streaming data and its lookup failed
+        return None if imdb_id == 'tt-b' else {'imdb_id': imdb_id, 'streaming_options': []}
+
+
+def test_streaming_data_has_found_results_in_table_order(monkeypatch):
+    monkeypatch.setattr(overlap, 'EpisodeDataCleaner', FakeCleaner)
+
+    result = OverlappedFetch([['c', 'b'], ['a', 'c']], None, object(), FakeEnrichment()).run()
+
+    assert [d['imdbID'] for d in result['omdb_data']] == ['tt-c', 'tt-b', 'tt-a', 'tt-c']
+    assert [d['imdb_id'] for d in result['streaming_data']] == ['tt-c', 'tt-a']
@@ -0,0 +1,107 @@
+"""Tests for the poster cache against a local stand-in image server."""
+
+import io
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+Image = pytest.importorskip('PIL.Image')
+
+from api.http_transport import create_session
+from api.poster_cache import PosterCache
+
+
+def _png(color):
+    output = io.BytesIO()
+    Image.new('RGB', (300, 450), color).save(output, 'PNG')
+    return output.getvalue()
+
+
+IMAGES = {'/red.png': _png('red'), '/blue.png': _png('blue')}
+
+
+@pytest.fixture
+def image_server():
+    requests_seen = Counter()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests_seen[self.path] += 1
+            body = IMAGES.get(self.path)
+            self.send_response(200 if body else 404)
+            self.send_header('Content-Length', str(len(body or b'')))
+            self.end_headers()
+            self.wfile.write(body or b'')
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", requests_seen
+    server.shutdown()
+
+
+def _cache_posters(tmp_path, omdb_data):
+    cache = PosterCache(str(tmp_path / 'cache'), str(tmp_path / 'data'), session=create_session(retries=0))
+    cache.RATE_LIMIT_DELAY = 0
+    with cache:
+        return cache.cache_posters(omdb_data), cache
+
+
+def _thumbnail_files(tmp_path):
+    return sorted(p.name for p in (tmp_path / 'data' / 'posters').glob('*.webp'))
+
+
+def test_second_run_downloads_nothing(tmp_path, image_server):
+    base, requests_seen = image_server
+    omdb_data = [{'imdbID': 'tt0000001', 'Poster': f"{base}/red.png"}, None]
+
+    first, _ = _cache_posters(tmp_path, omdb_data)
+    second, cache = _cache_posters(tmp_path, omdb_data)
+
+    assert first == second
+    assert first['tt0000001']['width'] == PosterCache.THUMBNAIL_WIDTH
+    assert cache.downloads == 0
+    assert requests_seen['/red.png'] == 1
+
+
+def test_changed_url_replaces_thumbnail(tmp_path, image_server):
+    base, requests_seen = image_server
+
+    first, _ = _cache_posters(tmp_path, [{'imdbID': 'tt0000001', 'Poster': f"{base}/red.png"}])
+    second, cache = _cache_posters(tmp_path, [{'imdbID': 'tt0000001', 'Poster': f"{base}/blue.png"}])
+
+    assert cache.downloads == 1
+    assert second['tt0000001']['path'] != first['tt0000001']['path']
+    assert _thumbnail_files(tmp_path) == [second['tt0000001']['path'].split('/')[-1]]
+    assert len(list((tmp_path / 'cache').iterdir())) == 1
+
+
+def test_failed_download_keeps_thumbnail(tmp_path, image_server):
+    base, requests_seen = image_server
+
+    first, _ = _cache_posters(tmp_path, [{'imdbID': 'tt0000001', 'Poster': f"{base}/red.png"}])
+    second, cache = _cache_posters(tmp_path, [{'imdbID': 'tt0000001', 'Poster': f"{base}/missing.png"}])
+
+    assert requests_seen['/missing.png'] == 1
+    assert second == first
+    assert _thumbnail_files(tmp_path) == [first['tt0000001']['path'].split('/')[-1]]
+    assert cache.index['tt0000001']['source'] == f"{base}/red.png"
+    assert len(list((tmp_path / 'cache').iterdir())) == 1
+
+
+def test_removed_movie_is_pruned(tmp_path, image_server):
+    base, _ = image_server
+
+    _cache_posters(tmp_path, [
+        {'imdbID': 'tt0000001', 'Poster': f"{base}/red.png"},
+        {'imdbID': 'tt0000002', 'Poster': f"{base}/blue.png"}
+    ])
+    thumbnails, cache = _cache_posters(tmp_path, [{'imdbID': 'tt0000002', 'Poster': f"{base}/blue.png"}])
+
+    assert list(thumbnails) == ['tt0000002']
+    assert list(cache.index) == ['tt0000002']
+    assert _thumbnail_files(tmp_path) == [thumbnails['tt0000002']['path'].split('/')[-1]]
@@ -0,0 +1,23 @@
+"""Tests for the pipeline runner's stage code lists."""
+
+from pipeline.runner import module_sources
+from pipeline.stages import GENERATOR_CODE
+
+
+def test_module_sources_follows_imports(tmp_path):
+    package = tmp_path / 'pkg'
+    package.mkdir()
+    (package / '__init__.py').write_text('')
+    (package / 'top.py').write_text('import json\nfrom .helper import value\n')
+    (package / 'helper.py').write_text('def value():\n    from pkg import deep\n    return deep.X\n')
+    (package / 'deep.py').write_text('X = 1\n')
+    (package / 'unused.py').write_text('')
+
+    sources = module_sources(str(package / 'top.py'), root=str(tmp_path))
+
+    assert sources == sorted((package / name).as_posix() for name in ['__init__.py', 'deep.py', 'helper.py', 'top.py'])
+
+
+def test_generator_code_covers_its_imports():
+    assert 'src/generators/movie_keys.py' in GENERATOR_CODE
+    assert 'src/generators/prior_state.py' in GENERATOR_CODE
@@ -0,0 +1,28 @@
+"""Tests for the inverted search index."""
+
+from generators.search_index import build_search_index
+
+
+def _rows(index, token):
+    rows, row = [], 0
+    for gap in index['postings'][index['tokens'].index(token)]:
+        row += gap
+        rows.append(row)
+    return rows
+
+
+def test_index_covers_table_columns():
+    movies = [
+        {'episode_number': '212', 'title': 'Duck Soup', 'year': '1933', 'rating': 'Medals',
+         'ar': '4.5', 'streaming_options': [{'service': 'prime', 'type': 'subscription'}]},
+        {'episode_number': '7', 'title': 'Top Gun', 'year': '1986', 'streaming_options': None}
+    ]
+
+    index = build_search_index(movies)
+
+    assert _rows(index, '212') == [0]
+    assert _rows(index, 'medals') == [0]
+    assert _rows(index, 'prime') == [0]
+    assert _rows(index, 'video') == [0]
+    assert _rows(index, '7') == [1]
+    assert 'streaming' in index['fields']